@@ -0,0 +1,280 @@
+import io
+import os
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+import profiling
+from config import Config
+from extract_txt import ExtractionResult, extract_document
+from result_cache import ResultCache, sha256_bytes, sha256_text
+from scoring import ResumeScorer, SCORER_VERSION
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[int, int], None]
+# (position in the batch, document, extraction already known from the cache)
+_Task = Tuple[int, 'ResumeDocument', Optional[ExtractionResult]]
+
+
+@dataclass
+class ResumeDocument:
+    """
+    A resume file to score: its name (for the extension) and raw bytes.
+    """
+    name: str
+    data: bytes
+
+    @classmethod
+    def from_path(cls, path: str) -> 'ResumeDocument':
+        with open(path, 'rb') as f:
+            return cls(os.path.basename(path), f.read())
+
+
+@dataclass
+class BatchResult:
+    """
+    Outcome for one document; exactly one of score and error is set.
+    """
+    index: int
+    name: str
+    text: str = ''
+    score: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    extraction: Optional[ExtractionResult] = None
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+# Per-process scorer, created once by the pool initializer so each worker
+# keeps its own warm models across chunks and batches
+_worker_scorer: Optional[ResumeScorer] = None
+
+
+# Bucket bounds and breakdown flag of the parent's profiler, or None when
+# the parent is not profiling
+_ProfileSettings = Optional[Tuple[Tuple[float, ...], bool]]
+
+
+def _init_worker(warm_up: bool) -> None:
+    global _worker_scorer
+    # A forked worker inherits the parent's profiler and its counts; start clean
+    profiling.disable()
+    _worker_scorer = ResumeScorer()
+    if warm_up:
+        _worker_scorer.warm_up()
+
+
+def _score_chunk(scorer: ResumeScorer, chunk: List[_Task], job_description: str,
+                 skills_list: Optional[List[str]]) -> List[BatchResult]:
+    results = []
+    for index, document, extraction in chunk:
+        if extraction is None:
+            extraction = extract_document(io.BytesIO(document.data), document.name)
+        # Failed or empty documents never reach the scoring stages
+        error = None if extraction.ok else f"Extraction failed: {extraction.error}"
+        results.append(BatchResult(index, document.name, extraction.text, error=error, extraction=extraction))
+    extracted = [r for r in results if r.ok]
+    if not extracted:
+        return results
+    try:
+        scores = scorer.score_batch([r.text for r in extracted], job_description, skills_list)
+        for result, score in zip(extracted, scores):
+            result.score = score
+    except Exception:
+        # Retry one by one so a single bad document doesn't fail its neighbours
+        for result in extracted:
+            try:
+                result.score = scorer.score_resume(result.text, job_description, skills_list)
+            except Exception as e:
+                result.error = f"Scoring failed: {e}"
+    return results
+
+
+def _worker_profiler(settings: _ProfileSettings) -> Optional[profiling.StageProfiler]:
+    # Follow the parent: profile exactly when it does, with the same buckets
+    profiler = profiling.active()
+    if settings is None:
+        if profiler is not None:
+            profiling.disable()
+        return None
+    buckets, breakdown = settings
+    if profiler is None or profiler.buckets != buckets:
+        profiler = profiling.enable(profiling.StageProfiler(buckets))
+    profiler.breakdown = breakdown
+    return profiler
+
+
+def _score_chunk_in_worker(chunk: List[_Task], job_description: str, skills_list: Optional[List[str]],
+                           profile: _ProfileSettings = None) -> Tuple[List[BatchResult], Optional[Dict[str, Any]]]:
+    if _worker_scorer is None:
+        _init_worker(warm_up=False)
+    profiler = _worker_profiler(profile)
+    if profiler is not None:
+        profiler.drain()  # drop anything recorded outside a chunk, e.g. warm-up
+    results = _score_chunk(_worker_scorer, chunk, job_description, skills_list)  # type: ignore
+    # Stage timings stay in this process unless sent back with the results
+    return results, profiler.drain() if profiler is not None else None
+
+
+def _started() -> bool:
+    # No-op task: submitting it makes the pool spawn (and warm up) a worker
+    return True
+
+
+class BatchScorer:
+    """
+    Extracts and scores resumes on a pool of worker processes, each holding
+    its own ResumeScorer. Results come back in input order and per-file
+    failures are reported on the result instead of aborting the batch.
+    With workers=1 everything runs in the calling process, one score() call
+    at a time when several threads share the scorer. Given a
+    ResultCache, previously seen files skip extraction and previously scored
+    (resume, JD) pairs skip scoring; the cache is only touched from the
+    calling process. When stage profiling is on, workers profile too and
+    their stage timings are merged into the calling process's profiler.
+    """
+
+    def __init__(self, workers: Optional[int] = None, chunk_size: Optional[int] = None, warm_up: bool = True,
+                 cache: Optional[ResultCache] = None):
+        self.workers = max(1, workers or Config.BATCH_WORKERS)
+        self.chunk_size = max(1, chunk_size or Config.BATCH_CHUNK_SIZE)
+        self.warm_up = warm_up
+        self.cache = cache
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._local_scorer: Optional[ResumeScorer] = None
+        # Guards the pool and the in-process scorer, which threads may share
+        # (e.g. the Streamlit app keeps one BatchScorer for all sessions)
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> 'BatchScorer':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
+    def start(self) -> None:
+        """
+        Start the workers and have them load their models now, without
+        waiting, so the first batch doesn't pay for it.
+        """
+        if self.workers == 1:
+            with self._lock:
+                self._get_local_scorer()
+            return
+        pool = self._get_pool()
+        for _ in range(self.workers):
+            pool.submit(_started)
+
+    def _get_local_scorer(self) -> ResumeScorer:
+        # Call with self._lock held
+        if self._local_scorer is None:
+            scorer = ResumeScorer()
+            if self.warm_up:
+                scorer.warm_up()
+            self._local_scorer = scorer
+        return self._local_scorer
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                 initargs=(self.warm_up,))
+            return self._pool
+
+    def score(self, documents: Iterable[ResumeDocument], job_description: str,
+              skills_list: Optional[List[str]] = None,
+              progress: Optional[ProgressCallback] = None) -> List[BatchResult]:
+        """
+        Extract and score every document against one job description.
+        :param documents: resumes to score
+        :param job_description: job description text
+        :param skills_list: optional key skills, passed through to score_resume
+        :param progress: called as progress(done, total) as documents finish
+        :return: one BatchResult per document, in input order
+        """
+        documents = list(documents)
+        total = len(documents)
+        results: List[Optional[BatchResult]] = [None] * total
+        done = 0
+        jd_hash = sha256_text(job_description)
+        file_hashes = [sha256_bytes(d.data) for d in documents] if self.cache is not None else []
+
+        def collect(chunk_results: List[BatchResult]) -> None:
+            nonlocal done
+            for result in chunk_results:
+                results[result.index] = result
+                if self.cache is not None and not result.cached:
+                    self._store(file_hashes[result.index], jd_hash, result)
+            done += len(chunk_results)
+            if progress is not None:
+                progress(done, total)
+
+        tasks: List[_Task] = []
+        cached: List[BatchResult] = []
+        for index, document in enumerate(documents):
+            hit = self._lookup(index, document, file_hashes, jd_hash) if self.cache is not None else None
+            if isinstance(hit, BatchResult):
+                cached.append(hit)
+            else:
+                tasks.append((index, document, hit))
+        if cached:
+            collect(cached)
+        chunks = [tasks[i:i + self.chunk_size] for i in range(0, len(tasks), self.chunk_size)]
+
+        if self.workers == 1:
+            # ResumeScorer keeps per-instance caches, so calls sharing it take turns
+            with self._lock:
+                scorer = self._get_local_scorer()
+                for chunk in chunks:
+                    collect(_score_chunk(scorer, chunk, job_description, skills_list))
+        else:
+            pool = self._get_pool()
+            profiler = profiling.active()
+            settings = (profiler.buckets, profiler.breakdown) if profiler is not None else None
+            futures = {pool.submit(_score_chunk_in_worker, chunk, job_description, skills_list, settings): chunk
+                       for chunk in chunks}
+            for future in as_completed(futures):
+                try:
+                    chunk_results, stage_stats = future.result()
+                    if stage_stats and profiler is not None:
+                        profiler.merge(stage_stats)
+                    collect(chunk_results)
+                except Exception as e:
+                    logger.error(f"Batch worker failed: {e}")
+                    collect([BatchResult(i, doc.name, error=f"Worker failed: {e}") for i, doc, _ in futures[future]])
+        return results  # type: ignore
+
+    def _lookup(self, index: int, document: ResumeDocument, file_hashes: List[str],
+                jd_hash: str) -> Union[BatchResult, ExtractionResult, None]:
+        # A cached score short-circuits the document; a cached extraction
+        # at least saves re-parsing the file
+        extraction = self.cache.get_extraction(file_hashes[index])  # type: ignore
+        if extraction is None:
+            return None
+        if not extraction.ok:
+            return BatchResult(index, document.name, extraction.text, error=f"Extraction failed: {extraction.error}",
+                               extraction=extraction, cached=True)
+        score = self.cache.get_score(sha256_text(extraction.text), jd_hash, SCORER_VERSION)  # type: ignore
+        if score is None:
+            return extraction
+        return BatchResult(index, document.name, extraction.text, score, extraction=extraction, cached=True)
+
+    def _store(self, file_hash: str, jd_hash: str, result: BatchResult) -> None:
+        try:
+            if result.extraction is not None:
+                self.cache.put_extraction(file_hash, result.extraction)  # type: ignore
+            if result.score is not None:
+                self.cache.put_score(sha256_text(result.text), jd_hash, SCORER_VERSION, result.score)  # type: ignore
+        except Exception as e:
+            logger.warning(f"Could not cache result for {result.name}: {e}")
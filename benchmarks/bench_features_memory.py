@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Peak-memory benchmark for the TF-IDF feature pipeline (txt_features ->
+feats_reduce -> simil), comparing the old dense DataFrame path with the
+sparse one. Each mode runs in its own interpreter so peak RSS is isolated.
+
+Usage: python benchmarks/bench_features_memory.py [--resumes N] [--jds N] [--words N]
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from corpus import synthetic_corpus  # noqa: E402
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+
+def run_dense(resumes, jds):
+    # The pre-sparse pipeline: densify TF-IDF into a DataFrame before SVD
+    import pandas as pd
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.decomposition import TruncatedSVD
+    from model import simil
+    tv = TfidfVectorizer(max_df=0.85, min_df=1, ngram_range=(1, 3))
+    tfidf_wm = tv.fit_transform(resumes + jds)
+    df = pd.DataFrame(data=tfidf_wm.toarray(), columns=tv.get_feature_names_out())
+    reduced = pd.DataFrame(TruncatedSVD(n_components=30, n_iter=7, random_state=42).fit_transform(df))
+    return simil(reduced, resumes, jds), df.shape
+
+
+def run_sparse(resumes, jds):
+    from features import txt_features, feats_reduce
+    from model import simil
+    feats = txt_features(resumes, jds)
+    return simil(feats_reduce(feats), resumes, jds), feats.shape
+
+
+def child(mode, resumes, jds, words):
+    resume_txt = synthetic_corpus(resumes, words, seed=1)
+    jd_txt = synthetic_corpus(jds, words // 2, seed=2)
+    baseline = peak_rss_mb()
+    _, shape = (run_dense if mode == 'dense' else run_sparse)(resume_txt, jd_txt)
+    print(json.dumps({'mode': mode, 'shape': list(shape), 'peak_rss_mb': peak_rss_mb(),
+                      'baseline_rss_mb': baseline}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--resumes', type=int, default=300)
+    parser.add_argument('--jds', type=int, default=5)
+    parser.add_argument('--words', type=int, default=600)
+    parser.add_argument('--mode', choices=['dense', 'sparse'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        child(args.mode, args.resumes, args.jds, args.words)
+        return
+
+    for mode in ['dense', 'sparse']:
+        out = subprocess.run([sys.executable, __file__, '--mode', mode, '--resumes', str(args.resumes),
+                              '--jds', str(args.jds), '--words', str(args.words)],
+                             check=True, capture_output=True, text=True)
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        print(f"{mode:>6}: tfidf {result['shape'][0]}x{result['shape'][1]}, "
+              f"peak RSS {result['peak_rss_mb']:.0f} MB (corpus only {result['baseline_rss_mb']:.0f} MB)")
+
+
+if __name__ == '__main__':
+    main()
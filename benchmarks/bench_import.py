@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark: scoring and text_processing must import without
+loading spaCy, sentence-transformers or NLTK data.
+
+Usage: python benchmarks/bench_import.py [--budget SECONDS] [--runs N]
+Exits non-zero when the median cold import exceeds the budget.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ['scoring', 'text_processing']
+IMPORT_BUDGET_SECONDS = 0.5
+
+_PROBE = (
+    "import sys, time; t = time.perf_counter(); "
+    "import {modules}; "
+    "print(time.perf_counter() - t)"
+)
+
+
+def measure_import(modules, runs):
+    """Median wall time of importing modules in a fresh interpreter"""
+    code = _PROBE.format(modules=', '.join(modules))
+    timings = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, '-c', code], cwd=REPO_ROOT,
+                             check=True, capture_output=True, text=True)
+        timings.append(float(out.stdout.strip().splitlines()[-1]))
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--budget', type=float, default=IMPORT_BUDGET_SECONDS)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    median = measure_import(MODULES, args.runs)
+    status = 'OK' if median <= args.budget else 'OVER BUDGET'
+    print(f"import {', '.join(MODULES)}: {median * 1000:.1f} ms (budget {args.budget * 1000:.0f} ms) {status}")
+    sys.exit(0 if median <= args.budget else 1)
+
+
+if __name__ == '__main__':
+    main()
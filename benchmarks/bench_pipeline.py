@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Stage-by-stage benchmark of the scoring and feature pipelines on a
+synthetic corpus. Records throughput, p50/p99 latency and peak traced
+memory per stage, optionally saves them as a JSON baseline, and flags
+regressions against a saved baseline.
+
+Usage:
+    python benchmarks/bench_pipeline.py --save-baseline benchmarks/baseline.json
+    python benchmarks/bench_pipeline.py --baseline benchmarks/baseline.json [--tolerance 0.2]
+Exits non-zero when a stage regressed against the baseline.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from corpus import synthetic_jds, synthetic_resumes  # noqa: E402
+
+PER_DOCUMENT_STAGES = ['extract_skills', 'extract_keywords', 'extract_experience', 'semantic_similarity',
+                       'score_resume', 'preprocess']
+BATCH_STAGES = ['txt_features', 'feats_reduce', 'simil']
+STAGES = PER_DOCUMENT_STAGES + BATCH_STAGES
+
+
+def percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * q / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def build_stages(resumes: List[str], jds: List[str]) -> Dict[str, Callable[[], List[float]]]:
+    """
+    Stage name -> function running the stage once over the corpus and
+    returning per-call wall times (seconds). Per-document stages time each
+    resume; batch stages time one call over the whole corpus.
+    """
+    import nlp_models
+    from config import Config
+    from embeddings import Embedder, EmbeddingCache
+    from scoring import ResumeScorer
+    from text_processing import preprocess
+    from features import txt_features, feats_reduce
+    from model import simil
+
+    scorer = ResumeScorer()
+    # Memory-only embedding cache: a persistent EMBEDDING_CACHE_DIR would turn
+    # every pass into cache hits
+    scorer.embedder = Embedder(nlp_models.get_sentence_model, nlp_models.ST_MODEL_NAME,
+                               EmbeddingCache(Config.EMBEDDING_CACHE_SIZE), Config.EMBEDDING_BATCH_SIZE)
+    scorer.warm_up()
+    jd = jds[0]
+    batch_inputs: Dict[str, Any] = {}
+
+    def per_document(call: Callable[[str], Any]) -> Callable[[], List[float]]:
+        def run() -> List[float]:
+            # Every pass starts cold so embeddings, spaCy docs and the JD
+            # profile are computed again rather than served from the last pass
+            scorer.clear_caches()
+            timings = []
+            for text in resumes:
+                start = time.perf_counter()
+                call(text)
+                timings.append(time.perf_counter() - start)
+            return timings
+        return run
+
+    def once(call: Callable[[], Any]) -> Callable[[], List[float]]:
+        def run() -> List[float]:
+            start = time.perf_counter()
+            call()
+            return [time.perf_counter() - start]
+        return run
+
+    def features() -> Any:
+        return batch_inputs.setdefault('feats', txt_features(resumes, jds))
+
+    def reduced() -> Any:
+        return batch_inputs.setdefault('reduced', feats_reduce(features()))
+
+    return {
+        'extract_skills': per_document(scorer.extract_skills),
+        'extract_keywords': per_document(scorer.extract_keywords),
+        'extract_experience': per_document(scorer.extract_experience),
+        'semantic_similarity': per_document(lambda text: scorer.semantic_similarity(text, jd)),
+        'score_resume': per_document(lambda text: scorer.score_resume(text, jd)),
+        'preprocess': per_document(lambda text: preprocess([text])),
+        'txt_features': once(lambda: txt_features(resumes, jds)),
+        'feats_reduce': once(lambda: feats_reduce(features())),
+        'simil': once(lambda: simil(reduced(), resumes, jds)),
+    }
+
+
+def measure(name: str, run: Callable[[], List[float]], documents: int, repeat: int) -> Dict[str, Any]:
+    run()  # lazy imports and one-off setup; each run starts with cold scorer caches
+    timings: List[float] = []
+    for _ in range(repeat):
+        gc.collect()
+        timings.extend(run())
+    total = sum(timings)
+    # Peak memory is traced in a separate pass so tracing doesn't skew the timings
+    gc.collect()
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        'calls': len(timings),
+        'docs_per_second': round(documents * repeat / total, 3) if total else 0.0,
+        'p50_ms': round(percentile(timings, 50) * 1000, 4),
+        'p99_ms': round(percentile(timings, 99) * 1000, 4),
+        'peak_mem_mb': round(peak / (1024 * 1024), 3),
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float,
+            memory_tolerance: float) -> List[str]:
+    """
+    Regressions of results against a baseline: p50 latency or peak memory
+    more than the tolerance above it, or throughput more than the tolerance
+    below it.
+    """
+    regressions = []
+    for stage, current in results['stages'].items():
+        base = baseline.get('stages', {}).get(stage)
+        if not base:
+            continue
+        if base['p50_ms'] and current['p50_ms'] > base['p50_ms'] * (1 + tolerance):
+            regressions.append(f"{stage}: p50 {current['p50_ms']:.3f} ms vs {base['p50_ms']:.3f} ms baseline")
+        if base['docs_per_second'] and current['docs_per_second'] < base['docs_per_second'] / (1 + tolerance):
+            regressions.append(f"{stage}: {current['docs_per_second']:.1f} docs/s vs "
+                               f"{base['docs_per_second']:.1f} docs/s baseline")
+        if base['peak_mem_mb'] and current['peak_mem_mb'] > base['peak_mem_mb'] * (1 + memory_tolerance):
+            regressions.append(f"{stage}: peak {current['peak_mem_mb']:.1f} MB vs {base['peak_mem_mb']:.1f} MB baseline")
+    if baseline.get('corpus') != results['corpus']:
+        regressions.insert(0, "warning: baseline was recorded on a different corpus; comparison is approximate")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--resumes', type=int, default=200)
+    parser.add_argument('--jds', type=int, default=5)
+    parser.add_argument('--words', type=int, default=400, help='resume body length in words')
+    parser.add_argument('--skill-density', type=float, default=0.1, help='fraction of words that are skills')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=3, help='timed passes per stage')
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=STAGES)
+    parser.add_argument('--output', help='write results JSON here')
+    parser.add_argument('--save-baseline', help='write results JSON here as the new baseline')
+    parser.add_argument('--baseline', help='baseline JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed latency/throughput slowdown')
+    parser.add_argument('--memory-tolerance', type=float, default=0.2, help='allowed peak memory growth')
+    args = parser.parse_args(argv)
+
+    corpus = {'resumes': args.resumes, 'jds': args.jds, 'words': args.words,
+              'skill_density': args.skill_density, 'seed': args.seed}
+    resumes = synthetic_resumes(args.resumes, args.words, args.skill_density, args.seed)
+    jds = synthetic_jds(args.jds, max(1, args.words // 3), min(1.0, args.skill_density * 2), args.seed + 1)
+    stages = build_stages(resumes, jds)
+
+    import nlp_models
+    results: Dict[str, Any] = {
+        'corpus': corpus,
+        'environment': {'python': platform.python_version(), 'platform': platform.platform(),
+                        'models': nlp_models.warm_up()},
+        'stages': {},
+    }
+    print(f"{'stage':<22}{'docs/s':>12}{'p50 ms':>12}{'p99 ms':>12}{'peak MB':>10}")
+    for name in args.stages:
+        stats = measure(name, stages[name], len(resumes), args.repeat)
+        results['stages'][name] = stats
+        print(f"{name:<22}{stats['docs_per_second']:>12.1f}{stats['p50_ms']:>12.3f}"
+              f"{stats['p99_ms']:>12.3f}{stats['peak_mem_mb']:>10.2f}")
+
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {path}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance, args.memory_tolerance)
+        failures = [r for r in regressions if not r.startswith('warning:')]
+        for line in regressions:
+            print(f"REGRESSION {line}" if not line.startswith('warning:') else line)
+        if failures:
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
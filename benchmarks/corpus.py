@@ -0,0 +1,77 @@
+"""
+Synthetic resume and job description generator for the benchmarks.
+
+Documents are built from the skills list plus filler vocabulary, with the
+contact, experience and education lines the scorer looks for, so every
+scoring stage has realistic work to do. Output is deterministic per seed.
+"""
+
+import os
+import random
+from typing import List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FILLER = ['experience', 'team', 'project', 'delivered', 'managed', 'built', 'design', 'customer',
+          'worked', 'with', 'and', 'the', 'for', 'on', 'responsible', 'improved', 'led', 'systems']
+EDUCATION = ['Bachelor of Science in Computer Science', 'Master of Business Administration',
+             'B.Tech in Electronics', 'PhD in Physics', 'Diploma in Accounting', '']
+
+_skills: List[str] = []
+
+
+def skills_vocabulary() -> List[str]:
+    if not _skills:
+        with open(os.path.join(REPO_ROOT, 'Data', 'skill_red.csv'), encoding='utf-8') as f:
+            _skills.extend(sorted({line.strip() for line in f.readlines()[1:] if line.strip()}))
+    return _skills
+
+
+def synthetic_corpus(count: int, words: int, seed: int) -> List[str]:
+    """Random documents drawn from the skills list plus filler vocabulary"""
+    rng = random.Random(seed)
+    vocab = sorted({s.replace('-', ' ') for s in skills_vocabulary()}) + FILLER[:8]
+    return [' '.join(rng.choice(vocab) for _ in range(words)) for _ in range(count)]
+
+
+def _body(rng: random.Random, words: int, skill_density: float) -> str:
+    skills = skills_vocabulary()
+    return ' '.join(rng.choice(skills) if rng.random() < skill_density else rng.choice(FILLER)
+                    for _ in range(words))
+
+
+def synthetic_resumes(count: int, words: int = 400, skill_density: float = 0.1, seed: int = 1) -> List[str]:
+    """
+    Resume-like documents.
+    :param count: number of resumes
+    :param words: body length in words
+    :param skill_density: fraction of body words drawn from the skills list
+    :param seed: random seed
+    """
+    rng = random.Random(seed)
+    resumes = []
+    for i in range(count):
+        start = rng.randint(1995, 2020)
+        lines = [
+            f"Candidate {i}",
+            f"candidate{i}@example.com" if rng.random() < 0.9 else '',
+            f"+1 555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}" if rng.random() < 0.8 else '',
+            f"linkedin.com/in/candidate{i}" if rng.random() < 0.5 else '',
+            f"Experience: {rng.randint(0, 15)} years",
+            f"Software engineer {start} - {min(2024, start + rng.randint(1, 10))}",
+            rng.choice(EDUCATION),
+            _body(rng, words, skill_density),
+        ]
+        resumes.append('\n'.join(line for line in lines if line))
+    return resumes
+
+
+def synthetic_jds(count: int, words: int = 150, skill_density: float = 0.2, seed: int = 2) -> List[str]:
+    """Job-description-like documents; parameters as for synthetic_resumes"""
+    rng = random.Random(seed)
+    return ['\n'.join([
+        f"Job opening {i}",
+        _body(rng, words, skill_density),
+        f"Minimum {rng.randint(1, 8)}+ years of experience",
+        f"Education: {rng.choice(EDUCATION) or 'any degree'}",
+    ]) for i in range(count)]
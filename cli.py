@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Headless bulk scoring: score a directory (or glob) of PDF/DOCX resumes
+against a job description and stream the results as JSONL or CSV.
+
+Usage:
+    python cli.py --jd job.txt resumes/ -o results.jsonl
+    python cli.py --jd job.pdf "archive/**/*.docx" -o results.csv --workers 8 --top-n 20
+    python cli.py --jd job.txt resumes/ -o results.jsonl --checkpoint run.ckpt   # rerun to resume
+"""
+
+import argparse
+import csv
+import glob
+import heapq
+import json
+import logging
+import os
+import sys
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple
+from batch import BatchResult, BatchScorer, ResumeDocument
+from config import Config
+from extract_txt import extract_document
+from result_cache import ResultCache
+
+logger = logging.getLogger(__name__)
+
+CSV_FIELDS = ['path', 'filename', 'status', 'error', 'final_score', 'skills_matched', 'skills_missing',
+              'skills_score', 'keyword_score', 'exp_score', 'edu_score', 'contact_score', 'semantic_score',
+              'recommendations']
+
+
+def find_resumes(inputs: Iterable[str]) -> List[str]:
+    """
+    Expand directories (recursively) and glob patterns into a sorted,
+    de-duplicated list of supported resume files
+    """
+    paths: Set[str] = set()
+    for pattern in inputs:
+        if os.path.isdir(pattern):
+            for root, _, files in os.walk(pattern):
+                paths.update(os.path.join(root, f) for f in files)
+        else:
+            paths.update(glob.glob(pattern, recursive=True))
+    supported = tuple(Config.SUPPORTED_FORMATS)
+    return sorted(p for p in paths if os.path.isfile(p) and p.lower().endswith(supported))
+
+
+def read_job_description(path: str) -> str:
+    if path.lower().endswith(tuple(Config.SUPPORTED_FORMATS)):
+        result = extract_document(path, path)
+        if not result.ok:
+            raise ValueError(f"Could not read job description {path}: {result.error}")
+        return result.text
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def to_row(path: str, result: BatchResult) -> Dict[str, Any]:
+    row: Dict[str, Any] = {'path': path, 'filename': result.name,
+                           'status': 'ok' if result.ok else 'error', 'error': result.error}
+    if result.score is not None:
+        breakdown = result.score['breakdown']
+        row.update({
+            'final_score': result.score['final_score'],
+            'skills_matched': result.score['skills_matched'],
+            'skills_missing': result.score['skills_missing'],
+            **{k: breakdown[k] for k in ['skills_score', 'keyword_score', 'exp_score', 'edu_score',
+                                        'contact_score', 'semantic_score']},
+            'recommendations': result.score['recommendations'],
+            'breakdown': breakdown,
+        })
+    return row
+
+
+class ResultWriter:
+    """
+    Appends result rows to a JSONL or CSV stream, flushing after every batch
+    """
+
+    def __init__(self, stream: TextIO, fmt: str, write_header: bool = True):
+        self.stream = stream
+        self.fmt = fmt
+        self._csv = None
+        if fmt == 'csv':
+            self._csv = csv.DictWriter(stream, fieldnames=CSV_FIELDS, extrasaction='ignore')
+            if write_header:
+                self._csv.writeheader()
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        for row in rows:
+            if self._csv is not None:
+                flat = dict(row)
+                if isinstance(flat.get('recommendations'), list):
+                    flat['recommendations'] = '; '.join(flat['recommendations'])
+                self._csv.writerow(flat)
+            else:
+                self.stream.write(json.dumps(row) + '\n')
+        self.stream.flush()
+
+
+def _complete_rows(f: BinaryIO, fmt: str) -> Tuple[List[Dict[str, Any]], int]:
+    """Rows of an output file up to its first incomplete record, and that record's byte offset"""
+    rows: List[Dict[str, Any]] = []
+    good = consumed = 0
+    if fmt != 'csv':
+        for raw in f:
+            if not raw.endswith(b'\n'):
+                break
+            if raw.strip():
+                try:
+                    row = json.loads(raw.decode('utf-8'))
+                except ValueError:
+                    break
+                if not isinstance(row, dict) or 'path' not in row:
+                    break
+                rows.append(row)
+            good += len(raw)
+        return rows, good
+
+    terminated = True
+
+    def lines() -> Iterator[str]:
+        # csv pulls one physical line at a time, so consumed always ends
+        # where the record just returned ends
+        nonlocal consumed, terminated
+        for raw in f:
+            consumed += len(raw)
+            terminated = raw.endswith(b'\n')
+            yield raw.decode('utf-8')
+
+    reader = csv.reader(lines(), strict=True)
+    try:
+        header = next(reader, None)
+        if header is None or not terminated:
+            return rows, 0
+        good = consumed
+        for record in reader:
+            if not terminated or (record and len(record) != len(header)):
+                break
+            if record:
+                rows.append(dict(zip(header, record)))
+            good = consumed
+    except (csv.Error, UnicodeDecodeError):
+        pass
+    return rows, good
+
+
+def recover_output(path: str, fmt: str) -> List[Dict[str, Any]]:
+    """
+    Complete rows already written to an output file by an earlier,
+    interrupted run. A record torn by a crash mid-write (and anything after
+    it) is cut off the file, so new rows are appended after a clean record.
+    """
+    with open(path, 'rb') as f:
+        rows, good = _complete_rows(f, fmt)
+    size = os.path.getsize(path)
+    if good < size:
+        logger.warning(f"Dropping {size - good} bytes of incomplete output at the end of {path}")
+        with open(path, 'r+b') as f:
+            f.truncate(good)
+    return rows
+
+
+def load_checkpoint(path: Optional[str]) -> Set[str]:
+    if not path or not os.path.exists(path):
+        return set()
+    with open(path, encoding='utf-8') as f:
+        return {line.rstrip('\n') for line in f if line.strip()}
+
+
+class TopN:
+    """Keeps the n best-scoring rows in a bounded min-heap"""
+
+    def __init__(self, n: int):
+        self.n = n
+        self._heap: List[Tuple[float, int, Dict[str, Any]]] = []
+        self._seq = 0
+
+    def add(self, row: Dict[str, Any]) -> None:
+        if self.n <= 0 or row.get('final_score') in (None, ''):
+            return
+        item = (float(row['final_score']), -self._seq, row)
+        self._seq += 1
+        if len(self._heap) < self.n:
+            heapq.heappush(self._heap, item)
+        elif item > self._heap[0]:
+            heapq.heapreplace(self._heap, item)
+
+    def ranked(self) -> List[Dict[str, Any]]:
+        return [row for _, _, row in sorted(self._heap, reverse=True)]
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('inputs', nargs='+', help='resume directories, files or glob patterns')
+    parser.add_argument('--jd', required=True, help='job description file (.txt, .pdf or .docx)')
+    parser.add_argument('-o', '--output', help='output file (default: stdout)')
+    parser.add_argument('--format', choices=['jsonl', 'csv'],
+                        help='output format (default: from the output extension, else jsonl)')
+    parser.add_argument('--workers', type=int, default=Config.BATCH_WORKERS, help='worker processes')
+    parser.add_argument('--batch-size', type=int, default=256,
+                        help='files loaded and scored per batch; bounds memory use')
+    parser.add_argument('--top-n', type=int, default=0, help='print the N best resumes to stderr at the end')
+    parser.add_argument('--checkpoint', help='file recording finished resumes; rerun with it to resume')
+    parser.add_argument('--cache', default=Config.RESULT_CACHE_PATH, help='SQLite result cache path')
+    parser.add_argument('-q', '--quiet', action='store_true', help='no progress output')
+    args = parser.parse_args(argv)
+    if args.format is None:
+        args.format = 'csv' if args.output and args.output.lower().endswith('.csv') else 'jsonl'
+    if args.checkpoint and not args.output:
+        parser.error('--checkpoint needs --output, so earlier results are kept')
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s %(name)s: %(message)s')
+    job_description = read_job_description(args.jd)
+    paths = find_resumes(args.inputs)
+    top = TopN(args.top_n)
+
+    # The output itself says which resumes are finished: rows written just
+    # before a crash count as done even if the checkpoint missed them, and
+    # checkpointed resumes whose rows are gone are scored again
+    done: Set[str] = set()
+    if args.checkpoint and os.path.exists(args.output):
+        for row in recover_output(args.output, args.format):
+            if row.get('path') not in done:
+                done.add(row['path'])
+                top.add(row)
+    # A file cut back to nothing (e.g. a torn CSV header) starts over with a header
+    resuming = bool(args.checkpoint) and os.path.exists(args.output) and os.path.getsize(args.output) > 0
+    lost = load_checkpoint(args.checkpoint) - done
+    if lost:
+        logger.warning(f"{len(lost)} checkpointed resumes have no row in {args.output}; scoring them again")
+    todo = [p for p in paths if p not in done]
+    out = open(args.output, 'a' if resuming else 'w', encoding='utf-8', newline='') if args.output else sys.stdout
+    checkpoint = None
+    if args.checkpoint:
+        # Rewrite the checkpoint to match the output it now describes
+        checkpoint = open(args.checkpoint, 'w', encoding='utf-8')
+        checkpoint.write(''.join(p + '\n' for p in sorted(done)))
+        checkpoint.flush()
+    cache = ResultCache(args.cache) if args.cache else None
+    writer = ResultWriter(out, args.format, write_header=not resuming)
+    if not args.quiet:
+        print(f"Scoring {len(todo)} resumes ({len(paths) - len(todo)} already done) with {args.workers} workers",
+              file=sys.stderr)
+
+    failed = 0
+    try:
+        with BatchScorer(workers=args.workers, cache=cache) as batch:
+            for start in range(0, len(todo), args.batch_size):
+                chunk = todo[start:start + args.batch_size]
+                documents = []
+                for path in chunk:
+                    try:
+                        documents.append(ResumeDocument.from_path(path))
+                    except OSError as e:
+                        documents.append(ResumeDocument(os.path.basename(path), b''))
+                        logger.warning(f"Could not read {path}: {e}")
+                rows = [to_row(path, result) for path, result in zip(chunk, batch.score(documents, job_description))]
+                writer.write(rows)
+                for row in rows:
+                    top.add(row)
+                    failed += row['status'] != 'ok'
+                if checkpoint is not None:
+                    checkpoint.write(''.join(p + '\n' for p in chunk))
+                    checkpoint.flush()
+                if not args.quiet:
+                    print(f"{min(start + args.batch_size, len(todo))}/{len(todo)} scored", file=sys.stderr)
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+        if out is not sys.stdout:
+            out.close()
+        if cache is not None:
+            cache.close()
+
+    if args.top_n:
+        print(f"Top {args.top_n}:", file=sys.stderr)
+        for rank, row in enumerate(top.ranked(), start=1):
+            print(f"{rank:>4}. {row['final_score']:>5}  {row['path']}", file=sys.stderr)
+    if failed and not args.quiet:
+        print(f"{failed} resumes could not be scored", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
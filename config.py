@@ -3,6 +3,27 @@ import os
 class Config:
     MAX_FILE_SIZE = int(os.getenv('MAX_FILE_SIZE', 10 * 1024 * 1024))  # 10MB default
     SUPPORTED_FORMATS = ['.pdf', '.docx']
+    PDF_MAX_PAGES = int(os.getenv('PDF_MAX_PAGES', 50))
+    PDF_MAX_CHARS = int(os.getenv('PDF_MAX_CHARS', 200_000))  # plenty for scoring
+    PDF_MAX_SECONDS = float(os.getenv('PDF_MAX_SECONDS', 20))
+    PDF_WORKERS = int(os.getenv('PDF_WORKERS', 1))
+    PDF_PARALLEL_MIN_PAGES = int(os.getenv('PDF_PARALLEL_MIN_PAGES', 40))
+    SPACY_BATCH_SIZE = int(os.getenv('SPACY_BATCH_SIZE', 32))
+    SPACY_N_PROCESS = int(os.getenv('SPACY_N_PROCESS', 1))
+    BATCH_WORKERS = int(os.getenv('BATCH_WORKERS', os.cpu_count() or 1))
+    BATCH_CHUNK_SIZE = int(os.getenv('BATCH_CHUNK_SIZE', 8))  # documents per worker task
+    FEATURE_MODEL_PATH = os.getenv('FEATURE_MODEL_PATH', os.path.join('models', 'feature_model.joblib'))
+    EMBEDDING_BATCH_SIZE = int(os.getenv('EMBEDDING_BATCH_SIZE', 32))
+    EMBEDDING_CACHE_SIZE = int(os.getenv('EMBEDDING_CACHE_SIZE', 2048))
+    EMBEDDING_CACHE_DIR = os.getenv('EMBEDDING_CACHE_DIR')  # on-disk store disabled when unset
+    RESULT_CACHE_PATH = os.getenv('RESULT_CACHE_PATH')  # SQLite file; extraction/score cache disabled when unset
+    RESULT_CACHE_MAX_BYTES = int(os.getenv('RESULT_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+    SERVICE_WORKERS = int(os.getenv('SERVICE_WORKERS', 2))  # scoring threads in the HTTP service
+    SERVICE_MAX_BATCH = int(os.getenv('SERVICE_MAX_BATCH', 16))  # requests per micro-batch
+    SERVICE_MAX_WAIT_MS = float(os.getenv('SERVICE_MAX_WAIT_MS', 10))  # how long a micro-batch may wait to fill
+    SERVICE_MAX_PENDING = int(os.getenv('SERVICE_MAX_PENDING', 256))  # queued + running before rejecting with 503
+    PROFILE_STAGES = os.getenv('PROFILE_STAGES', '0') == '1'  # per-stage timing histograms, see profiling.py
+    PROFILE_BREAKDOWN = os.getenv('PROFILE_BREAKDOWN', '0') == '1'  # also add timings_ms to each score breakdown
     SCORE_WEIGHTS = {
         'skills_match': 0.3,
         'experience_level': 0.25,
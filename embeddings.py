@@ -0,0 +1,218 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+import contextlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+import numpy as np  # type: ignore
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking
+    fcntl = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(text: str, namespace: str = '') -> str:
+    """
+    Stable key for a piece of text; namespace keeps different models apart.
+    """
+    h = hashlib.sha256()
+    h.update(namespace.encode('utf-8'))
+    h.update(b'\0')
+    h.update(text.encode('utf-8', 'surrogatepass'))
+    return h.hexdigest()
+
+
+class EmbeddingStore:
+    """
+    On-disk embedding store: a memory-mapped vectors.npy plus an index.json
+    mapping content hashes to rows. The matrix grows by doubling. Several
+    processes may share a directory: writers hold an exclusive flock on
+    store.lock and pick up each other's rows before appending.
+    """
+    INITIAL_CAPACITY = 256
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.vectors_path = os.path.join(directory, 'vectors.npy')
+        self.index_path = os.path.join(directory, 'index.json')
+        self.lock_path = os.path.join(directory, 'store.lock')
+        self.index: Dict[str, int] = {}
+        self._vectors: Optional[np.ndarray] = None
+        self._loaded: Optional[tuple] = None
+        self._thread_lock = threading.Lock()
+        with self._locked(exclusive=False):
+            self._refresh()
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @contextlib.contextmanager
+    def _locked(self, exclusive: bool):
+        with self._thread_lock, open(self.lock_path, 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _refresh(self) -> None:
+        """Reload index and matrix if another writer replaced index.json since we last read it."""
+        try:
+            st = os.stat(self.index_path)
+        except FileNotFoundError:
+            return
+        signature = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if signature == self._loaded or not os.path.exists(self.vectors_path):
+            return
+        try:
+            with open(self.index_path, encoding='utf-8') as f:
+                index = json.load(f)
+            vectors = np.load(self.vectors_path, mmap_mode='r+')
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable embedding store in {self.directory}: {e}")
+            return
+        self.index, self._vectors, self._loaded = index, vectors, signature
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        # put_many swaps index and matrix under this lock; read them as a pair
+        with self._thread_lock:
+            row = self.index.get(key)
+            if row is None or self._vectors is None:
+                return None
+            return np.array(self._vectors[row])
+
+    def put_many(self, items: Dict[str, np.ndarray]) -> None:
+        with self._thread_lock:
+            if all(k in self.index for k in items):
+                return
+        with self._locked(exclusive=True):
+            # Another process may have appended rows since we last looked
+            self._refresh()
+            new = {k: v for k, v in items.items() if k not in self.index}
+            if not new:
+                return
+            dim = len(next(iter(new.values())))
+            self._reserve(len(self.index) + len(new), dim)
+            for key, vector in new.items():
+                row = len(self.index)
+                self._vectors[row] = vector  # type: ignore
+                self.index[key] = row
+            self._vectors.flush()  # type: ignore
+            tmp_path = self.index_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.index, f)
+            os.replace(tmp_path, self.index_path)
+            st = os.stat(self.index_path)
+            self._loaded = (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _reserve(self, rows: int, dim: int) -> None:
+        if self._vectors is not None and self._vectors.shape[0] >= rows:
+            return
+        capacity = self.INITIAL_CAPACITY if self._vectors is None else self._vectors.shape[0]
+        while capacity < rows:
+            capacity *= 2
+        tmp_path = self.vectors_path + '.tmp'
+        grown = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.float32, shape=(capacity, dim))
+        if self._vectors is not None:
+            grown[:len(self.index)] = self._vectors[:len(self.index)]
+        grown.flush()
+        del grown
+        self._vectors = None
+        os.replace(tmp_path, self.vectors_path)
+        self._vectors = np.load(self.vectors_path, mmap_mode='r+')
+
+
+class EmbeddingCache:
+    """
+    LRU cache of embeddings keyed by content hash, optionally backed by an
+    EmbeddingStore so vectors survive restarts. Safe to share between threads.
+    """
+
+    def __init__(self, max_items: int = 2048, directory: Optional[str] = None):
+        self.max_items = max_items
+        self._items: 'OrderedDict[str, np.ndarray]' = OrderedDict()
+        self.store = EmbeddingStore(directory) if directory else None
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            vector = self._items.get(key)
+            if vector is not None:
+                self._items.move_to_end(key)
+            elif self.store is not None:
+                vector = self.store.get(key)
+                if vector is not None:
+                    self._remember(key, vector)
+            if vector is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return vector
+
+    def put_many(self, items: Dict[str, np.ndarray]) -> None:
+        with self._lock:
+            for key, vector in items.items():
+                self._remember(key, vector)
+        if self.store is not None:
+            self.store.put_many(items)
+
+    def clear(self) -> None:
+        """Drop the in-memory entries and counters; the disk store is kept."""
+        with self._lock:
+            self._items.clear()
+            self.hits = self.misses = 0
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        self._items[key] = vector
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+
+
+class Embedder:
+    """
+    Batched sentence-transformer encoding through an EmbeddingCache, so each
+    distinct text is sent to the model at most once. model may also be a
+    zero-argument callable, resolved on the first cache miss.
+    """
+
+    def __init__(self, model: Any, model_name: str = '', cache: Optional[EmbeddingCache] = None,
+                 batch_size: int = 32):
+        self.model = model
+        self.model_name = model_name
+        self.cache = cache if cache is not None else EmbeddingCache()
+        self.batch_size = batch_size
+
+    def encode(self, texts: List[str], batch_size: Optional[int] = None) -> np.ndarray:
+        """
+        Encode texts, running the model only on cache misses.
+        :param texts: texts to embed
+        :param batch_size: model batch size, defaults to the embedder's
+        :return: float32 matrix with one row per text, in input order
+        """
+        keys = [content_hash(t, self.model_name) for t in texts]
+        vectors: List[Optional[np.ndarray]] = [self.cache.get(k) for k in keys]
+        missing: Dict[str, str] = {}
+        for key, text, vector in zip(keys, texts, vectors):
+            if vector is None:
+                missing.setdefault(key, text)
+        if missing:
+            model = self.model if hasattr(self.model, 'encode') else self.model()
+            encoded = model.encode(list(missing.values()), batch_size=batch_size or self.batch_size,
+                                   convert_to_numpy=True)
+            fresh = {k: np.asarray(v, dtype=np.float32) for k, v in zip(missing, encoded)}
+            self.cache.put_many(fresh)
+            vectors = [fresh[k] if v is None else v for k, v in zip(keys, vectors)]
+        if not vectors:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.vstack(vectors)  # type: ignore
@@ -1,16 +1,84 @@
 import re
 import logging
-from typing import List
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Digit runs standing alone as words: 10-15 digits are phone numbers, and
+# any run of 10 or more counts as "has a phone" for scoring
+_DIGIT_RUN = re.compile(r'\b\d{10,}\b')
+MAX_PHONE_DIGITS = 15
+_EMAIL = re.compile(r'[A-Za-z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+')
+# Looser test scoring uses for "has an email"
+_EMAIL_LIKE = re.compile(r'[\w\.-]+@[\w\.-]+')
+# IGNORECASE also matches a few non-ASCII look-alikes, so hits are confirmed
+# with lower(), which is what the check has always used
+_LINKEDIN = re.compile(r'linkedin\.com', re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class Entities:
+    """
+    Everything the entity extractor finds in one resume.
+    """
+    name: str
+    emails: Tuple[str, ...]
+    phones: Tuple[str, ...]
+    has_email: bool
+    has_phone: bool
+    has_linkedin: bool
+    skills: FrozenSet[str] = frozenset()
+
+    def contact(self) -> Dict[str, bool]:
+        return {'email': self.has_email, 'phone': self.has_phone, 'linkedin': self.has_linkedin}
+
+
+def _has_linkedin(text: str) -> bool:
+    return any(m.group().lower() == 'linkedin.com' for m in _LINKEDIN.finditer(text))
+
+
+class EntityExtractor:
+    """
+    Precompiled contact, name and skill extraction shared by this module and
+    ResumeScorer. Each field is found with one search; the email patterns
+    only run on text containing '@'. Skills come from a SkillMatcher when
+    one is given.
+    """
+
+    def __init__(self, skill_matcher: Optional[Any] = None):
+        self.skill_matcher = skill_matcher
+
+    def contact_info(self, text: str) -> Dict[str, bool]:
+        """
+        Whether the text has an email, a phone number and a LinkedIn URL.
+        """
+        return {
+            'email': '@' in text and _EMAIL_LIKE.search(text) is not None,
+            'phone': _DIGIT_RUN.search(text) is not None,
+            'linkedin': _has_linkedin(text),
+        }
+
+    def extract(self, text: str) -> Entities:
+        digit_runs = _DIGIT_RUN.findall(text)
+        has_at = '@' in text
+        return Entities(
+            name=get_name(text),
+            emails=tuple(_EMAIL.findall(text)) if has_at else (),
+            phones=tuple(run for run in digit_runs if len(run) <= MAX_PHONE_DIGITS),
+            has_email=has_at and _EMAIL_LIKE.search(text) is not None,
+            has_phone=bool(digit_runs),
+            has_linkedin=_has_linkedin(text),
+            skills=frozenset(self.skill_matcher.find(text)) if self.skill_matcher is not None else frozenset(),
+        )
+
+
 def get_number(text):
-    pattern = re.compile(r'\b\d{10,15}\b')
-    return pattern.findall(text)
+    return [run for run in _DIGIT_RUN.findall(text) if len(run) <= MAX_PHONE_DIGITS]
 
 def get_email(text):
-    r = re.compile(r'[A-Za-z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+')
-    return r.findall(str(text))
+    text = str(text)
+    return _EMAIL.findall(text) if '@' in text else []
 
 def get_name(text):
     # Simple heuristic: first line or first two words
@@ -25,9 +93,10 @@ def get_name(text):
 
 def get_skills(text, skills):
     # Simple keyword match
+    lowered = text.lower()
     found = set()
     for skill in skills:
-        if skill.lower() in text.lower():
+        if skill.lower() in lowered:
             found.add(skill)
     return found
 
@@ -1,20 +1,208 @@
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
 import PyPDF2  # type: ignore
 from docx import Document  # type: ignore
+from config import Config
+import profiling
+
+STATUS_OK = 'ok'
+STATUS_EMPTY = 'empty'
+STATUS_ERROR = 'error'
+STATUS_UNSUPPORTED = 'unsupported'
+
+@dataclass
+class ExtractionResult:
+    """
+    Text extracted from a document plus how the extraction went. Only results
+    with status 'ok' carry text worth scoring; otherwise error says why.
+    truncated means a page or character budget stopped extraction early;
+    timed_out means the time budget did.
+    """
+    text: str
+    status: str = STATUS_OK
+    error: Optional[str] = None
+    page_count: int = 0
+    pages_read: int = 0
+    byte_size: int = 0
+    seconds: float = 0.0
+    truncated: bool = False
+    timed_out: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.status == STATUS_OK
+
+def _extract_page_range(data: bytes, start: int, stop: int) -> List[str]:
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+def _abandon_pool(pool: ProcessPoolExecutor) -> None:
+    """Shut a pool down without waiting, killing workers still busy on a page chunk."""
+    processes = list((getattr(pool, '_processes', None) or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+
+class PdfPageStream:
+    """
+    Iterates over the text of a PDF page by page, stopping at the page,
+    character or time budget, whichever comes first. The time budget is
+    checked between pages. Documents with at least parallel_min_pages pages
+    are read in page chunks on a process pool when workers > 1; there the
+    budget also bounds the wait, and workers still busy when it runs out
+    are terminated.
+    After iteration, pages_read, truncated and timed_out describe the stop.
+    """
+
+    def __init__(self, file, max_pages: Optional[int] = None, max_chars: Optional[int] = None,
+                 max_seconds: Optional[float] = None, workers: int = 1,
+                 parallel_min_pages: Optional[int] = None, chunk_pages: int = 8):
+        self.file = file
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.max_seconds = max_seconds
+        self.workers = workers
+        self.parallel_min_pages = parallel_min_pages if parallel_min_pages is not None else Config.PDF_PARALLEL_MIN_PAGES
+        self.chunk_pages = chunk_pages
+        self.reader = PyPDF2.PdfReader(file)
+        self.page_count = len(self.reader.pages)
+        self.pages_read = 0
+        self.chars_read = 0
+        self.truncated = False
+        self.timed_out = False
+
+    def _page_limit(self) -> int:
+        if self.max_pages is not None and self.max_pages < self.page_count:
+            return self.max_pages
+        return self.page_count
+
+    def __iter__(self) -> Iterator[str]:
+        deadline = None if self.max_seconds is None else time.monotonic() + self.max_seconds
+        limit = self._page_limit()
+        if self.workers > 1 and limit >= self.parallel_min_pages:
+            pages = self._parallel_pages(limit, deadline)
+        else:
+            pages = (self.reader.pages[i].extract_text() or "" for i in range(limit))
+        for page_text in pages:
+            self.pages_read += 1
+            self.chars_read += len(page_text)
+            yield page_text
+            if self.max_chars is not None and self.chars_read >= self.max_chars:
+                break
+            if deadline is not None and time.monotonic() > deadline:
+                self.timed_out = True
+                break
+        if self.pages_read < self.page_count and not self.timed_out:
+            self.truncated = True
+
+    def _parallel_pages(self, limit: int, deadline: Optional[float]) -> Iterator[str]:
+        data = self._read_bytes()
+        # No `with`: leaving one would wait for chunks still being extracted,
+        # which is exactly what the time budget must not do
+        pool = ProcessPoolExecutor(max_workers=self.workers)
+        finished = False
+        try:
+            futures = [pool.submit(_extract_page_range, data, start, min(start + self.chunk_pages, limit))
+                       for start in range(0, limit, self.chunk_pages)]
+            for future in futures:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    chunk = future.result(timeout=timeout)
+                except FutureTimeoutError:
+                    self.timed_out = True
+                    return
+                yield from chunk
+            finished = True
+        finally:
+            if finished:
+                pool.shutdown()
+            else:
+                _abandon_pool(pool)
+
+    def _read_bytes(self) -> bytes:
+        if isinstance(self.file, (str, os.PathLike)):
+            with open(self.file, 'rb') as f:
+                return f.read()
+        self.file.seek(0)
+        return self.file.read()
+
+def extract_pdf_text(file, max_pages: Optional[int] = None, max_chars: Optional[int] = None,
+                     max_seconds: Optional[float] = None, workers: Optional[int] = None) -> ExtractionResult:
+    """
+    Extract PDF text within page, character and time budgets.
+    Budgets default to Config.PDF_MAX_PAGES, PDF_MAX_CHARS and PDF_MAX_SECONDS.
+    :param file: path or binary file-like object
+    :param workers: processes for large documents, defaults to Config.PDF_WORKERS
+    :return: ExtractionResult with the text read and budget metadata
+    """
+    stream = PdfPageStream(
+        file,
+        max_pages=max_pages if max_pages is not None else Config.PDF_MAX_PAGES,
+        max_chars=max_chars if max_chars is not None else Config.PDF_MAX_CHARS,
+        max_seconds=max_seconds if max_seconds is not None else Config.PDF_MAX_SECONDS,
+        workers=workers if workers is not None else Config.PDF_WORKERS
+    )
+    text = "".join(stream).strip()
+    return ExtractionResult(text, STATUS_OK if text else STATUS_EMPTY,
+                            None if text else "No extractable text (scanned or image-only PDF?)",
+                            page_count=stream.page_count, pages_read=stream.pages_read,
+                            truncated=stream.truncated, timed_out=stream.timed_out)
+
+def extract_docx_text(file) -> ExtractionResult:
+    doc = Document(file)
+    text = "\n".join([para.text for para in doc.paragraphs]).strip()
+    return ExtractionResult(text, STATUS_OK if text else STATUS_EMPTY, None if text else "Document has no text")
 
 def extract_text_from_pdf(file) -> str:
     try:
-        reader = PyPDF2.PdfReader(file)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() or ""
-        return text.strip()
+        return extract_pdf_text(file).text
     except Exception as e:
         return f"[PDF extraction error: {e}]"
 
 def extract_text_from_docx(file) -> str:
     try:
-        doc = Document(file)
-        text = "\n".join([para.text for para in doc.paragraphs])
-        return text.strip()
+        return extract_docx_text(file).text
+    except Exception as e:
+        return f"[DOCX extraction error: {e}]"
+
+def _byte_size(file) -> int:
+    try:
+        if isinstance(file, (str, os.PathLike)):
+            return os.path.getsize(file)
+        position = file.tell()
+        file.seek(0, os.SEEK_END)
+        size = file.tell()
+        file.seek(position)
+        return size
+    except Exception:
+        return 0
+
+def extract_document(file, filename: str) -> ExtractionResult:
+    """
+    Extract text from a PDF or DOCX file, choosing the extractor by extension.
+    Never raises: failures come back as a non-ok ExtractionResult so callers
+    can skip scoring them.
+    :param file: path or binary file-like object
+    :param filename: original file name, used for its extension
+    :return: ExtractionResult with text, status, page count, byte size and timing
+    """
+    start = time.perf_counter()
+    ext = os.path.splitext(filename)[1].lower()
+    try:
+        if ext == '.pdf':
+            result = extract_pdf_text(file)
+        elif ext == '.docx':
+            result = extract_docx_text(file)
+        else:
+            result = ExtractionResult('', STATUS_UNSUPPORTED, f"Unsupported file type: {ext or filename}")
     except Exception as e:
-        return f"[DOCX extraction error: {e}]" 
\ No newline at end of file
+        result = ExtractionResult('', STATUS_ERROR, f"{ext.lstrip('.').upper() or 'File'} extraction error: {e}")
+    result.byte_size = _byte_size(file)
+    result.seconds = time.perf_counter() - start
+    profiling.observe('extraction', result.seconds)
+    return result
@@ -1,62 +1,199 @@
+import os
+import time
+import joblib  # type: ignore
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
+from scipy import sparse  # type: ignore
+from sklearn.feature_extraction.text import TfidfVectorizer, HashingVectorizer, TfidfTransformer
 from sklearn.decomposition import TruncatedSVD
+from sklearn.pipeline import make_pipeline
 import logging
 from typing import List, Union, Optional
 import numpy as np
 
+# Feature matrices stay sparse (or small dense arrays after reduction) through
+# the pipeline; a (1,3)-gram TF-IDF matrix is far too wide to densify.
+Features = Union[sparse.spmatrix, np.ndarray, pd.DataFrame]
+
 logger = logging.getLogger(__name__)
 
-def txt_features(p_resumetxt: List[str], p_jdtxt: List[str]) -> pd.DataFrame:
+def txt_features(p_resumetxt: List[str], p_jdtxt: List[str]) -> sparse.csr_matrix:
     """
-    This function returns a dataframe of features 
-    extracted from a list of texts using transformers if available,
-    otherwise falls back to TF-IDF.
+    This function returns a sparse TF-IDF matrix of features
+    extracted from a list of texts.
     :param p_resumetxt: preprocessed list of resume texts
     :param p_jdtxt: preprocessed list of job description texts
-    :return: dataframe of features 
+    :return: CSR matrix of features, one row per text (resumes first)
     """
     try:
         txt = p_resumetxt + p_jdtxt
         if not txt:
             logger.warning("Empty text list provided")
-            return pd.DataFrame()
+            return sparse.csr_matrix((0, 0))
         # Only use TF-IDF
         tv = TfidfVectorizer(max_df=0.85, min_df=1, ngram_range=(1,3))
         tfidf_wm = tv.fit_transform(txt)
-        tfidf_tokens = tv.get_feature_names_out()
-        tfidf_array = tfidf_wm.toarray()  # type: ignore
-        df_tfidfvect = pd.DataFrame(data=tfidf_array, columns=tfidf_tokens)
-        return df_tfidfvect
+        return sparse.csr_matrix(tfidf_wm)
     except Exception as e:
         logger.error(f"Error in txt_features: {str(e)}")
-        return pd.DataFrame()
+        return sparse.csr_matrix((0, 0))
 
-def feats_reduce(feats_df: pd.DataFrame) -> pd.DataFrame:
+def feats_reduce(feats: Features) -> Features:
     """
-    This function returns a reduced dimensionality of a dataframe of features
-    :param feats_df: dataframe of features extracted from a list of texts
-    :return: reduced dimensionality of a dataframe of features
+    This function returns a reduced dimensionality of a matrix of features
+    :param feats: sparse matrix (or array/dataframe) of features extracted from a list of texts
+    :return: dense array of at most 30 components, or the input if already that narrow
     """
     try:
-        if feats_df.empty:
-            logger.warning("Empty features DataFrame provided")
-            return pd.DataFrame()
+        if feats.shape[0] == 0 or feats.shape[1] == 0:
+            logger.warning("Empty features matrix provided")
+            return sparse.csr_matrix((0, 0))
             
         # Ensure we have enough features for dimensionality reduction
-        if feats_df.shape[1] <= 30:
+        if feats.shape[1] <= 30:
             logger.info("Features already have <= 30 dimensions, returning as is")
-            return feats_df
+            return feats
             
+        # TruncatedSVD works on the sparse matrix directly
         dimrec = TruncatedSVD(n_components=30, n_iter=7, random_state=42)
-        feats_red = dimrec.fit_transform(feats_df)
-        
-        # Converting transformed vector to DataFrame
-        feat_red = pd.DataFrame(feats_red)
-        return feat_red
+        return dimrec.fit_transform(feats)
         
     except Exception as e:
         logger.error(f"Error in feats_reduce: {str(e)}")
-        # Return original DataFrame as fallback
-        return feats_df
+        # Return original features as fallback
+        return feats
+
+def to_frame(feats: Features, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Build a DataFrame from a feature matrix for reporting; sparse input
+    becomes a sparse-backed frame so it is never densified.
+    :param feats: feature matrix
+    :param columns: optional column names
+    :return: dataframe of features
+    """
+    if isinstance(feats, pd.DataFrame):
+        return feats
+    if sparse.issparse(feats):
+        return pd.DataFrame.sparse.from_spmatrix(feats, columns=columns)
+    return pd.DataFrame(feats, columns=columns)
+
+
+class FeatureModel:
+    """
+    A feature pipeline (vectorizer + TruncatedSVD) that is fit once, saved to
+    disk and then used to transform new resumes and JDs one at a time, so the
+    per-document cost does not grow with the corpus.
+
+    method='tfidf' uses the same TfidfVectorizer settings as txt_features;
+    method='hashing' uses a HashingVectorizer (plus IDF weighting), whose
+    feature space is fixed and never grows with new vocabulary.
+    """
+
+    def __init__(self, method: str = 'tfidf', n_components: int = 30, n_features: int = 2 ** 18):
+        if method not in ('tfidf', 'hashing'):
+            raise ValueError(f"Unknown feature method: {method}")
+        self.method = method
+        self.n_components = n_components
+        self.n_features = n_features
+        self.vectorizer = None
+        self.svd: Optional[TruncatedSVD] = None
+        self.fitted_at: Optional[float] = None
+        self.fit_size = 0
+        self.transformed_since_fit = 0
+
+    def _make_vectorizer(self):
+        if self.method == 'hashing':
+            return make_pipeline(
+                HashingVectorizer(ngram_range=(1,3), n_features=self.n_features, alternate_sign=False, norm=None),
+                TfidfTransformer()
+            )
+        return TfidfVectorizer(max_df=0.85, min_df=1, ngram_range=(1,3))
+
+    @property
+    def is_fitted(self) -> bool:
+        return self.vectorizer is not None
+
+    def fit(self, texts: List[str]) -> 'FeatureModel':
+        """
+        Fit the vectorizer and SVD on a corpus of preprocessed texts
+        :param texts: preprocessed resume and JD texts
+        :return: self
+        """
+        if not texts:
+            raise ValueError("Cannot fit a feature model on an empty corpus")
+        vectorizer = self._make_vectorizer()
+        feats = vectorizer.fit_transform(texts)
+        svd = None
+        # Same rule as feats_reduce: skip reduction when already narrow enough
+        if feats.shape[1] > self.n_components:
+            svd = TruncatedSVD(n_components=self.n_components, n_iter=7, random_state=42)
+            svd.fit(feats)
+        self.vectorizer, self.svd = vectorizer, svd
+        self.fitted_at = time.time()
+        self.fit_size = len(texts)
+        self.transformed_since_fit = 0
+        return self
+
+    def transform(self, texts: List[str]) -> np.ndarray:
+        """
+        Project new preprocessed texts into the fitted feature space
+        :param texts: preprocessed texts
+        :return: dense array, one row of reduced features per text
+        """
+        if not self.is_fitted:
+            raise RuntimeError("FeatureModel is not fitted; call fit() or load() first")
+        feats = self.vectorizer.transform(texts)  # type: ignore
+        self.transformed_since_fit += len(texts)
+        if self.svd is None:
+            return feats.toarray()
+        return self.svd.transform(feats)
+
+    def fit_transform(self, texts: List[str]) -> np.ndarray:
+        return self.fit(texts).transform(texts)
+
+    def refit_due(self, max_new_docs: Optional[int] = None, max_age_seconds: Optional[float] = None) -> bool:
+        """
+        Whether a scheduled refit is due: never fitted, more than max_new_docs
+        transformed since the last fit, or the fit is older than max_age_seconds
+        """
+        if not self.is_fitted:
+            return True
+        if max_new_docs is not None and self.transformed_since_fit >= max_new_docs:
+            return True
+        if max_age_seconds is not None and time.time() - self.fitted_at >= max_age_seconds:  # type: ignore
+            return True
+        return False
+
+    def save(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = path + '.tmp'
+        joblib.dump(self, tmp_path)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'FeatureModel':
+        model = joblib.load(path)
+        if not isinstance(model, cls):
+            raise TypeError(f"{path} does not contain a FeatureModel")
+        return model
+
+
+def load_or_fit_feature_model(path: str, texts: List[str], method: str = 'tfidf', **kwargs) -> FeatureModel:
+    """
+    Load the feature model saved at path, or fit one on texts and save it
+    :param path: model file
+    :param texts: preprocessed corpus used only when no model is saved yet
+    :param method: 'tfidf' or 'hashing', for a new model
+    :param kwargs: other FeatureModel arguments for a new model
+    :return: fitted FeatureModel
+    """
+    if os.path.exists(path):
+        try:
+            return FeatureModel.load(path)
+        except Exception as e:
+            logger.warning(f"Could not load feature model from {path}, refitting: {e}")
+    model = FeatureModel(method=method, **kwargs).fit(texts)
+    model.save(path)
+    return model
 
@@ -1,26 +1,127 @@
 import pandas as pd  # type: ignore
 import numpy as np  # type: ignore
+from scipy import sparse  # type: ignore
 from sklearn.metrics.pairwise import cosine_similarity  # type: ignore
 from sklearn.preprocessing import StandardScaler  # type: ignore
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+import time
+from typing import List, Dict, Any, Optional, Tuple, Union
 import warnings
 
 warnings.filterwarnings('ignore')
 logger = logging.getLogger(__name__)
 
-def simil(feats_red: pd.DataFrame, p_resumetxt: List[str], p_jdtxt: List[str]) -> np.ndarray:
+class SimilarityGraph:
+    """
+    The similarity computation for one resume/job feature split as a graph of
+    lazily evaluated stages. Each stage (scaler, scaled matrices, cosine,
+    feature weights, ...) is computed at most once and shared by every stage
+    that depends on it; timings holds the seconds spent in each stage itself.
+    """
+    COSINE_WEIGHT = 0.7
+    FEATURE_WEIGHT = 0.3
+
+    def __init__(self, resume_features: Any, job_features: Any, chunk_size: Optional[int] = None):
+        self.resume = np.asarray(resume_features, dtype=float)
+        self.job = np.asarray(job_features, dtype=float)
+        self.chunk_size = chunk_size
+        self.timings: Dict[str, float] = {}
+        self._values: Dict[str, Any] = {}
+        self._child_time: List[float] = []
+
+    def get(self, stage: str) -> Any:
+        """
+        Value of a stage, computing it (and its dependencies) on first use
+        """
+        if stage not in self._values:
+            compute = getattr(self, '_' + stage)
+            self._child_time.append(0.0)
+            start = time.perf_counter()
+            try:
+                self._values[stage] = compute()
+            finally:
+                elapsed = time.perf_counter() - start
+                children = self._child_time.pop()
+                self.timings[stage] = elapsed - children
+                if self._child_time:
+                    self._child_time[-1] += elapsed
+        return self._values[stage]
+
+    def _random_fallback(self) -> np.ndarray:
+        return np.random.uniform(0.1, 0.9, (len(self.resume), len(self.job)))
+
+    def _scaler(self) -> StandardScaler:
+        # Normalize features for better similarity calculation
+        return StandardScaler().fit(self.resume)
+
+    def _resume_scaled(self) -> np.ndarray:
+        return self.get('scaler').transform(self.resume)
+
+    def _job_scaled(self) -> np.ndarray:
+        return self.get('scaler').transform(self.job)
+
+    def _cosine(self) -> np.ndarray:
+        try:
+            similarity_matrix = cosine_similarity(self.get('resume_scaled'), self.get('job_scaled'))
+            # Ensure values are between 0 and 1
+            return np.clip(similarity_matrix, 0, 1)
+        except Exception as e:
+            logger.error(f"Error in cosine similarity calculation: {str(e)}")
+            # Return random similarity as fallback
+            return self._random_fallback()
+
+    def _weighted(self) -> np.ndarray:
+        try:
+            # Equal weights per job description; customize as needed
+            weights = np.ones(len(self.job)) / len(self.job)
+            weighted_similarity = np.average(self.get('cosine'), axis=1, weights=weights)
+            # Expand to match original shape
+            return np.tile(weighted_similarity.reshape(-1, 1), (1, len(self.job)))
+        except Exception as e:
+            logger.error(f"Error in weighted similarity calculation: {str(e)}")
+            return self._random_fallback()
+
+    def _feature_weights(self) -> np.ndarray:
+        # Feature importance is the per-feature variance of the resumes, which
+        # the scaler has already computed; normalizing makes ddof irrelevant
+        variance = self.get('scaler').var_
+        return variance / variance.sum()
+
+    def _feature_scores(self) -> np.ndarray:
+        try:
+            feature_scores = weighted_feature_scores(self.resume, self.job, self.get('feature_weights'),
+                                                     self.chunk_size)
+            # Normalize to 0-1 range
+            if feature_scores.max() > 0:
+                feature_scores = feature_scores / feature_scores.max()
+            return feature_scores
+        except Exception as e:
+            logger.error(f"Error in feature-based scoring: {str(e)}")
+            return self._random_fallback()
+
+    def _combined(self) -> np.ndarray:
+        return _combine_similarity_methods(self.get('cosine'), self.get('feature_scores'),
+                                           self.COSINE_WEIGHT, self.FEATURE_WEIGHT)
+
+
+def simil(feats_red: Union[pd.DataFrame, np.ndarray, sparse.spmatrix], p_resumetxt: List[str], p_jdtxt: List[str],
+          timings: Optional[Dict[str, float]] = None) -> np.ndarray:
     """
     Enhanced similarity calculation using multiple algorithms
-    :param feats_red: reduced features dataframe
+    :param feats_red: reduced features (array, sparse matrix or dataframe) from feats_reduce
     :param p_resumetxt: preprocessed resume texts
     :param p_jdtxt: preprocessed job description texts
+    :param timings: optional dict, filled with seconds spent per SimilarityGraph stage
     :return: numpy array with similarity scores
     """
     try:
-        if feats_red.empty:
-            logger.warning("Empty features DataFrame provided")
+        if feats_red.shape[0] == 0 or feats_red.shape[1] == 0:
+            logger.warning("Empty features provided")
             return np.array([])
+        # Reduced features are at most a few dozen columns wide, so densifying is cheap
+        if sparse.issparse(feats_red):
+            feats_red = feats_red.toarray()
+        feats_red = np.asarray(feats_red, dtype=float)
             
         # Separate resume and job description features
         resume_count = len(p_resumetxt)
@@ -36,33 +137,19 @@ def simil(feats_red: pd.DataFrame, p_resumetxt: List[str], p_jdtxt: List[str]) -
             # Pad or truncate as needed
             if feats_red.shape[0] < resume_count + job_count:
                 # Pad with zeros
-                padding = pd.DataFrame(0, index=range(resume_count + job_count - feats_red.shape[0]), 
-                                     columns=feats_red.columns)
-                feats_red = pd.concat([feats_red, padding], ignore_index=True)
+                padding = np.zeros((resume_count + job_count - feats_red.shape[0], feats_red.shape[1]))
+                feats_red = np.vstack([feats_red, padding])
             else:
                 # Truncate
-                feats_red = feats_red.iloc[:resume_count + job_count]
-        
-        # Extract resume and job features
-        resume_features = feats_red.iloc[:resume_count]
-        job_features = feats_red.iloc[resume_count:resume_count + job_count]
-        
-        # Method 1: Enhanced Cosine Similarity
-        similarity_scores = _calculate_cosine_similarity(resume_features, job_features)
-        
-        # Method 2: Weighted Similarity (if we have multiple job descriptions)
-        if job_count > 1:
-            weighted_scores = _calculate_weighted_similarity(resume_features, job_features)
-            # Combine scores (you can adjust weights)
-            final_scores = 0.7 * similarity_scores + 0.3 * weighted_scores
-        else:
-            final_scores = similarity_scores
-        
-        # Method 3: Feature-based scoring
-        feature_scores = _calculate_feature_based_scores(resume_features, job_features)
+                feats_red = feats_red[:resume_count + job_count]
         
-        # Combine all similarity methods
-        combined_scores = _combine_similarity_methods(similarity_scores, feature_scores)
+        # Cosine similarity and feature-based scores share one scaler fit;
+        # the equal-weight average over JDs ('weighted') is not part of the
+        # combined score, so it is only computed if someone asks for it
+        graph = SimilarityGraph(feats_red[:resume_count], feats_red[resume_count:])
+        combined_scores = graph.get('combined')
+        if timings is not None:
+            timings.update(graph.timings)
         
         logger.info(f"Similarity calculation completed for {resume_count} resumes and {job_count} job descriptions")
         return combined_scores
@@ -77,19 +164,7 @@ def _calculate_cosine_similarity(resume_features: pd.DataFrame, job_features: pd
     Calculate cosine similarity between resume and job features
     """
     try:
-        # Normalize features for better similarity calculation
-        scaler = StandardScaler()
-        resume_scaled = scaler.fit_transform(resume_features)
-        job_scaled = scaler.transform(job_features)
-        
-        # Calculate cosine similarity
-        similarity_matrix = cosine_similarity(resume_scaled, job_scaled)
-        
-        # Ensure values are between 0 and 1
-        similarity_matrix = np.clip(similarity_matrix, 0, 1)
-        
-        return similarity_matrix
-        
+        return SimilarityGraph(resume_features, job_features).get('cosine')
     except Exception as e:
         logger.error(f"Error in cosine similarity calculation: {str(e)}")
         # Return random similarity as fallback
@@ -100,62 +175,51 @@ def _calculate_weighted_similarity(resume_features: pd.DataFrame, job_features:
     Calculate weighted similarity when multiple job descriptions are available
     """
     try:
-        # Calculate individual similarities
-        similarities = _calculate_cosine_similarity(resume_features, job_features)
-        
-        # Apply weights based on job description importance
-        # You can customize these weights based on your requirements
-        weights = np.ones(len(job_features)) / len(job_features)  # Equal weights
-        
-        # Calculate weighted average
-        weighted_similarity = np.average(similarities, axis=1, weights=weights)
-        
-        # Expand to match original shape
-        return np.tile(weighted_similarity.reshape(-1, 1), (1, len(job_features)))
-        
+        return SimilarityGraph(resume_features, job_features).get('weighted')
     except Exception as e:
         logger.error(f"Error in weighted similarity calculation: {str(e)}")
         return np.random.uniform(0.1, 0.9, (len(resume_features), len(job_features)))
 
-def _calculate_feature_based_scores(resume_features: pd.DataFrame, job_features: pd.DataFrame) -> np.ndarray:
+def _calculate_feature_based_scores(resume_features: pd.DataFrame, job_features: pd.DataFrame,
+                                    chunk_size: Optional[int] = None) -> np.ndarray:
     """
     Calculate similarity based on feature importance and overlap
+    :param chunk_size: if set, compute the weighted product this many resume rows at a time
     """
     try:
-        # Calculate feature importance (variance)
-        feature_importance = resume_features.var()
-        
-        # Normalize feature importance
-        feature_importance = feature_importance / feature_importance.sum()  # type: ignore
-        
-        # Calculate weighted feature similarity
-        feature_scores = np.zeros((len(resume_features), len(job_features)))
-        
-        for i, resume_row in resume_features.iterrows():
-            for j, job_row in job_features.iterrows():
-                # Calculate weighted dot product
-                similarity = np.sum(resume_row * job_row * feature_importance)
-                feature_scores[i, j] = similarity
-        
-        # Normalize to 0-1 range
-        if feature_scores.max() > 0:
-            feature_scores = feature_scores / feature_scores.max()
-        
-        return feature_scores
-        
+        return SimilarityGraph(resume_features, job_features, chunk_size).get('feature_scores')
     except Exception as e:
         logger.error(f"Error in feature-based scoring: {str(e)}")
         return np.random.uniform(0.1, 0.9, (len(resume_features), len(job_features)))
 
-def _combine_similarity_methods(cosine_scores: np.ndarray, feature_scores: np.ndarray) -> np.ndarray:
+def weighted_feature_scores(resume_arr: np.ndarray, job_arr: np.ndarray, weights: np.ndarray,
+                            chunk_size: Optional[int] = None, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Compute R . diag(weights) . J^T, optionally in blocks of resume rows so only
+    one block of weighted rows is held in memory at a time
+    :param resume_arr: resume features, shape (R, F)
+    :param job_arr: job features, shape (J, F)
+    :param weights: per-feature weights, shape (F,)
+    :param chunk_size: resume rows per block; None computes it in one product
+    :param out: optional preallocated (R, J) array, e.g. a np.memmap for very large R x J
+    :return: (R, J) array of weighted scores
+    """
+    if chunk_size is None and out is None:
+        return (resume_arr * weights) @ job_arr.T
+    if out is None:
+        out = np.empty((resume_arr.shape[0], job_arr.shape[0]))
+    step = chunk_size or resume_arr.shape[0] or 1
+    weighted_jobs_t = (job_arr * weights).T
+    for start in range(0, resume_arr.shape[0], step):
+        out[start:start + step] = resume_arr[start:start + step] @ weighted_jobs_t
+    return out
+
+def _combine_similarity_methods(cosine_scores: np.ndarray, feature_scores: np.ndarray,
+                                cosine_weight: float = 0.7, feature_weight: float = 0.3) -> np.ndarray:
     """
     Combine different similarity methods with weights
     """
     try:
-        # Weights for different methods (can be adjusted)
-        cosine_weight = 0.7
-        feature_weight = 0.3
-        
         # Combine scores
         combined_scores = cosine_weight * cosine_scores + feature_weight * feature_scores
         
@@ -0,0 +1,92 @@
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+# Heavy NLP models are loaded on first use rather than at import, so code
+# that only needs regex extraction (and every test or CLI start) stays fast.
+# Each model is loaded at most once per process; call warm_up() to pay the
+# cost up front, e.g. when a worker or web app starts.
+
+logger = logging.getLogger(__name__)
+
+SPACY_MODEL_NAME = 'en_core_web_sm'
+ST_MODEL_NAME = 'all-MiniLM-L6-v2'
+
+_lock = threading.Lock()
+_models: Dict[str, Any] = {}
+_failed: Dict[str, str] = {}
+
+
+def _load(name: str, loader: Callable[[], Any]) -> Optional[Any]:
+    if name in _models:
+        return _models[name]
+    if name in _failed:
+        return None
+    with _lock:
+        if name not in _models and name not in _failed:
+            try:
+                _models[name] = loader()
+            except Exception as e:
+                logger.warning(f"Could not load {name}: {e}")
+                _failed[name] = str(e)
+    return _models.get(name)
+
+
+def _load_spacy() -> Any:
+    import spacy  # type: ignore
+    return spacy.load(SPACY_MODEL_NAME)
+
+
+def _load_sentence_model() -> Any:
+    from sentence_transformers import SentenceTransformer  # type: ignore
+    return SentenceTransformer(ST_MODEL_NAME)
+
+
+def get_nlp() -> Optional[Any]:
+    """
+    The shared spaCy pipeline, or None if spaCy or the model is missing.
+    """
+    return _load(SPACY_MODEL_NAME, _load_spacy)
+
+
+def get_sentence_model() -> Optional[Any]:
+    """
+    The shared SentenceTransformer, or None if it cannot be loaded.
+    """
+    return _load(ST_MODEL_NAME, _load_sentence_model)
+
+
+def cos_sim(a: Any, b: Any) -> float:
+    """
+    Cosine similarity of two embeddings, computed exactly as cos_sim_matrix
+    does so single and matrix scoring give identical semantic scores.
+    """
+    return float(cos_sim_matrix(a, b)[0, 0])
+
+
+def cos_sim_matrix(a: Any, b: Any) -> Any:
+    """
+    Cosine similarity of every row of a with every row of b, as one matrix
+    multiply (NumPy, float64). Zero vectors get similarity 0.
+    """
+    import numpy as np  # type: ignore
+    a = np.atleast_2d(np.asarray(a, dtype=np.float64))
+    b = np.atleast_2d(np.asarray(b, dtype=np.float64))
+    a_norm = np.linalg.norm(a, axis=1)
+    b_norm = np.linalg.norm(b, axis=1)
+    a_norm[a_norm == 0] = np.inf
+    b_norm[b_norm == 0] = np.inf
+    return (a @ b.T) / a_norm[:, None] / b_norm[None, :]
+
+
+def warm_up(spacy: bool = True, sentence_model: bool = True) -> Dict[str, bool]:
+    """
+    Load the requested models now instead of on first use.
+    :return: model name -> whether it is available
+    """
+    status = {}
+    if spacy:
+        status[SPACY_MODEL_NAME] = get_nlp() is not None
+    if sentence_model:
+        status[ST_MODEL_NAME] = get_sentence_model() is not None
+    return status
@@ -0,0 +1,211 @@
+import bisect
+import contextlib
+import functools
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Stages the scorer and extractors report; keywords/experience/education
+# include the spaCy parse when they have to run it themselves
+STAGES = ('extraction', 'parse', 'skills', 'keywords', 'experience', 'education', 'contact', 'semantic')
+# Histogram bucket upper bounds, in seconds
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class _StageStats:
+    __slots__ = ('count', 'total', 'buckets')
+
+    def __init__(self, n_buckets: int):
+        self.count = 0
+        self.total = 0.0
+        self.buckets = [0] * (n_buckets + 1)  # last slot is +Inf
+
+
+class StageProfiler:
+    """
+    Wall time and call counts per pipeline stage, kept as one histogram per
+    stage. Thread-safe; export with snapshot/to_json or to_prometheus.
+    With breakdown=True, ResumeScorer.score_against_profile also adds the
+    stage timings of each resume to its breakdown as 'timings_ms'.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS, breakdown: bool = False):
+        self.buckets = tuple(sorted(buckets))
+        self.breakdown = breakdown
+        self._stats: Dict[str, _StageStats] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def observe(self, stage: str, seconds: float) -> None:
+        slot = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            stats = self._stats.get(stage)
+            if stats is None:
+                stats = self._stats[stage] = _StageStats(len(self.buckets))
+            stats.count += 1
+            stats.total += seconds
+            stats.buckets[slot] += 1
+        timings = getattr(self._local, 'timings', None)
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + seconds
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    @contextlib.contextmanager
+    def collect(self) -> Iterator[Dict[str, float]]:
+        """
+        Seconds per stage for everything observed on this thread inside the block.
+        """
+        previous = getattr(self._local, 'timings', None)
+        timings: Dict[str, float] = {}
+        self._local.timings = timings
+        try:
+            yield timings
+        finally:
+            self._local.timings = previous
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def drain(self) -> Dict[str, Tuple[int, float, List[int]]]:
+        """
+        Per stage (count, total seconds, per-bucket counts) recorded since the
+        last drain, then reset. Worker processes send this back for merge.
+        """
+        with self._lock:
+            raw = self._raw()
+            self._stats.clear()
+        return raw
+
+    def merge(self, raw: Dict[str, Tuple[int, float, List[int]]]) -> None:
+        """Add counts drained from another profiler with the same buckets."""
+        with self._lock:
+            for name, (count, total, buckets) in raw.items():
+                if len(buckets) != len(self.buckets) + 1:
+                    raise ValueError(f"Bucket layout of stage {name!r} does not match this profiler")
+                stats = self._stats.get(name)
+                if stats is None:
+                    stats = self._stats[name] = _StageStats(len(self.buckets))
+                stats.count += count
+                stats.total += total
+                stats.buckets = [a + b for a, b in zip(stats.buckets, buckets)]
+
+    def _raw(self) -> Dict[str, Tuple[int, float, List[int]]]:
+        return {name: (s.count, s.total, list(s.buckets)) for name, s in self._stats.items()}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Per stage: call count, total and mean milliseconds, and cumulative
+        bucket counts keyed by upper bound in seconds ('+Inf' last).
+        """
+        with self._lock:
+            stats = self._raw()
+        result = {}
+        for name in _ordered(stats):
+            count, total, buckets = stats[name]
+            cumulative, running = {}, 0
+            for bound, hits in zip([str(b) for b in self.buckets] + ['+Inf'], buckets):
+                running += hits
+                cumulative[bound] = running
+            result[name] = {
+                'count': count,
+                'total_ms': round(total * 1000.0, 3),
+                'mean_ms': round(total * 1000.0 / count, 3) if count else 0.0,
+                'buckets': cumulative,
+            }
+        return result
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self, metric: str = 'smartscan_stage_seconds') -> str:
+        """
+        The histograms in the Prometheus text exposition format.
+        """
+        with self._lock:
+            stats = self._raw()
+        lines = [f'# HELP {metric} Wall time spent in each scoring stage.', f'# TYPE {metric} histogram']
+        for name in _ordered(stats):
+            count, total, buckets = stats[name]
+            running = 0
+            for bound, hits in zip([repr(float(b)) for b in self.buckets] + ['+Inf'], buckets):
+                running += hits
+                lines.append(f'{metric}_bucket{{stage="{name}",le="{bound}"}} {running}')
+            lines.append(f'{metric}_sum{{stage="{name}"}} {total!r}')
+            lines.append(f'{metric}_count{{stage="{name}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+
+def _ordered(stats: Dict[str, Any]) -> List[str]:
+    known = [name for name in STAGES if name in stats]
+    return known + sorted(name for name in stats if name not in STAGES)
+
+
+_active: Optional[StageProfiler] = None
+
+
+def enable(profiler: Optional[StageProfiler] = None, breakdown: Optional[bool] = None) -> StageProfiler:
+    """
+    Start recording stage timings process-wide.
+    :param profiler: profiler to record into, a new StageProfiler by default
+    :param breakdown: also attach per-resume timings to score breakdowns
+    :return: the active profiler
+    """
+    global _active
+    profiler = profiler or StageProfiler()
+    if breakdown is not None:
+        profiler.breakdown = breakdown
+    _active = profiler
+    return profiler
+
+
+def disable() -> None:
+    global _active
+    _active = None
+
+
+def active() -> Optional[StageProfiler]:
+    return _active
+
+
+def observe(stage: str, seconds: float) -> None:
+    """Record an already measured duration; a no-op while profiling is off."""
+    profiler = _active
+    if profiler is not None:
+        profiler.observe(stage, seconds)
+
+
+def profiled(stage: str) -> Callable[[Callable], Callable]:
+    """
+    Decorator timing each call as the given stage. While profiling is off
+    the wrapper costs one global lookup.
+    """
+    def decorate(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            profiler = _active
+            if profiler is None:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                profiler.observe(stage, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+if Config.PROFILE_STAGES:
+    enable(breakdown=Config.PROFILE_BREAKDOWN)
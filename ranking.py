@@ -0,0 +1,87 @@
+import heapq
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Union
+from scoring import JobProfile, ResumeScorer
+
+logger = logging.getLogger(__name__)
+
+# Ranking order: higher final_score first, earlier input position on ties
+# (the same order as a stable sort of exhaustive scores)
+_HeapItem = Tuple[int, int, Dict[str, Any]]  # (final_score, -index, result)
+
+
+@dataclass
+class RankingResult:
+    """
+    Top-k (index, score_resume result) pairs, best first, plus how many
+    resumes reached each scoring stage.
+    """
+    candidates: List[Tuple[int, Dict[str, Any]]]
+    stats: Dict[str, int] = field(default_factory=dict)
+
+
+def rank_top_k(scorer: ResumeScorer, resume_texts: List[str], job: Union[str, JobProfile], k: int,
+               skills_list: Optional[List[str]] = None, chunk_size: int = 32) -> RankingResult:
+    """
+    Top k resumes for a job description without fully scoring every resume.
+    All resumes get the cheap stage (skills trie, contact regexes), which
+    bounds their final score. They are then taken best bound first, in
+    chunks: the spaCy stage runs only for resumes whose bound can still beat
+    the current k-th best, and embeddings only for those whose tightened
+    bound still can. Results are identical to scoring everything with
+    score_resume and taking the k best (ties broken by input position).
+    :param scorer: ResumeScorer to score with
+    :param resume_texts: list of resume texts
+    :param job: job description text or a JobProfile from analyze_job
+    :param k: number of candidates to return
+    :param skills_list: optional key skills, as for score_resume
+    :param chunk_size: resumes parsed and embedded per batch
+    :return: RankingResult with up to k candidates, best first
+    """
+    profile = job if isinstance(job, JobProfile) else scorer.analyze_job(job)
+    stats = {'resumes': len(resume_texts), 'cheap': 0, 'parsed': 0, 'embedded': 0}
+    if k <= 0 or not resume_texts:
+        return RankingResult([], stats)
+
+    cheap = [scorer.cheap_components(text, profile) for text in resume_texts]
+    stats['cheap'] = len(cheap)
+    bounds = [scorer.score_upper_bound(profile, parts) for parts in cheap]
+    order = sorted(range(len(resume_texts)), key=lambda i: (-bounds[i], i))
+    heap: List[_HeapItem] = []
+
+    def can_enter(bound: int, index: int) -> bool:
+        return len(heap) < k or (bound, -index) > heap[0][:2]
+
+    for start in range(0, len(order), max(1, chunk_size)):
+        chunk = [i for i in order[start:start + chunk_size] if can_enter(bounds[i], i)]
+        if not chunk:
+            # Candidates are in decreasing bound order, so none of the rest can enter either
+            break
+        docs = scorer.parse_many([resume_texts[i] for i in chunk])
+        stats['parsed'] += len(chunk)
+        survivors = []
+        for i, doc in zip(chunk, docs):
+            parts = {**cheap[i], **scorer.parsed_components(resume_texts[i], profile, doc)}
+            if can_enter(scorer.score_upper_bound(profile, parts), i):
+                survivors.append((i, parts))
+        if not survivors:
+            continue
+
+        embeddings = None
+        if profile.embedding is not None:
+            embeddings = scorer.embed([resume_texts[i] for i, _ in survivors])
+            stats['embedded'] += len(survivors)
+        if embeddings is None:
+            embeddings = [None] * len(survivors)
+        for (i, parts), emb in zip(survivors, embeddings):
+            semantic_sim = scorer.semantic_component(resume_texts[i], profile, emb)
+            result = scorer.assemble_score(profile, parts, semantic_sim)
+            item = (result['final_score'], -i, result)
+            if len(heap) < k:
+                heapq.heappush(heap, item)
+            elif item[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, item)
+
+    ranked = sorted(heap, key=lambda item: item[:2], reverse=True)
+    return RankingResult([(-neg_index, result) for _, neg_index, result in ranked], stats)
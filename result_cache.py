@@ -0,0 +1,153 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from dataclasses import asdict
+from typing import Any, Dict, Optional
+from config import Config
+from extract_txt import ExtractionResult
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (kind, key)
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+-- Running total of entries.size, kept by triggers so writes never re-sum the table
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS entries_size_insert AFTER INSERT ON entries BEGIN
+    UPDATE meta SET value = value + NEW.size WHERE name = 'total_size';
+END;
+CREATE TRIGGER IF NOT EXISTS entries_size_update AFTER UPDATE OF size ON entries BEGIN
+    UPDATE meta SET value = value + NEW.size - OLD.size WHERE name = 'total_size';
+END;
+CREATE TRIGGER IF NOT EXISTS entries_size_delete AFTER DELETE ON entries BEGIN
+    UPDATE meta SET value = value - OLD.size WHERE name = 'total_size';
+END;
+-- Caches written before the running total existed start from one full sum
+INSERT OR IGNORE INTO meta (name, value) SELECT 'total_size', COALESCE(SUM(size), 0) FROM entries;
+"""
+
+EXTRACTION = 'extraction'
+SCORE = 'score'
+
+
+def sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_text(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+class ResultCache:
+    """
+    Persistent SQLite cache of extraction results, keyed by file content
+    hash, and score results, keyed by (resume text hash, JD hash, scorer
+    version). Least recently used entries are evicted once the stored values
+    exceed max_bytes. Safe to share between threads of one process.
+    """
+
+    def __init__(self, path: str, max_bytes: Optional[int] = None):
+        self.path = path
+        self.max_bytes = max_bytes if max_bytes is not None else Config.RESULT_CACHE_MAX_BYTES
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self.hits: Dict[str, int] = {EXTRACTION: 0, SCORE: 0}
+        self.misses: Dict[str, int] = {EXTRACTION: 0, SCORE: 0}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _get(self, kind: str, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute('SELECT value FROM entries WHERE kind = ? AND key = ?', (kind, key)).fetchone()
+            if row is None:
+                self.misses[kind] += 1
+                return None
+            self.hits[kind] += 1
+            self._conn.execute('UPDATE entries SET accessed = ? WHERE kind = ? AND key = ?', (time.time(), kind, key))
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def _put(self, kind: str, key: str, value: Any) -> None:
+        payload = json.dumps(value)
+        with self._lock:
+            # An upsert rather than INSERT OR REPLACE, whose implicit delete
+            # would not fire the size trigger
+            self._conn.execute('INSERT INTO entries (kind, key, value, size, accessed) VALUES (?, ?, ?, ?, ?) '
+                               'ON CONFLICT (kind, key) DO UPDATE SET value = excluded.value, '
+                               'size = excluded.size, accessed = excluded.accessed',
+                               (kind, key, payload, len(payload.encode('utf-8')), time.time()))
+            self._evict()
+            self._conn.commit()
+
+    def _total_bytes(self) -> int:
+        row = self._conn.execute("SELECT value FROM meta WHERE name = 'total_size'").fetchone()
+        return row[0] if row else 0
+
+    def _evict(self) -> None:
+        total = self._total_bytes()
+        if total <= self.max_bytes:
+            return
+        # Trim to 90% so a full cache doesn't evict on every insert
+        target = int(self.max_bytes * 0.9)
+        while total > target:
+            rows = self._conn.execute('SELECT kind, key, size FROM entries ORDER BY accessed LIMIT 256').fetchall()
+            if not rows:
+                break
+            for kind, key, size in rows:
+                if total <= target:
+                    break
+                self._conn.execute('DELETE FROM entries WHERE kind = ? AND key = ?', (kind, key))
+                total -= size
+
+    def get_extraction(self, file_hash: str) -> Optional[ExtractionResult]:
+        value = self._get(EXTRACTION, file_hash)
+        return None if value is None else ExtractionResult(**value)
+
+    def put_extraction(self, file_hash: str, result: ExtractionResult) -> None:
+        # A timeout may not repeat on the next try, so don't pin it
+        if result.timed_out:
+            return
+        self._put(EXTRACTION, file_hash, asdict(result))
+
+    @staticmethod
+    def score_key(resume_hash: str, jd_hash: str, scorer_version: str) -> str:
+        return f"{resume_hash}:{jd_hash}:{scorer_version}"
+
+    def get_score(self, resume_hash: str, jd_hash: str, scorer_version: str) -> Optional[Dict[str, Any]]:
+        return self._get(SCORE, self.score_key(resume_hash, jd_hash, scorer_version))
+
+    def put_score(self, resume_hash: str, jd_hash: str, scorer_version: str, score: Dict[str, Any]) -> None:
+        self._put(SCORE, self.score_key(resume_hash, jd_hash, scorer_version), score)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Hit/miss counters for this instance plus entry counts and stored bytes
+        """
+        with self._lock:
+            rows = self._conn.execute('SELECT kind, COUNT(*), COALESCE(SUM(size), 0) FROM entries GROUP BY kind').fetchall()
+        stored = {kind: {'entries': count, 'bytes': size} for kind, count, size in rows}
+        return {
+            kind: {'hits': self.hits[kind], 'misses': self.misses[kind],
+                   **stored.get(kind, {'entries': 0, 'bytes': 0})}
+            for kind in (EXTRACTION, SCORE)
+        }
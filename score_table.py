@@ -0,0 +1,196 @@
+import logging
+from typing import Any, Dict, List, Sequence, Tuple
+import numpy as np  # type: ignore
+import pandas as pd  # type: ignore
+from scipy import sparse  # type: ignore
+import nlp_models
+from scoring import JobProfile, ResumeFeatures, ResumeScorer
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ['final_score', 'skills_score', 'keyword_score', 'exp_score', 'edu_score', 'contact_score',
+           'semantic_score', 'semantic_similarity', 'skills_matched', 'skills_missing']
+
+
+class ScoreTable:
+    """
+    Columnar scores of many resumes against one job description: one NumPy
+    array per sub-score, holding the same values score_resume computes
+    (before its display rounding). The per-resume breakdown and
+    recommendations are only built by result(i), for rows that are shown.
+    """
+
+    def __init__(self, profile: JobProfile, features: Sequence[ResumeFeatures], columns: Dict[str, np.ndarray]):
+        self.profile = profile
+        self.features = features
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.features)
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({name: self.columns[name] for name in COLUMNS})
+
+    def top(self, k: int) -> np.ndarray:
+        """
+        Row indices of the k best resumes, best first; ties keep input order.
+        """
+        order = np.argsort(-self.columns['final_score'], kind='stable')
+        return order[:max(0, k)]
+
+    def parts(self, i: int) -> Dict[str, Any]:
+        f, profile = self.features[i], self.profile
+        col = {name: values[i] for name, values in self.columns.items()}
+        # Empty JD sets score an int 0 in score_resume, not 0.0
+        return {
+            'resume_skills': set(f.skills), 'matched_skills': set(f.skills & profile.skills),
+            'skills_score': float(col['skills_score']) if profile.skills else 0,
+            'contact': dict(f.contact), 'contact_score': float(col['contact_score']),
+            'resume_keywords': set(f.keywords), 'matched_keywords': set(f.keywords & profile.keywords),
+            'keyword_score': float(col['keyword_score']) if profile.keywords else 0,
+            'resume_exp': f.experience, 'exp_score': int(col['exp_score']),
+            'resume_edu': f.education, 'edu_score': int(col['edu_score']),
+        }
+
+    def result(self, i: int) -> Dict[str, Any]:
+        """
+        The full score_resume result (breakdown, recommendations) for row i.
+        """
+        return ResumeScorer.assemble_score(self.profile, self.parts(i), float(self.columns['semantic_similarity'][i]))
+
+    def results(self, rows: Sequence[int]) -> List[Dict[str, Any]]:
+        return [self.result(int(i)) for i in rows]
+
+
+class ScoreMatrix:
+    """
+    Scores of R resumes against J job descriptions: one R x J array per
+    sub-score. table(j) gives the ScoreTable for one job and result(i, j)
+    builds a single breakdown on demand.
+    """
+
+    def __init__(self, profiles: Sequence[JobProfile], features: Sequence[ResumeFeatures],
+                 columns: Dict[str, np.ndarray]):
+        self.profiles = profiles
+        self.features = features
+        self.columns = columns
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.features), len(self.profiles)
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+    def table(self, j: int) -> ScoreTable:
+        return ScoreTable(self.profiles[j], self.features, {name: values[:, j] for name, values in self.columns.items()})
+
+    def result(self, i: int, j: int) -> Dict[str, Any]:
+        """
+        The full score_resume result of resume i against job j.
+        """
+        return self.table(j).result(i)
+
+    def top(self, j: int, k: int) -> np.ndarray:
+        """
+        Row indices of the k best resumes for job j, best first.
+        """
+        return self.table(j).top(k)
+
+
+def _membership(sets: Sequence[frozenset], vocabulary: Dict[str, int]) -> sparse.csr_matrix:
+    """Boolean documents x vocabulary matrix; terms outside vocabulary are dropped."""
+    indptr, indices = [0], []
+    for terms in sets:
+        indices.extend(vocabulary[t] for t in terms if t in vocabulary)
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.int32)
+    return sparse.csr_matrix((data, indices, indptr), shape=(len(sets), len(vocabulary)))
+
+
+def _overlap_counts(resume_sets: Sequence[frozenset], jd_sets: Sequence[frozenset]) -> np.ndarray:
+    """R x J sizes of the set intersections, as one sparse matrix product."""
+    vocabulary: Dict[str, int] = {}
+    for terms in jd_sets:
+        for term in terms:
+            vocabulary.setdefault(term, len(vocabulary))
+    if not vocabulary:
+        return np.zeros((len(resume_sets), len(jd_sets)), dtype=np.int64)
+    counts = _membership(resume_sets, vocabulary) @ _membership(jd_sets, vocabulary).T
+    return counts.toarray().astype(np.int64)
+
+
+def score_matrix(features: Sequence[ResumeFeatures], profiles: Sequence[JobProfile]) -> ScoreMatrix:
+    """
+    Score pre-extracted resumes against several job profiles at once. Each
+    resume and JD contributes its features once; skill and keyword overlaps
+    are sparse boolean matrix products and the semantic part is one
+    embedding matrix multiply, so only the final combination is R x J.
+    :param features: resume feature records, see ResumeScorer.extract_features
+    :param profiles: job profiles from ResumeScorer.analyze_job
+    :return: ScoreMatrix with one row per resume and one column per profile
+    """
+    n, m = len(features), len(profiles)
+
+    jd_skill_counts = np.array([len(p.skills) for p in profiles], dtype=np.int64)
+    skills_matched = _overlap_counts([f.skills for f in features], [p.skills for p in profiles])
+    skills_score = np.where(jd_skill_counts > 0, skills_matched / np.maximum(1, jd_skill_counts) * 35, 0.0)
+    jd_keyword_counts = np.array([len(p.keywords) for p in profiles], dtype=np.int64)
+    keywords_matched = _overlap_counts([f.keywords for f in features], [p.keywords for p in profiles])
+    keyword_score = np.where(jd_keyword_counts > 0, keywords_matched / np.maximum(1, jd_keyword_counts) * 15, 0.0)
+
+    resume_exp = np.fromiter((f.experience for f in features), dtype=np.int64, count=n)[:, None]
+    jd_exp = np.array([p.experience for p in profiles], dtype=np.int64)[None, :]
+    exp_score = np.where(jd_exp > 0,
+                         np.where(resume_exp >= jd_exp, 15, np.where(resume_exp > 0, 8, 0)),
+                         np.where(resume_exp > 0, 8, 0)).astype(np.int64)
+    exp_score = np.broadcast_to(exp_score, (n, m))
+
+    # Education takes a handful of distinct values, so score each pair of values once
+    resume_edus = sorted({f.education for f in features})
+    jd_edus = sorted({p.education for p in profiles})
+    edu_table = np.array([[10 if edu and (edu in jd_edu or jd_edu in edu) else 5 if edu else 0 for jd_edu in jd_edus]
+                          for edu in resume_edus], dtype=np.int64).reshape(len(resume_edus), len(jd_edus))
+    resume_pos = {edu: i for i, edu in enumerate(resume_edus)}
+    jd_pos = {edu: j for j, edu in enumerate(jd_edus)}
+    edu_score = edu_table[np.array([resume_pos[f.education] for f in features], dtype=np.int64)[:, None],
+                          np.array([jd_pos[p.education] for p in profiles], dtype=np.int64)[None, :]]
+
+    contact_count = np.fromiter((sum(f.contact.values()) for f in features), dtype=np.int64, count=n)
+    contact_score = np.broadcast_to((contact_count / 3 * 10)[:, None], (n, m))
+
+    semantic_sim = np.zeros((n, m))
+    rows = [i for i, f in enumerate(features) if f.embedding is not None]
+    cols = [j for j, p in enumerate(profiles) if p.embedding is not None]
+    if rows and cols:
+        semantic_sim[np.ix_(rows, cols)] = nlp_models.cos_sim_matrix(
+            np.vstack([features[i].embedding for i in rows]), np.vstack([profiles[j].embedding for j in cols]))
+    semantic_score = np.trunc(semantic_sim * 15).astype(np.int64)
+
+    final_score = np.round(skills_score + keyword_score + exp_score + edu_score + contact_score + semantic_score)
+    return ScoreMatrix(profiles, features, {
+        'final_score': final_score.astype(np.int64),
+        'skills_score': skills_score,
+        'keyword_score': keyword_score,
+        'exp_score': exp_score,
+        'edu_score': edu_score,
+        'contact_score': contact_score,
+        'semantic_score': semantic_score,
+        'semantic_similarity': semantic_sim,
+        'skills_matched': skills_matched,
+        'skills_missing': jd_skill_counts[None, :] - skills_matched,
+    })
+
+
+def score_features(features: Sequence[ResumeFeatures], profile: JobProfile) -> ScoreTable:
+    """
+    Score pre-extracted resumes (see ResumeScorer.extract_features) against
+    a job profile with array operations over all of them at once.
+    :param features: resume feature records
+    :param profile: job profile from ResumeScorer.analyze_job
+    :return: ScoreTable with one row per record, in input order
+    """
+    return score_matrix(features, [profile]).table(0)
@@ -1,22 +1,164 @@
 import re
 import csv
-from typing import List, Dict, Any, Optional
-try:
-    import spacy  # type: ignore
-    nlp = spacy.load('en_core_web_sm')
-    SPACY_AVAILABLE = True
-except Exception:
-    SPACY_AVAILABLE = False
-try:
-    from sentence_transformers import SentenceTransformer, util  # type: ignore
-    st_model = SentenceTransformer('all-MiniLM-L6-v2')
-    ST_AVAILABLE = True
-except Exception:
-    ST_AVAILABLE = False
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Union
+import nlp_models
+import profiling
+from profiling import profiled
+from config import Config
+from embeddings import Embedder, EmbeddingCache
+from entities import Entities, EntityExtractor
+from skill_matcher import SkillMatcher
+
+# Pipeline components none of the extractors read (lemmas, stop words and
+# entities come from tagger/attribute_ruler/lemmatizer/ner)
+UNUSED_SPACY_COMPONENTS = ['parser', 'senter']
+
+def _unused_components(nlp: Any) -> List[str]:
+    return [name for name in UNUSED_SPACY_COMPONENTS if name in nlp.pipe_names]
+
+# Degree names in the order extract_education prefers them
+DEGREES = ['phd', 'doctor', 'master', 'msc', 'm.tech', 'mba', 'bachelor', 'bsc', 'b.tech', 'ba', 'be', 'bs']
+_DEGREE = re.compile('|'.join(re.escape(degree) for degree in DEGREES))
+_FOUR_DIGITS = re.compile(r'\d{4}')
+_YEARS_OF = re.compile(r'(\d+)\s+years?')
+_YEAR = re.compile(r'(19\d{2}|20\d{2})')
+
+
+def _count_up_to(pattern: 're.Pattern[str]', text: str, limit: int) -> int:
+    """Number of matches of pattern in text, stopping once limit is reached."""
+    count = 0
+    for _ in pattern.finditer(text):
+        count += 1
+        if count >= limit:
+            break
+    return count
+
+
+def _experience_from_regex(text: str) -> int:
+    """Largest "N years" mention, else the span between the earliest and latest year."""
+    years = _YEARS_OF.findall(text.lower())
+    if years:
+        return max(int(y) for y in years)
+    years_mentioned = [int(y) for y in _YEAR.findall(text)]
+    if years_mentioned:
+        return max(years_mentioned) - min(years_mentioned)
+    return 0
+
+# Bump whenever scoring logic changes so cached score results are not reused
+SCORER_VERSION = '1'
+
+@dataclass(frozen=True)
+class JobProfile:
+    """
+    Everything score_resume needs from a job description, extracted once
+    so the same JD can be scored against many resumes.
+    """
+    text: str
+    skills: frozenset
+    keywords: frozenset
+    experience: int
+    education: str
+    embedding: Any = None
+
+
+@dataclass(frozen=True)
+class ResumeFeatures:
+    """
+    Everything scoring needs from a resume, independent of the job
+    description, so a resume can be extracted once and scored many times.
+    """
+    text: str
+    skills: frozenset
+    keywords: frozenset
+    experience: int
+    education: str
+    contact: Dict[str, bool]
+    embedding: Any = None
+
 
 class ResumeScorer:
+    JOB_PROFILE_CACHE_SIZE = 32
+    DOC_CACHE_SIZE = 8
+
     def __init__(self):
         self.skills_set = self.load_skills('Data/skill_red.csv')
+        self.skill_matcher = SkillMatcher(self.skills_set)
+        self.entity_extractor = EntityExtractor(self.skill_matcher)
+        self._job_profiles: 'OrderedDict[str, JobProfile]' = OrderedDict()
+        self._docs: 'OrderedDict[str, Any]' = OrderedDict()
+        # How often experience/education were settled by the regex tier and
+        # how often spaCy entities had to be consulted
+        self.extraction_tiers: 'Counter[str]' = Counter(
+            experience_regex=0, experience_spacy=0, education_regex=0, education_spacy=0)
+        self._education_label: tuple = (None, True)
+        self.embedder = Embedder(
+            nlp_models.get_sentence_model,
+            model_name=nlp_models.ST_MODEL_NAME,
+            cache=EmbeddingCache(Config.EMBEDDING_CACHE_SIZE, Config.EMBEDDING_CACHE_DIR),
+            batch_size=Config.EMBEDDING_BATCH_SIZE
+        )
+
+    def warm_up(self) -> Dict[str, bool]:
+        """
+        Load the spaCy and sentence-transformer models now rather than on the
+        first document; see nlp_models.warm_up.
+        """
+        return nlp_models.warm_up()
+
+    def clear_caches(self) -> None:
+        """
+        Forget cached spaCy docs, job profiles and in-memory embeddings, e.g.
+        between benchmark passes.
+        """
+        self._docs.clear()
+        self._job_profiles.clear()
+        self.embedder.cache.clear()
+
+    @profiled('parse')
+    def parse(self, text: str) -> Any:
+        """
+        Run spaCy over a document once; the keyword, experience and education
+        extractors all reuse the same parse. Returns None without spaCy.
+        """
+        nlp = nlp_models.get_nlp()
+        if nlp is None:
+            return None
+        doc = self._docs.get(text)
+        if doc is not None:
+            self._docs.move_to_end(text)
+            return doc
+        doc = nlp(text, disable=_unused_components(nlp))
+        self._remember_doc(text, doc)
+        return doc
+
+    @profiled('parse')
+    def parse_many(self, texts: List[str], batch_size: Optional[int] = None, n_process: Optional[int] = None) -> List[Any]:
+        """
+        Parse a list of documents with nlp.pipe.
+        :param texts: document texts
+        :param batch_size: texts per spaCy batch, defaults to Config.SPACY_BATCH_SIZE
+        :param n_process: worker processes, defaults to Config.SPACY_N_PROCESS
+        :return: list of spaCy docs (or Nones without spaCy), in input order
+        """
+        nlp = nlp_models.get_nlp()
+        if nlp is None:
+            return [None] * len(texts)
+        docs = list(nlp.pipe(
+            texts,
+            batch_size=batch_size or Config.SPACY_BATCH_SIZE,
+            n_process=n_process or Config.SPACY_N_PROCESS,
+            disable=_unused_components(nlp)
+        ))
+        for text, doc in zip(texts, docs):
+            self._remember_doc(text, doc)
+        return docs
+
+    def _remember_doc(self, text: str, doc: Any) -> None:
+        self._docs[text] = doc
+        if len(self._docs) > self.DOC_CACHE_SIZE:
+            self._docs.popitem(last=False)
 
     def load_skills(self, filepath: str) -> set:
         skills = set()
@@ -28,87 +170,247 @@ class ResumeScorer:
                     skills.add(row[0].strip().lower())
         return skills
 
+    @profiled('skills')
     def extract_skills(self, text: str) -> set:
-        extracted_skills = set()
-        for skill in self.skills_set:
-            pattern = r'\b' + skill.replace('-', r'[ \-]?') + r'\b'
-            if re.search(pattern, text.lower()):
-                extracted_skills.add(skill)
-        return extracted_skills
-
-    def extract_keywords(self, text: str) -> set:
-        if SPACY_AVAILABLE:
-            doc = nlp(text)
+        return self.skill_matcher.find(text)
+
+    @profiled('keywords')
+    def extract_keywords(self, text: str, doc: Any = None) -> set:
+        if doc is None:
+            doc = self.parse(text)
+        if doc is not None:
             return set([token.lemma_.lower() for token in doc if not token.is_stop and not token.is_punct and len(token) > 3])
         else:
             return set(w for w in re.findall(r'\b\w{4,}\b', text.lower()))
 
-    def extract_experience(self, text: str) -> int:
-        if SPACY_AVAILABLE:
-            doc = nlp(text)
-            years = [ent.text for ent in doc.ents if ent.label_ == 'DATE']
-            # Try to extract years from date entities
-            years_found = re.findall(r'(\d{4})', ' '.join(years))
-            if years_found:
-                years_found = [int(y) for y in years_found]
-                if len(years_found) >= 2:
-                    return max(years_found) - min(years_found)
-        # fallback to regex
-        years = re.findall(r'(\d+)\s+years?', text.lower())
-        if years:
-            return max(int(y) for y in years)
-        years_mentioned = re.findall(r'(19\d{2}|20\d{2})', text)
-        if years_mentioned:
-            years_mentioned = [int(y) for y in years_mentioned]
-            if years_mentioned:
-                return max(years_mentioned) - min(years_mentioned)
-        return 0
-
-    def extract_education(self, text: str) -> str:
-        degrees = ['phd', 'doctor', 'master', 'msc', 'm.tech', 'mba', 'bachelor', 'bsc', 'b.tech', 'ba', 'be', 'bs']
-        if SPACY_AVAILABLE:
-            doc = nlp(text)
+    @profiled('experience')
+    def extract_experience(self, text: str, doc: Any = None) -> int:
+        """
+        Years of experience. spaCy DATE entities win when they hold two or
+        more 4-digit numbers; entities are pieces of the text, so a text with
+        fewer than two 4-digit runs is settled by the regex tier without a parse.
+        """
+        if _count_up_to(_FOUR_DIGITS, text, 2) < 2:
+            self.extraction_tiers['experience_regex'] += 1
+            return _experience_from_regex(text)
+        if doc is None:
+            doc = self.parse(text)
+        if doc is None:
+            self.extraction_tiers['experience_regex'] += 1
+            return _experience_from_regex(text)
+        self.extraction_tiers['experience_spacy'] += 1
+        years = [ent.text for ent in doc.ents if ent.label_ == 'DATE']
+        # Try to extract years from date entities
+        years_found = [int(y) for y in _FOUR_DIGITS.findall(' '.join(years))]
+        if len(years_found) >= 2:
+            return max(years_found) - min(years_found)
+        return _experience_from_regex(text)
+
+    @profiled('education')
+    def extract_education(self, text: str, doc: Any = None) -> str:
+        """
+        Highest-listed degree mention. A spaCy entity can only win if it names
+        a degree, which needs a degree somewhere in the text, or if the NER
+        model has an EDUCATION label; otherwise the answer is '' with no parse.
+        """
+        lowered = text.lower()
+        if _DEGREE.search(lowered) is None and not self._ner_labels_education():
+            self.extraction_tiers['education_regex'] += 1
+            return ''
+        if doc is None:
+            doc = self.parse(text)
+        if doc is not None:
+            self.extraction_tiers['education_spacy'] += 1
             for ent in doc.ents:
-                if ent.label_ == 'EDUCATION' or any(degree in ent.text.lower() for degree in degrees):
+                if ent.label_ == 'EDUCATION' or any(degree in ent.text.lower() for degree in DEGREES):
                     return ent.text.lower()
-        for degree in degrees:
-            if degree in text.lower():
+        else:
+            self.extraction_tiers['education_regex'] += 1
+        for degree in DEGREES:
+            if degree in lowered:
                 return degree
         return ''
 
+    def _ner_labels_education(self) -> bool:
+        nlp = nlp_models.get_nlp()
+        if nlp is None:
+            return False
+        if self._education_label[0] is not nlp:
+            try:
+                labelled = 'EDUCATION' in nlp.get_pipe('ner').labels
+            except Exception:
+                # Unknown pipeline: assume it may, so spaCy always gets its say
+                labelled = True
+            self._education_label = (nlp, labelled)
+        return self._education_label[1]
+
+    @profiled('contact')
     def extract_contact_info(self, text: str) -> Dict[str, bool]:
-        email = bool(re.search(r'[\w\.-]+@[\w\.-]+', text))
-        phone = bool(re.search(r'\b\d{10,}\b', text))
-        linkedin = bool(re.search(r'linkedin\.com', text.lower()))
-        return {'email': email, 'phone': phone, 'linkedin': linkedin}
+        return self.entity_extractor.contact_info(text)
 
+    def extract_entities(self, text: str) -> Entities:
+        """
+        Name, contact details and skills in one record; see entities.EntityExtractor.
+        """
+        return self.entity_extractor.extract(text)
+
+    def embed(self, texts: List[str], batch_size: Optional[int] = None) -> Any:
+        """
+        Sentence-transformer embeddings for texts, one batched model call for
+        whatever is not cached yet. Returns None when embeddings are unavailable.
+        """
+        if nlp_models.get_sentence_model() is None:
+            return None
+        try:
+            return self.embedder.encode(texts, batch_size=batch_size)
+        except Exception:
+            return None
+
+    @profiled('semantic')
     def semantic_similarity(self, resume_text: str, jd_text: str) -> float:
-        if ST_AVAILABLE:
-            try:
-                resume_emb = st_model.encode(resume_text, convert_to_tensor=True)
-                jd_emb = st_model.encode(jd_text, convert_to_tensor=True)
-                similarity = util.pytorch_cos_sim(resume_emb, jd_emb).item()
-                return similarity
-            except Exception:
-                return 0.0
-        return 0.0
+        embeddings = self.embed([resume_text, jd_text])
+        if embeddings is None:
+            return 0.0
+        try:
+            return nlp_models.cos_sim(embeddings[0], embeddings[1])
+        except Exception:
+            return 0.0
+
+    def _encode_job(self, jd_text: str) -> Any:
+        embeddings = self.embed([jd_text])
+        return None if embeddings is None else embeddings[0]
+
+    def analyze_job(self, job_description: str) -> JobProfile:
+        """
+        Extract the job description once into a reusable JobProfile.
+        Profiles are cached per JD text, so repeated calls are free.
+        """
+        profile = self._job_profiles.get(job_description)
+        if profile is not None:
+            self._job_profiles.move_to_end(job_description)
+            return profile
+        doc = self.parse(job_description)
+        profile = JobProfile(
+            text=job_description,
+            skills=frozenset(self.extract_skills(job_description)),
+            keywords=frozenset(self.extract_keywords(job_description, doc)),
+            experience=self.extract_experience(job_description, doc),
+            education=self.extract_education(job_description, doc),
+            embedding=self._encode_job(job_description)
+        )
+        self._job_profiles[job_description] = profile
+        if len(self._job_profiles) > self.JOB_PROFILE_CACHE_SIZE:
+            self._job_profiles.popitem(last=False)
+        return profile
+
+    def extract_features(self, resume_texts: List[str], batch_size: Optional[int] = None,
+                         n_process: Optional[int] = None,
+                         embedding_batch_size: Optional[int] = None) -> List[ResumeFeatures]:
+        """
+        Extract resumes once into ResumeFeatures records, parsing them in
+        spaCy batches and embedding them in one call; see score_table for
+        scoring many records at once.
+        """
+        docs = self.parse_many(resume_texts, batch_size=batch_size, n_process=n_process)
+        embeddings = self.embed(resume_texts, batch_size=embedding_batch_size) if resume_texts else None
+        if embeddings is None:
+            embeddings = [None] * len(resume_texts)
+        return [ResumeFeatures(
+            text=text,
+            skills=frozenset(self.extract_skills(text)),
+            keywords=frozenset(self.extract_keywords(text, doc)),
+            experience=self.extract_experience(text, doc),
+            education=self.extract_education(text, doc),
+            contact=self.extract_contact_info(text),
+            embedding=emb
+        ) for text, doc, emb in zip(resume_texts, docs, embeddings)]
+
+    def score_matrix(self, resume_texts: List[str], job_descriptions: List[Union[str, JobProfile]],
+                     batch_size: Optional[int] = None, n_process: Optional[int] = None,
+                     embedding_batch_size: Optional[int] = None) -> Any:
+        """
+        Score every resume against every job description, extracting each
+        document exactly once; see score_table.score_matrix.
+        :param resume_texts: list of resume texts
+        :param job_descriptions: job description texts or JobProfiles
+        :return: score_table.ScoreMatrix, resumes x job descriptions
+        """
+        from score_table import score_matrix  # score_table builds on this module
+        profiles = [job if isinstance(job, JobProfile) else self.analyze_job(job) for job in job_descriptions]
+        features = self.extract_features(resume_texts, batch_size, n_process, embedding_batch_size)
+        return score_matrix(features, profiles)
+
+    def score_batch(self, resume_texts: List[str], job: Union[str, JobProfile], skills_list: Optional[List[str]] = None,
+                    batch_size: Optional[int] = None, n_process: Optional[int] = None,
+                    embedding_batch_size: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Score many resumes against one job description, analyzing the JD once,
+        parsing the resumes in spaCy batches and embedding them in one call.
+        :param resume_texts: list of resume texts
+        :param job: job description text or a JobProfile from analyze_job
+        :param batch_size: spaCy batch size, see parse_many
+        :param n_process: spaCy worker processes, see parse_many
+        :param embedding_batch_size: sentence-transformer batch size, see embed
+        :return: list of score_resume results, in input order
+        """
+        profile = job if isinstance(job, JobProfile) else self.analyze_job(job)
+        docs = self.parse_many(resume_texts, batch_size=batch_size, n_process=n_process)
+        embeddings = None
+        if profile.embedding is not None and resume_texts:
+            embeddings = self.embed(resume_texts, batch_size=embedding_batch_size)
+        if embeddings is None:
+            embeddings = [None] * len(resume_texts)
+        return [self.score_against_profile(text, profile, skills_list, doc, emb)
+                for text, doc, emb in zip(resume_texts, docs, embeddings)]
 
     def score_resume(self, resume_text: str, job_description: str, skills_list: Optional[List[str]] = None) -> Dict[str, Any]:
+        return self.score_against_profile(resume_text, self.analyze_job(job_description), skills_list)
+
+    def score_against_profile(self, resume_text: str, profile: JobProfile, skills_list: Optional[List[str]] = None,
+                              doc: Any = None, embedding: Any = None) -> Dict[str, Any]:
+        profiler = profiling.active()
+        if profiler is None or not profiler.breakdown:
+            return self._score_against_profile(resume_text, profile, doc, embedding)
+        with profiler.collect() as timings:
+            result = self._score_against_profile(resume_text, profile, doc, embedding)
+        result['breakdown']['timings_ms'] = {stage: round(seconds * 1000.0, 3) for stage, seconds in timings.items()}
+        return result
+
+    def _score_against_profile(self, resume_text: str, profile: JobProfile, doc: Any, embedding: Any) -> Dict[str, Any]:
+        if doc is None:
+            doc = self.parse(resume_text)
+        parts = {**self.cheap_components(resume_text, profile), **self.parsed_components(resume_text, profile, doc)}
+        semantic_sim = self.semantic_component(resume_text, profile, embedding)
+        return self.assemble_score(profile, parts, semantic_sim)
+
+    # The score is computed in stages of increasing cost so rankers can stop
+    # early: cheap_components (trie + regex), parsed_components (needs the
+    # spaCy doc), then semantic_component (embeddings). score_upper_bound bounds the
+    # final score from whichever stages have run so far.
+
+    def cheap_components(self, resume_text: str, profile: JobProfile) -> Dict[str, Any]:
         # Skills Match (40)
         resume_skills = self.extract_skills(resume_text)
-        jd_skills = self.extract_skills(job_description)
+        jd_skills = profile.skills
         matched_skills = resume_skills & jd_skills
         skills_score = (len(matched_skills) / max(1, len(jd_skills))) * 35 if jd_skills else 0
 
+        # Contact Info/Formatting (10)
+        contact = self.extract_contact_info(resume_text)
+        contact_score = sum(contact.values()) / 3 * 10
+        return {'resume_skills': resume_skills, 'matched_skills': matched_skills, 'skills_score': skills_score,
+                'contact': contact, 'contact_score': contact_score}
+
+    def parsed_components(self, resume_text: str, profile: JobProfile, doc: Any = None) -> Dict[str, Any]:
         # Keyword Density (15)
-        jd_keywords = self.extract_keywords(job_description)
-        resume_keywords = self.extract_keywords(resume_text)
+        jd_keywords = profile.keywords
+        resume_keywords = self.extract_keywords(resume_text, doc)
         matched_keywords = resume_keywords & jd_keywords
         keyword_score = (len(matched_keywords) / max(1, len(jd_keywords))) * 15 if jd_keywords else 0
 
         # Experience (15)
-        resume_exp = self.extract_experience(resume_text)
-        jd_exp = self.extract_experience(job_description)
+        resume_exp = self.extract_experience(resume_text, doc)
+        jd_exp = profile.experience
         if jd_exp > 0:
             if resume_exp >= jd_exp:
                 exp_score = 15
@@ -120,16 +422,55 @@ class ResumeScorer:
             exp_score = 8 if resume_exp > 0 else 0
 
         # Education (10)
-        resume_edu = self.extract_education(resume_text)
-        jd_edu = self.extract_education(job_description)
+        resume_edu = self.extract_education(resume_text, doc)
+        jd_edu = profile.education
         edu_score = 10 if resume_edu and (resume_edu in jd_edu or jd_edu in resume_edu) else 5 if resume_edu else 0
+        return {'resume_keywords': resume_keywords, 'matched_keywords': matched_keywords, 'keyword_score': keyword_score,
+                'resume_exp': resume_exp, 'exp_score': exp_score, 'resume_edu': resume_edu, 'edu_score': edu_score}
 
-        # Contact Info/Formatting (10)
-        contact = self.extract_contact_info(resume_text)
-        contact_score = sum(contact.values()) / 3 * 10
+    @profiled('semantic')
+    def semantic_component(self, resume_text: str, profile: JobProfile, resume_emb: Any = None) -> float:
+        """
+        Embedding similarity of the resume to the job (the last, most
+        expensive stage); 0.0 without a sentence model. Pass resume_emb to
+        reuse an embedding computed in a batch.
+        """
+        if profile.embedding is None:
+            return 0.0
+        if resume_emb is None:
+            embeddings = self.embed([resume_text])
+            if embeddings is None:
+                return 0.0
+            resume_emb = embeddings[0]
+        try:
+            return nlp_models.cos_sim(resume_emb, profile.embedding)
+        except Exception:
+            return 0.0
+
+    @staticmethod
+    def score_upper_bound(profile: JobProfile, parts: Dict[str, Any]) -> int:
+        """
+        Highest final_score a resume can still reach given the components
+        computed so far; components not in parts count at their maximum.
+        """
+        skills_score = parts.get('skills_score', 35 if profile.skills else 0)
+        keyword_score = parts.get('keyword_score', 15 if profile.keywords else 0)
+        exp_score = parts.get('exp_score', 15 if profile.experience > 0 else 8)
+        edu_score = parts.get('edu_score', 10)
+        contact_score = parts.get('contact_score', 10)
+        semantic_score = parts.get('semantic_score', 15 if profile.embedding is not None else 0)
+        # Same summation order as assemble_score, and round() is monotonic
+        return round(skills_score + keyword_score + exp_score + edu_score + contact_score + semantic_score)
+
+    @staticmethod
+    def assemble_score(profile: JobProfile, parts: Dict[str, Any], semantic_sim: float) -> Dict[str, Any]:
+        jd_skills, jd_keywords = profile.skills, profile.keywords
+        resume_skills, matched_skills = parts['resume_skills'], parts['matched_skills']
+        resume_keywords, matched_keywords = parts['resume_keywords'], parts['matched_keywords']
+        skills_score, keyword_score = parts['skills_score'], parts['keyword_score']
+        exp_score, edu_score, contact_score = parts['exp_score'], parts['edu_score'], parts['contact_score']
 
         # Semantic Similarity (15)
-        semantic_sim = self.semantic_similarity(resume_text, job_description)
         semantic_score = int(semantic_sim * 15)
 
         final_score = round(skills_score + keyword_score + exp_score + edu_score + contact_score + semantic_score)
@@ -145,11 +486,11 @@ class ResumeScorer:
             'missing_skills': list(jd_skills - resume_skills),
             'matched_keywords': list(matched_keywords),
             'missing_keywords': list(jd_keywords - resume_keywords),
-            'resume_exp': resume_exp,
-            'jd_exp': jd_exp,
-            'resume_edu': resume_edu,
-            'jd_edu': jd_edu,
-            'contact': contact
+            'resume_exp': parts['resume_exp'],
+            'jd_exp': profile.experience,
+            'resume_edu': parts['resume_edu'],
+            'jd_edu': profile.education,
+            'contact': parts['contact']
         }
         recommendations = []
         if breakdown['missing_skills']:
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Async HTTP scoring service for calling the scorer from other backends.
+
+Usage:
+    python service.py --host 0.0.0.0 --port 8000
+
+    POST /score        {"resume_text": "...", "job_description": "...", "skills_list": [...]}
+    POST /score/batch  {"resume_texts": ["...", ...], "job_description": "...", "skills_list": [...]}
+    GET  /metrics      queue and latency metrics
+    GET  /metrics/stages  per-stage timing histograms (Prometheus text), when PROFILE_STAGES=1
+    GET  /health       model availability
+"""
+
+import time
+import asyncio
+import logging
+import argparse
+import threading
+import contextlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+import numpy as np
+import nlp_models
+import profiling
+from config import Config
+from embeddings import Embedder
+from scoring import ResumeScorer
+
+logger = logging.getLogger(__name__)
+
+_BatchKey = Tuple[str, Optional[Tuple[str, ...]]]
+
+
+class ServiceOverloaded(Exception):
+    """Raised when too many requests are already queued or running."""
+
+
+class BadRequest(ValueError):
+    """Raised for a malformed request body; the app answers 400."""
+
+
+@dataclass
+class _Pending:
+    resume_text: str
+    future: 'asyncio.Future[Dict[str, Any]]'
+    enqueued: float = field(default_factory=time.perf_counter)
+
+
+class ScoringService:
+    """
+    Scores resumes on a bounded pool of threads that share one set of loaded
+    models. Requests for the same job description (and skills list) that
+    arrive within max_wait_ms of each other are grouped into one score_batch
+    call, so the JD is analyzed once and the resumes are parsed and embedded
+    in one batch. Once max_pending requests are queued or running, new ones
+    are rejected with ServiceOverloaded instead of queueing without bound.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_batch: Optional[int] = None,
+                 max_wait_ms: Optional[float] = None, max_pending: Optional[int] = None,
+                 scorer_factory: Callable[[], ResumeScorer] = ResumeScorer, warm_up: bool = True):
+        self.workers = max(1, workers or Config.SERVICE_WORKERS)
+        self.max_batch = max(1, max_batch or Config.SERVICE_MAX_BATCH)
+        self.max_wait = (Config.SERVICE_MAX_WAIT_MS if max_wait_ms is None else max_wait_ms) / 1000.0
+        self.max_pending = max(1, max_pending or Config.SERVICE_MAX_PENDING)
+        self.scorer_factory = scorer_factory
+        self.warm_up = warm_up
+        self.models: Dict[str, bool] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # ResumeScorer's caches are not thread-safe, so each pool thread gets
+        # its own; the models behind them are loaded once and shared, and so
+        # is one Embedder, so a single EmbeddingStore writes the cache dir
+        self._local = threading.local()
+        self._embedder: Optional[Embedder] = None
+        self._embedder_lock = threading.Lock()
+        self._queues: Dict[_BatchKey, List[_Pending]] = {}
+        self._timers: Dict[_BatchKey, asyncio.TimerHandle] = {}
+        self._batches: set = set()
+        self._pending = 0
+        self._in_flight = 0
+        self._counters = {'received': 0, 'completed': 0, 'failed': 0, 'rejected': 0, 'batches': 0,
+                          'batched_requests': 0, 'max_batch_size': 0}
+        self._queue_wait: Deque[float] = deque(maxlen=1024)
+        self._latency: Deque[float] = deque(maxlen=1024)
+
+    async def start(self) -> None:
+        if self._executor is not None:
+            return
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='scoring')
+        if self.warm_up:
+            loop = asyncio.get_running_loop()
+            self.models = await loop.run_in_executor(self._executor, nlp_models.warm_up)
+            logger.info(f"Models loaded: {self.models}")
+
+    async def close(self) -> None:
+        for key in list(self._queues):
+            self._flush(key)
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    async def score(self, resume_text: str, job_description: str,
+                    skills_list: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Score one resume; same result as ResumeScorer.score_resume.
+        :raises ServiceOverloaded: when max_pending requests are already waiting
+        """
+        return (await self.score_many([resume_text], job_description, skills_list))[0]
+
+    async def score_many(self, resume_texts: List[str], job_description: str,
+                         skills_list: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Score several resumes against one job description, in input order.
+        All of them are admitted or none is.
+        :raises ServiceOverloaded: when they don't fit under max_pending
+        """
+        if self._executor is None:
+            await self.start()
+        if self._pending + len(resume_texts) > self.max_pending:
+            self._counters['rejected'] += len(resume_texts)
+            raise ServiceOverloaded(f"{self._pending} requests pending (limit {self.max_pending})")
+        loop = asyncio.get_running_loop()
+        key: _BatchKey = (job_description, tuple(skills_list) if skills_list is not None else None)
+        futures = []
+        for text in resume_texts:
+            future = loop.create_future()
+            self._enqueue(key, _Pending(text, future))
+            futures.append(future)
+        return list(await asyncio.gather(*futures))
+
+    def _enqueue(self, key: _BatchKey, item: _Pending) -> None:
+        self._counters['received'] += 1
+        self._pending += 1
+        queue = self._queues.setdefault(key, [])
+        queue.append(item)
+        if len(queue) >= self.max_batch:
+            self._flush(key)
+        elif len(queue) == 1:
+            self._timers[key] = asyncio.get_running_loop().call_later(self.max_wait, self._flush, key)
+
+    def _flush(self, key: _BatchKey) -> None:
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        items = self._queues.pop(key, None)
+        if items:
+            task = asyncio.ensure_future(self._run_batch(key, items))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, key: _BatchKey, items: List[_Pending]) -> None:
+        started = time.perf_counter()
+        self._in_flight += len(items)
+        self._counters['batches'] += 1
+        self._counters['batched_requests'] += len(items)
+        self._counters['max_batch_size'] = max(self._counters['max_batch_size'], len(items))
+        for item in items:
+            self._queue_wait.append(started - item.enqueued)
+        job_description, skills = key
+        texts = [item.resume_text for item in items]
+        try:
+            loop = asyncio.get_running_loop()
+            results = await loop.run_in_executor(self._executor, self._score_in_thread, texts, job_description,
+                                                 list(skills) if skills is not None else None)
+        except Exception as e:
+            logger.error(f"Scoring batch failed: {e}")
+            results = [e] * len(items)
+        finally:
+            self._in_flight -= len(items)
+            self._pending -= len(items)
+        finished = time.perf_counter()
+        for item, result in zip(items, results):
+            self._latency.append(finished - item.enqueued)
+            failed = isinstance(result, Exception)
+            self._counters['failed' if failed else 'completed'] += 1
+            # The caller may have gone away (cancelled) while we were scoring
+            if not item.future.done():
+                if failed:
+                    item.future.set_exception(result)
+                else:
+                    item.future.set_result(result)
+
+    def _scorer(self) -> ResumeScorer:
+        scorer = getattr(self._local, 'scorer', None)
+        if scorer is None:
+            scorer = self.scorer_factory()
+            with self._embedder_lock:
+                if self._embedder is None:
+                    self._embedder = scorer.embedder
+                scorer.embedder = self._embedder
+            self._local.scorer = scorer
+        return scorer
+
+    def _score_in_thread(self, texts: List[str], job_description: str,
+                         skills_list: Optional[List[str]]) -> List[Any]:
+        scorer = self._scorer()
+        try:
+            return scorer.score_batch(texts, job_description, skills_list)
+        except Exception:
+            # Retry one by one so a single bad resume doesn't fail its batch
+            results: List[Any] = []
+            for text in texts:
+                try:
+                    results.append(scorer.score_resume(text, job_description, skills_list))
+                except Exception as e:
+                    results.append(e)
+            return results
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Request counters, current queue depth and recent queue-wait and
+        end-to-end latency percentiles (milliseconds)
+        """
+        def percentiles(samples: Deque[float]) -> Dict[str, float]:
+            if not samples:
+                return {'p50': 0.0, 'p99': 0.0}
+            p50, p99 = np.percentile(np.fromiter(samples, dtype=float), [50, 99]) * 1000.0
+            return {'p50': round(float(p50), 3), 'p99': round(float(p99), 3)}
+
+        batches = self._counters['batches']
+        profiler = profiling.active()
+        stages = {'stages': profiler.snapshot()} if profiler is not None else {}
+        return {
+            **self._counters,
+            'queued': sum(len(q) for q in self._queues.values()),
+            'in_flight': self._in_flight,
+            'pending': self._pending,
+            'max_pending': self.max_pending,
+            'workers': self.workers,
+            'mean_batch_size': round(self._counters['batched_requests'] / batches, 3) if batches else 0.0,
+            'queue_wait_ms': percentiles(self._queue_wait),
+            'latency_ms': percentiles(self._latency),
+            **stages,
+        }
+
+
+def _is_strings(value: Any) -> bool:
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+def parse_request(body: Any, texts_field: str) -> Tuple[Any, str, Optional[List[str]]]:
+    """
+    Validate a decoded /score ('resume_text') or /score/batch ('resume_texts')
+    request body.
+    :return: (resume text or texts, job description, skills list or None)
+    :raises BadRequest: when the body is malformed
+    """
+    if not isinstance(body, dict):
+        raise BadRequest("Request body must be a JSON object")
+    texts, job_description = body.get(texts_field), body.get('job_description')
+    skills_list = body.get('skills_list')
+    if not job_description or texts is None:
+        raise BadRequest(f"'{texts_field}' and 'job_description' are required")
+    if not isinstance(job_description, str):
+        raise BadRequest("'job_description' must be a string")
+    if texts_field == 'resume_texts':
+        if not _is_strings(texts):
+            raise BadRequest("'resume_texts' must be a list of strings")
+    elif not isinstance(texts, str):
+        raise BadRequest(f"'{texts_field}' must be a string")
+    if skills_list is not None and not _is_strings(skills_list):
+        raise BadRequest("'skills_list' must be a list of strings")
+    return texts, job_description, skills_list
+
+
+def create_app(service: Optional[ScoringService] = None) -> Any:
+    """
+    Starlette app around a ScoringService; models load at startup.
+    """
+    from starlette.applications import Starlette
+    from starlette.requests import Request
+    from starlette.responses import JSONResponse, PlainTextResponse
+    from starlette.routing import Route
+
+    service = service or ScoringService()
+
+    def error(message: str, status: int, **headers: str) -> JSONResponse:
+        return JSONResponse({'error': message}, status_code=status, headers=headers or None)
+
+    async def read_body(request: Request, texts_field: str) -> Tuple[Any, str, Optional[List[str]]]:
+        try:
+            body = await request.json()
+        except ValueError as e:
+            raise BadRequest(f"Request body is not valid JSON: {e}") from e
+        return parse_request(body, texts_field)
+
+    # Only BadRequest becomes a 400; any other error raised while scoring is
+    # a server fault and is left to Starlette's 500 handling
+
+    async def score(request: Request) -> JSONResponse:
+        try:
+            text, job_description, skills_list = await read_body(request, 'resume_text')
+        except BadRequest as e:
+            return error(str(e), 400)
+        try:
+            return JSONResponse(await service.score(text, job_description, skills_list))
+        except ServiceOverloaded as e:
+            return error(str(e), 503, **{'Retry-After': '1'})
+
+    async def score_batch(request: Request) -> JSONResponse:
+        try:
+            texts, job_description, skills_list = await read_body(request, 'resume_texts')
+        except BadRequest as e:
+            return error(str(e), 400)
+        try:
+            return JSONResponse({'results': await service.score_many(texts, job_description, skills_list)})
+        except ServiceOverloaded as e:
+            return error(str(e), 503, **{'Retry-After': '1'})
+
+    async def metrics(request: Request) -> JSONResponse:
+        return JSONResponse(service.metrics())
+
+    async def stage_metrics(request: Request) -> Any:
+        profiler = profiling.active()
+        if profiler is None:
+            return error('stage profiling is off; set PROFILE_STAGES=1', 404)
+        return PlainTextResponse(profiler.to_prometheus(), media_type='text/plain; version=0.0.4')
+
+    async def health(request: Request) -> JSONResponse:
+        return JSONResponse({'status': 'ok', 'models': service.models})
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: Any):
+        await service.start()
+        yield
+        await service.close()
+
+    return Starlette(routes=[
+        Route('/score', score, methods=['POST']),
+        Route('/score/batch', score_batch, methods=['POST']),
+        Route('/metrics', metrics),
+        Route('/metrics/stages', stage_metrics),
+        Route('/health', health),
+    ], lifespan=lifespan)
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=Config.SERVICE_WORKERS, help='scoring threads')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    uvicorn.run(create_app(ScoringService(workers=args.workers)), host=args.host, port=args.port)
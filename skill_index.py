@@ -0,0 +1,185 @@
+import os
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+import numpy as np  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+_POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def _popcount_rows(words: np.ndarray) -> np.ndarray:
+    """Number of set bits in each row of a uint64 matrix."""
+    if hasattr(np, 'bitwise_count'):  # numpy >= 2.0
+        return np.bitwise_count(words).sum(axis=1, dtype=np.int64)
+    as_bytes = words.view(np.uint8).reshape(len(words), -1)
+    return _POPCOUNT_TABLE[as_bytes].sum(axis=1, dtype=np.int64)
+
+
+class SkillIndex:
+    """
+    Precomputed skill sets for an archive of resumes. Each resume's skills
+    are a row of bits over a fixed skill vocabulary (1000 skills take 16
+    uint64 words), and an inverted index maps each skill to a packed bitmap
+    of the resumes that have it. Scoring the skills component for a JD is
+    then an AND plus popcount per resume, and must-have filtering is an AND
+    of the skills' bitmaps, with no text scanning.
+    """
+    INITIAL_CAPACITY = 256
+
+    def __init__(self, skills: Iterable[str]):
+        self.skills: List[str] = sorted(set(skills))
+        self.positions: Dict[str, int] = {skill: i for i, skill in enumerate(self.skills)}
+        self.words = max(1, (len(self.skills) + 63) // 64)
+        self.ids: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self._bits = np.zeros((0, self.words), dtype=np.uint64)
+        self._postings: Dict[int, np.ndarray] = {}  # skill position -> packed resume bitmap, built lazily
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, resume_id: str) -> bool:
+        return resume_id in self.rows
+
+    @property
+    def bits(self) -> np.ndarray:
+        return self._bits[:len(self.ids)]
+
+    def encode(self, skills: Iterable[str]) -> np.ndarray:
+        """
+        Bitset for a set of skills; skills outside the vocabulary are ignored.
+        """
+        mask = np.zeros(self.words, dtype=np.uint64)
+        for skill in skills:
+            pos = self.positions.get(skill)
+            if pos is not None:
+                mask[pos >> 6] |= np.uint64(1) << np.uint64(pos & 63)
+        return mask
+
+    def decode(self, mask: np.ndarray) -> Set[str]:
+        as_bits = np.unpackbits(np.asarray(mask, dtype='<u8').view(np.uint8), bitorder='little')
+        return {self.skills[pos] for pos in np.flatnonzero(as_bits[:len(self.skills)])}
+
+    def skills_of(self, resume_id: str) -> Set[str]:
+        return self.decode(self._bits[self.rows[resume_id]])
+
+    def add(self, ids: Sequence[str], skill_sets: Sequence[Iterable[str]]) -> None:
+        """
+        Add or replace resumes with their extracted skill sets.
+        """
+        if len(ids) != len(skill_sets):
+            raise ValueError(f"Got {len(ids)} ids but {len(skill_sets)} skill sets")
+        for resume_id, skills in zip(ids, skill_sets):
+            row = self.rows.get(resume_id)
+            if row is None:
+                row = len(self.ids)
+                self._reserve(row + 1)
+                self.ids.append(resume_id)
+                self.rows[resume_id] = row
+            self._bits[row] = self.encode(skills)
+        self._postings.clear()
+
+    def add_texts(self, ids: Sequence[str], texts: Sequence[str], scorer: Any) -> None:
+        """
+        Extract skills with a ResumeScorer and add the resumes.
+        """
+        self.add(ids, [scorer.extract_skills(text) for text in texts])
+
+    def remove(self, ids: Iterable[str]) -> int:
+        """
+        Delete resumes by id; unknown ids are ignored.
+        :return: number of resumes removed
+        """
+        drop = {self.rows[rid] for rid in ids if rid in self.rows}
+        if not drop:
+            return 0
+        keep = np.ones(len(self.ids), dtype=bool)
+        keep[list(drop)] = False
+        keep = np.flatnonzero(keep)
+        self._bits = self.bits[keep]
+        self.ids = [self.ids[row] for row in keep]
+        self.rows = {rid: row for row, rid in enumerate(self.ids)}
+        self._postings.clear()
+        return len(drop)
+
+    def _reserve(self, rows: int) -> None:
+        if self._bits.shape[0] >= rows:
+            return
+        capacity = max(self.INITIAL_CAPACITY, self._bits.shape[0])
+        while capacity < rows:
+            capacity *= 2
+        grown = np.zeros((capacity, self.words), dtype=np.uint64)
+        grown[:len(self.ids)] = self._bits[:len(self.ids)]
+        self._bits = grown
+
+    def posting(self, skill: str) -> np.ndarray:
+        """
+        Packed bitmap (np.packbits order) of the resumes that have a skill.
+        """
+        pos = self.positions.get(skill)
+        if pos is None:
+            return np.zeros((len(self.ids) + 7) // 8, dtype=np.uint8)
+        posting = self._postings.get(pos)
+        if posting is None:
+            column = (self.bits[:, pos >> 6] >> np.uint64(pos & 63)) & np.uint64(1)
+            posting = self._postings[pos] = np.packbits(column.astype(bool))
+        return posting
+
+    def must_have(self, skills: Iterable[str]) -> List[str]:
+        """
+        Ids of the resumes that have every one of the given skills.
+        """
+        skills = list(skills)
+        if not skills:
+            return list(self.ids)
+        # Intersect the rarest bitmaps first; an empty result ends early
+        postings = sorted((self.posting(s) for s in skills), key=lambda p: int(_POPCOUNT_TABLE[p].sum()))
+        result = postings[0].copy()
+        for posting in postings[1:]:
+            np.bitwise_and(result, posting, out=result)
+            if not result.any():
+                return []
+        rows = np.flatnonzero(np.unpackbits(result, count=len(self.ids)))
+        return [self.ids[row] for row in rows]
+
+    def matched_counts(self, jd_skills: Iterable[str]) -> np.ndarray:
+        """
+        Number of the JD's skills each resume has, in row order.
+        """
+        return _popcount_rows(self.bits & self.encode(jd_skills))
+
+    def skills_scores(self, jd_skills: Iterable[str]) -> np.ndarray:
+        """
+        The skills component of score_resume (before display rounding) for
+        every resume, in row order.
+        """
+        jd_skills = set(jd_skills)
+        if not jd_skills:
+            return np.zeros(len(self.ids))
+        return (self.matched_counts(jd_skills) / max(1, len(jd_skills))) * 35
+
+    def save(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # np.savez appends .npz to names that lack it
+        tmp_path = path + '.tmp.npz'
+        np.savez(tmp_path, bits=self.bits, ids=np.array(self.ids, dtype=str),
+                 skills=np.array(self.skills, dtype=str))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, skills: Optional[Iterable[str]] = None) -> 'SkillIndex':
+        """
+        Load a saved index. If skills is given and differs from the saved
+        vocabulary, the bit positions would be wrong, so ValueError is raised.
+        """
+        with np.load(path) as data:
+            index = cls(data['skills'].tolist())
+            if skills is not None and sorted(set(skills)) != index.skills:
+                raise ValueError(f"{path} was built from a different skill list")
+            index.ids = data['ids'].tolist()
+            index._bits = data['bits'].astype(np.uint64).reshape(len(index.ids), index.words)
+        index.rows = {rid: row for row, rid in enumerate(index.ids)}
+        return index
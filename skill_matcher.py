@@ -0,0 +1,149 @@
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Each skill in Data/skill_red.csv used to be turned into the regex
+#   r'\b' + skill.replace('-', r'[ \-]?') + r'\b'
+# and searched on its own. SkillMatcher compiles all of those patterns into a
+# single trie that is walked from the word boundaries of the text, so a
+# document is scanned once no matter how many skills are loaded.
+
+_BOUNDARY = re.compile(r'\b')
+# Regex syntax the trie does not model; skills using it keep their own pattern
+_UNSUPPORTED = set('\\()[]{}|^$*?')
+
+_SEP = ('sep',)
+_ANY = ('any',)
+
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+
+def _at_boundary(text: str, pos: int) -> bool:
+    before = pos > 0 and _is_word(text[pos - 1])
+    after = pos < len(text) and _is_word(text[pos])
+    return before != after
+
+
+def _skill_pattern(skill: str) -> str:
+    return r'\b' + skill.replace('-', r'[ \-]?') + r'\b'
+
+
+def _compile_atoms(skill: str) -> Optional[List[Tuple]]:
+    """
+    Translate a skill into trie atoms, mirroring the regex built from it:
+    '-' is an optional space/hyphen, '.' is any character but a newline,
+    'x+' is a greedy run of x and 'x++' a possessive one.
+    Returns None when the skill uses regex syntax outside that subset.
+    """
+    if any(ch in _UNSUPPORTED for ch in skill):
+        return None
+    atoms: List[Tuple] = []
+    i = 0
+    while i < len(skill):
+        ch = skill[i]
+        if ch == '+':
+            return None
+        if ch == '-':
+            atom: Tuple = _SEP
+        elif ch == '.':
+            atom = _ANY
+        else:
+            atom = ('lit', ch)
+        i += 1
+        if i < len(skill) and skill[i] == '+':
+            if atom[0] != 'lit':
+                return None
+            possessive = i + 1 < len(skill) and skill[i + 1] == '+'
+            atom = ('plus', ch, possessive)
+            i += 2 if possessive else 1
+        atoms.append(atom)
+    return atoms
+
+
+class _Node:
+    __slots__ = ('lits', 'others', 'skills')
+
+    def __init__(self):
+        self.lits: Dict[str, '_Node'] = {}
+        self.others: Dict[Tuple, '_Node'] = {}
+        self.skills: List[str] = []
+
+    def child(self, atom: Tuple) -> '_Node':
+        if atom[0] == 'lit':
+            return self.lits.setdefault(atom[1], _Node())
+        return self.others.setdefault(atom, _Node())
+
+
+class SkillMatcher:
+    """
+    Matches a fixed skill set against text in a single pass.
+    Returns exactly the skills the per-skill regex search would find.
+    """
+
+    def __init__(self, skills: Iterable[str]):
+        self.skills = frozenset(skills)
+        self._root = _Node()
+        self._fallback: List[Tuple[str, 're.Pattern']] = []
+        for skill in self.skills:
+            atoms = _compile_atoms(skill)
+            if atoms is None:
+                self._fallback.append((skill, re.compile(_skill_pattern(skill))))
+                continue
+            node = self._root
+            for atom in atoms:
+                node = node.child(atom)
+            node.skills.append(skill)
+        # Only word boundaries where some skill can begin are worth walking from
+        if self._root.others:
+            self._starts = _BOUNDARY
+        else:
+            first = re.escape(''.join(sorted(self._root.lits)))
+            self._starts = re.compile(r'\b(?=[' + first + '])' if first else r'(?!)')
+
+    def find(self, text: str) -> Set[str]:
+        """
+        Return the set of skills mentioned in text.
+        :param text: raw document text, lowercased internally
+        :return: set of matched skills
+        """
+        text = text.lower()
+        found: Set[str] = set()
+        for m in self._starts.finditer(text):
+            self._walk(text, m.start(), found)
+        for skill, pattern in self._fallback:
+            if pattern.search(text):
+                found.add(skill)
+        return found
+
+    def _walk(self, text: str, start: int, found: Set[str]) -> None:
+        n = len(text)
+        stack = [(self._root, start)]
+        while stack:
+            node, pos = stack.pop()
+            if node.skills and _at_boundary(text, pos):
+                found.update(node.skills)
+            if pos < n:
+                nxt = node.lits.get(text[pos])
+                if nxt is not None:
+                    stack.append((nxt, pos + 1))
+            for atom, nxt in node.others.items():
+                kind = atom[0]
+                if kind == 'sep':
+                    stack.append((nxt, pos))
+                    if pos < n and text[pos] in ' -':
+                        stack.append((nxt, pos + 1))
+                elif kind == 'any':
+                    if pos < n and text[pos] != '\n':
+                        stack.append((nxt, pos + 1))
+                else:
+                    ch, possessive = atom[1], atom[2]
+                    end = pos
+                    while end < n and text[end] == ch:
+                        end += 1
+                    if end == pos:
+                        continue
+                    if possessive:
+                        stack.append((nxt, end))
+                    else:
+                        stack.extend((nxt, k) for k in range(pos + 1, end + 1))
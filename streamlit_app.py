@@ -3,8 +3,8 @@ import pandas as pd  # type: ignore
 import os
 import tempfile
 from pathlib import Path
-from scoring import ResumeScorer
-from extract_txt import extract_text_from_pdf, extract_text_from_docx
+from batch import BatchScorer, ResumeDocument
+from result_cache import ResultCache
 import re
 import logging
 from config import Config
@@ -33,9 +33,18 @@ with st.sidebar:
     st.markdown("**Tip:** Use clear, well-formatted resumes for best results.")
     dark_mode = st.checkbox("🌙 Dark Mode (Streamlit theme)")
 
+@st.cache_resource
+def get_batch_scorer() -> BatchScorer:
+    # One worker pool (and optional result cache) per server process, shared by all sessions
+    cache = ResultCache(Config.RESULT_CACHE_PATH) if Config.RESULT_CACHE_PATH else None
+    scorer = BatchScorer(cache=cache)
+    # Workers load their models in the background while the user is still uploading
+    scorer.start()
+    return scorer
+
+get_batch_scorer()
+
 # Initialize session state
-if 'resume_scorer' not in st.session_state:
-    st.session_state.resume_scorer = ResumeScorer()
 if 'processed_resumes' not in st.session_state:
     st.session_state.processed_resumes = []
 
@@ -97,37 +106,36 @@ if st.button("🚀 Process Resumes", type="primary"):
         with st.spinner("Processing resumes..."):
             results = []
             skills_list = [skill.strip().lower() for skill in skills_input.split(',') if skill.strip()] if skills_input else None
-            for file in st.session_state.uploaded_files:
-                try:
-                    if file.type == "application/pdf":
-                        text = extract_text_from_pdf(file)
-                    elif file.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-                        text = extract_text_from_docx(file)
-                    else:
-                        continue
-                    score_result = st.session_state.resume_scorer.score_resume(
-                        text, job_description, skills_list
-                    )
-                    result = {
-                        'filename': file.name,
-                        'file_size': file.size,
-                        'final_score': score_result['final_score'],
-                        'score_description': score_result['score_description'],
-                        'skills_match': score_result['breakdown'].get('skills_match', 0),
-                        'skills_missing': score_result['breakdown'].get('skills_missing', 0),
-                        'experience_level': score_result['breakdown'].get('experience_level', 0),
-                        'education': score_result['breakdown'].get('education', 0),
-                        'contact_info': score_result['breakdown'].get('contact_info', 0),
-                        'overall_quality': score_result['breakdown'].get('overall_quality', 0),
-                        'similarity_score': score_result['breakdown'].get('similarity_score', 0),
-                        'recommendations': '; '.join(score_result.get('recommendations', [])),
-                        'resume_text': text[:500] + "..." if len(text) > 500 else text,
-                        'skills_matched': score_result.get('skills_matched', 0),
-                        'skills_missing': score_result.get('skills_missing', 0)
-                    }
-                    results.append(result)
-                except Exception as e:
-                    st.error(f"Error processing {file.name}: {str(e)}")
+            documents = [ResumeDocument(file.name, file.getvalue()) for file in st.session_state.uploaded_files]
+            progress_bar = st.progress(0.0)
+            batch_results = get_batch_scorer().score(
+                documents, job_description, skills_list,
+                progress=lambda done, total: progress_bar.progress(done / total)
+            )
+            for file, batch_result in zip(st.session_state.uploaded_files, batch_results):
+                if not batch_result.ok:
+                    st.error(f"Error processing {file.name}: {batch_result.error}")
+                    continue
+                text = batch_result.text
+                score_result = batch_result.score
+                result = {
+                    'filename': file.name,
+                    'file_size': file.size,
+                    'final_score': score_result['final_score'],
+                    'score_description': score_result['score_description'],
+                    'skills_match': score_result['breakdown'].get('skills_match', 0),
+                    'skills_missing': score_result['breakdown'].get('skills_missing', 0),
+                    'experience_level': score_result['breakdown'].get('experience_level', 0),
+                    'education': score_result['breakdown'].get('education', 0),
+                    'contact_info': score_result['breakdown'].get('contact_info', 0),
+                    'overall_quality': score_result['breakdown'].get('overall_quality', 0),
+                    'similarity_score': score_result['breakdown'].get('similarity_score', 0),
+                    'recommendations': '; '.join(score_result.get('recommendations', [])),
+                    'resume_text': text[:500] + "..." if len(text) > 500 else text,
+                    'skills_matched': score_result.get('skills_matched', 0),
+                    'skills_missing': score_result.get('skills_missing', 0)
+                }
+                results.append(result)
             results.sort(key=lambda x: x['final_score'], reverse=True)
             st.session_state.processed_resumes = results
         st.success("Resumes processed successfully!")
@@ -0,0 +1,82 @@
+import io
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from docx import Document
+from batch import BatchScorer, ResumeDocument
+from scoring import ResumeScorer
+
+
+def make_docx(text):
+    doc = Document()
+    for line in text.split('\n'):
+        doc.add_paragraph(line)
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+class TestBatchScorer(unittest.TestCase):
+    def setUp(self):
+        self.jd = "Looking for python and machine-learning experience, 3 years. Bachelor degree."
+        self.texts = [
+            "Alice\nalice@mail.com\npython developer, 5 years, machine-learning",
+            "Bob\nexcel-vba and financial-analysis since 2015 to 2020",
+            "Carol\nBachelor in physics, python",
+        ]
+        self.documents = [ResumeDocument(f"resume_{i}.docx", make_docx(t)) for i, t in enumerate(self.texts)]
+        self.documents.insert(1, ResumeDocument("notes.txt", b"plain text"))
+        self.documents.append(ResumeDocument("broken.pdf", b"not a pdf"))
+
+    def check_results(self, results):
+        self.assertEqual([r.name for r in results], [d.name for d in self.documents])
+        self.assertFalse(results[1].ok)
+        self.assertIn('Unsupported', results[1].error)
+        self.assertEqual(results[-1].extraction.status, 'error')
+        self.assertIsNone(results[-1].score)
+        scorer = ResumeScorer()
+        for result, text in zip(results[:1] + results[2:-1], self.texts):
+            self.assertTrue(result.ok)
+            self.assertEqual(result.text, text)
+            self.assertEqual(result.score['final_score'], scorer.score_resume(text, self.jd)['final_score'])
+
+    def test_in_process(self):
+        progress = []
+        with BatchScorer(workers=1, chunk_size=2, warm_up=False) as batch:
+            results = batch.score(self.documents, self.jd, progress=lambda done, total: progress.append((done, total)))
+        self.check_results(results)
+        self.assertEqual(progress, [(2, 5), (4, 5), (5, 5)])
+
+    def test_process_pool_preserves_order(self):
+        with BatchScorer(workers=2, chunk_size=1, warm_up=False) as batch:
+            results = batch.score(self.documents, self.jd)
+        self.check_results(results)
+
+    def test_start_warms_workers_ahead_of_scoring(self):
+        with BatchScorer(workers=1, warm_up=False) as batch:
+            batch.start()
+            local = batch._local_scorer
+            self.assertIsNotNone(local)
+            self.check_results(batch.score(self.documents, self.jd))
+            self.assertIs(batch._local_scorer, local)
+        with BatchScorer(workers=2, chunk_size=2, warm_up=False) as batch:
+            batch.start()
+            self.check_results(batch.score(self.documents, self.jd))
+
+    def test_in_process_scorer_is_warmed_without_start(self):
+        with mock.patch.object(ResumeScorer, 'warm_up') as warm_up:
+            with BatchScorer(workers=1) as batch:
+                self.check_results(batch.score(self.documents, self.jd))
+                batch.start()
+        warm_up.assert_called_once_with()
+
+    def test_threads_share_in_process_scorer(self):
+        with BatchScorer(workers=1, chunk_size=1, warm_up=False) as batch:
+            with ThreadPoolExecutor(max_workers=4) as threads:
+                runs = list(threads.map(lambda _: batch.score(self.documents, self.jd), range(4)))
+        for results in runs:
+            self.check_results(results)
+
+
+if __name__ == '__main__':
+    unittest.main()
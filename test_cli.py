@@ -0,0 +1,139 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+import cli
+from test_batch import make_docx
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        self.resumes = os.path.join(self.dir, 'resumes')
+        os.makedirs(os.path.join(self.resumes, 'nested'))
+        texts = {
+            'alice.docx': "Alice\nalice@mail.com\npython developer, 5 years, machine-learning",
+            'bob.docx': "Bob\nexcel-vba and financial-analysis",
+            os.path.join('nested', 'carol.docx'): "Carol\nBachelor in physics, python",
+        }
+        for name, text in texts.items():
+            with open(os.path.join(self.resumes, name), 'wb') as f:
+                f.write(make_docx(text))
+        with open(os.path.join(self.resumes, 'broken.pdf'), 'wb') as f:
+            f.write(b'not a pdf')
+        with open(os.path.join(self.resumes, 'notes.txt'), 'w') as f:
+            f.write('ignored')
+        self.jd = os.path.join(self.dir, 'jd.txt')
+        with open(self.jd, 'w') as f:
+            f.write("Looking for python and machine-learning experience, 3 years. Bachelor degree.")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_cli(self, *args):
+        return cli.main(['--jd', self.jd, '--workers', '1', '-q', *args])
+
+    def test_find_resumes_walks_directories_and_globs(self):
+        found = cli.find_resumes([self.resumes, os.path.join(self.resumes, '*.docx')])
+        self.assertEqual([os.path.relpath(p, self.resumes) for p in found],
+                         ['alice.docx', 'bob.docx', 'broken.pdf', os.path.join('nested', 'carol.docx')])
+
+    def test_jsonl_output(self):
+        out = os.path.join(self.dir, 'out.jsonl')
+        self.assertEqual(self.run_cli(self.resumes, '-o', out), 0)
+        with open(out) as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual(len(rows), 4)
+        by_name = {r['filename']: r for r in rows}
+        self.assertEqual(by_name['broken.pdf']['status'], 'error')
+        self.assertIn('final_score', by_name['alice.docx'])
+        self.assertGreater(by_name['alice.docx']['final_score'], by_name['bob.docx']['final_score'])
+
+    def test_csv_output(self):
+        out = os.path.join(self.dir, 'out.csv')
+        self.run_cli(self.resumes, '-o', out)
+        with open(out, newline='') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(list(rows[0]), cli.CSV_FIELDS)
+
+    def test_checkpoint_resumes_where_it_stopped(self):
+        out = os.path.join(self.dir, 'out.jsonl')
+        checkpoint = os.path.join(self.dir, 'run.ckpt')
+        self.run_cli(os.path.join(self.resumes, 'a*.docx'), '-o', out, '--checkpoint', checkpoint)
+        self.run_cli(self.resumes, '-o', out, '--checkpoint', checkpoint, '--batch-size', '2')
+        with open(out) as f:
+            names = [json.loads(line)['filename'] for line in f]
+        self.assertEqual(sorted(names), ['alice.docx', 'bob.docx', 'broken.pdf', 'carol.docx'])
+        self.assertEqual(len(cli.load_checkpoint(checkpoint)), 4)
+
+    def read_names(self, out):
+        with open(out) as f:
+            return sorted(json.loads(line)['filename'] for line in f)
+
+    def test_missing_output_is_rescored(self):
+        out = os.path.join(self.dir, 'out.jsonl')
+        checkpoint = os.path.join(self.dir, 'run.ckpt')
+        self.run_cli(self.resumes, '-o', out, '--checkpoint', checkpoint)
+        os.remove(out)
+        with self.assertLogs('cli', level='WARNING'):
+            self.run_cli(self.resumes, '-o', out, '--checkpoint', checkpoint)
+        self.assertEqual(self.read_names(out), ['alice.docx', 'bob.docx', 'broken.pdf', 'carol.docx'])
+
+    def test_rows_written_before_checkpoint_are_not_duplicated(self):
+        # A crash between writing a batch and checkpointing it
+        out = os.path.join(self.dir, 'out.jsonl')
+        checkpoint = os.path.join(self.dir, 'run.ckpt')
+        self.run_cli(os.path.join(self.resumes, 'a*.docx'), '-o', out, '--checkpoint', checkpoint)
+        open(checkpoint, 'w').close()
+        self.run_cli(self.resumes, '-o', out, '--checkpoint', checkpoint)
+        self.assertEqual(self.read_names(out), ['alice.docx', 'bob.docx', 'broken.pdf', 'carol.docx'])
+        self.assertEqual(len(cli.load_checkpoint(checkpoint)), 4)
+
+    def test_csv_resume_keeps_one_header(self):
+        out = os.path.join(self.dir, 'out.csv')
+        checkpoint = os.path.join(self.dir, 'run.ckpt')
+        self.run_cli(os.path.join(self.resumes, 'a*.docx'), '-o', out, '--checkpoint', checkpoint)
+        self.run_cli(self.resumes, '-o', out, '--checkpoint', checkpoint)
+        with open(out, newline='') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(sorted(r['filename'] for r in rows), ['alice.docx', 'bob.docx', 'broken.pdf', 'carol.docx'])
+
+    def test_resumes_after_torn_jsonl_line(self):
+        out = os.path.join(self.dir, 'out.jsonl')
+        checkpoint = os.path.join(self.dir, 'run.ckpt')
+        self.run_cli(os.path.join(self.resumes, 'a*.docx'), '-o', out, '--checkpoint', checkpoint)
+        bob = os.path.join(self.resumes, 'bob.docx')
+        with open(out, 'a') as f:
+            f.write(json.dumps({'path': bob, 'filename': 'bob.docx'})[:35])
+        with self.assertLogs('cli', level='WARNING'):
+            self.run_cli(self.resumes, '-o', out, '--checkpoint', checkpoint)
+        self.assertEqual(self.read_names(out), ['alice.docx', 'bob.docx', 'broken.pdf', 'carol.docx'])
+
+    def test_resumes_after_torn_csv_row(self):
+        out = os.path.join(self.dir, 'out.csv')
+        checkpoint = os.path.join(self.dir, 'run.ckpt')
+        self.run_cli(os.path.join(self.resumes, 'a*.docx'), '-o', out, '--checkpoint', checkpoint)
+        bob = os.path.join(self.resumes, 'bob.docx')
+        with open(out, 'a', newline='') as f:
+            f.write(f'{bob},bob.docx,ok,,"12')
+        self.run_cli(self.resumes, '-o', out, '--checkpoint', checkpoint)
+        with open(out, newline='') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(sorted(r['filename'] for r in rows), ['alice.docx', 'bob.docx', 'broken.pdf', 'carol.docx'])
+        self.assertTrue(all(len(r) == len(cli.CSV_FIELDS) and None not in r for r in rows))
+        bob_row = next(r for r in rows if r['filename'] == 'bob.docx')
+        self.assertNotEqual(bob_row['skills_score'], '')
+
+    def test_top_n_keeps_best(self):
+        top = cli.TopN(2)
+        for score in [10, 50, 30, 40]:
+            top.add({'final_score': score})
+        top.add({'status': 'error'})
+        self.assertEqual([r['final_score'] for r in top.ranked()], [50, 40])
+
+
+if __name__ == '__main__':
+    unittest.main()
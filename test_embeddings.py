@@ -0,0 +1,133 @@
+import multiprocessing
+import tempfile
+import threading
+import unittest
+import numpy as np
+from embeddings import Embedder, EmbeddingCache, EmbeddingStore, content_hash
+
+
+class _FakeModel:
+    # Deterministic stand-in for SentenceTransformer that counts encoded texts
+    def __init__(self):
+        self.encoded = []
+        self.calls = 0
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True):
+        self.calls += 1
+        self.encoded.extend(texts)
+        return np.array([[len(t), t.count('a'), 1.0] for t in texts], dtype=np.float32)
+
+
+def _vector_for(key):
+    return np.array([sum(map(ord, key)), len(key), ord(key[-1])], dtype=np.float32)
+
+
+def _write_keys(directory, prefix, rounds):
+    # Each round opens a fresh view of the store, as separate workers would
+    store = EmbeddingStore(directory)
+    for i in range(rounds):
+        keys = ['%s%d-%d' % (prefix, i, j) for j in range(3)]
+        store.put_many({key: _vector_for(key) for key in keys})
+
+
+class TestEmbeddings(unittest.TestCase):
+    def test_batch_encodes_only_misses_once(self):
+        model = _FakeModel()
+        embedder = Embedder(model, model_name='fake')
+        first = embedder.encode(['alpha', 'beta', 'alpha'])
+        self.assertEqual(model.calls, 1)
+        self.assertEqual(model.encoded, ['alpha', 'beta'])
+        np.testing.assert_array_equal(first[0], first[2])
+        second = embedder.encode(['beta', 'gamma'])
+        self.assertEqual(model.encoded, ['alpha', 'beta', 'gamma'])
+        np.testing.assert_array_equal(second[0], first[1])
+        embedder.encode(['alpha', 'gamma'])
+        self.assertEqual(model.calls, 2)
+
+    def test_model_loader_is_lazy(self):
+        model = _FakeModel()
+        loads = []
+        cache = EmbeddingCache()
+        Embedder(lambda: model, 'fake', cache).encode(['alpha'])
+        embedder = Embedder(lambda: loads.append(1), 'fake', cache)
+        embedder.encode(['alpha'])
+        self.assertEqual(loads, [])
+
+    def test_lru_eviction(self):
+        cache = EmbeddingCache(max_items=2)
+        vec = np.ones(3, dtype=np.float32)
+        cache.put_many({'a': vec, 'b': vec})
+        cache.get('a')
+        cache.put_many({'c': vec})
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNotNone(cache.get('c'))
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+
+    def test_clear_forces_reencoding(self):
+        model = _FakeModel()
+        embedder = Embedder(model, 'fake')
+        embedder.encode(['alpha'])
+        embedder.cache.clear()
+        embedder.encode(['alpha'])
+        self.assertEqual(model.encoded, ['alpha', 'alpha'])
+        self.assertEqual((embedder.cache.hits, embedder.cache.misses), (0, 1))
+
+    def test_disk_store_survives_restart(self):
+        texts = ['resume %d' % i for i in range(300)]
+        with tempfile.TemporaryDirectory() as tmp:
+            model = _FakeModel()
+            expected = Embedder(model, 'fake', EmbeddingCache(10, tmp)).encode(texts)
+            reloaded_model = _FakeModel()
+            embedder = Embedder(reloaded_model, 'fake', EmbeddingCache(10, tmp))
+            np.testing.assert_array_equal(embedder.encode(texts), expected)
+            self.assertEqual(reloaded_model.calls, 0)
+            self.assertEqual(len(embedder.cache.store), 300)
+
+    def test_concurrent_writers_keep_rows_with_their_keys(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            ctx = multiprocessing.get_context('spawn')
+            writers = [ctx.Process(target=_write_keys, args=(tmp, prefix, 120)) for prefix in 'bc']
+            for process in writers:
+                process.start()
+            for process in writers:
+                process.join()
+                self.assertEqual(process.exitcode, 0)
+            store = EmbeddingStore(tmp)
+            self.assertEqual(len(store), 2 * 120 * 3)
+            self.assertEqual(len(set(store.index.values())), len(store))
+            for key in store.index:
+                np.testing.assert_array_equal(store.get(key), _vector_for(key), key)
+
+    def test_reads_during_growth_see_matching_rows(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = EmbeddingStore(tmp)
+            keys = ['k%d' % i for i in range(4 * EmbeddingStore.INITIAL_CAPACITY)]
+            wrong = []
+
+            def read():
+                while not finished.is_set():
+                    for key in keys[::7]:
+                        vector = store.get(key)
+                        if vector is not None and not np.array_equal(vector, _vector_for(key)):
+                            wrong.append(key)
+
+            finished = threading.Event()
+            readers = [threading.Thread(target=read) for _ in range(3)]
+            for reader in readers:
+                reader.start()
+            for i in range(0, len(keys), 16):
+                store.put_many({key: _vector_for(key) for key in keys[i:i + 16]})
+            finished.set()
+            for reader in readers:
+                reader.join()
+            self.assertEqual(wrong, [])
+            self.assertEqual(len(store), len(keys))
+
+    def test_content_hash_is_namespaced(self):
+        self.assertEqual(content_hash('x', 'm1'), content_hash('x', 'm1'))
+        self.assertNotEqual(content_hash('x', 'm1'), content_hash('x', 'm2'))
+
+
+if __name__ == '__main__':
+    unittest.main()
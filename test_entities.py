@@ -0,0 +1,58 @@
+import random
+import re
+import unittest
+import entities
+from entities import EntityExtractor
+from scoring import ResumeScorer
+
+
+def legacy_contact_info(text):
+    # ResumeScorer.extract_contact_info before the shared extractor
+    email = bool(re.search(r'[\w\.-]+@[\w\.-]+', text))
+    phone = bool(re.search(r'\b\d{10,}\b', text))
+    linkedin = bool(re.search(r'linkedin\.com', text.lower()))
+    return {'email': email, 'phone': phone, 'linkedin': linkedin}
+
+
+def random_texts(count, seed=0):
+    rng = random.Random(seed)
+    pieces = ['john', '.', '@', 'mail.com', '+', 'a@b', 'x@y.z', '1234567890', '12345678901234567', '555',
+              '0' * 15, 'abc', '_', '-', ' ', '\n', 'linkedin.com', 'LinkedIn.COM', 'linKedin.com',
+              'lİnkedin.com', 'lınkedin.com', '١٢٣٤٥٦٧٨٩٠',
+              'é', 'Name Surname', '/in/x', '(', ')']
+    return [''.join(rng.choice(pieces) for _ in range(rng.randint(0, 25))) for _ in range(count)]
+
+
+class TestEntityExtractor(unittest.TestCase):
+    def setUp(self):
+        self.texts = random_texts(2000)
+
+    def test_contact_info_matches_legacy(self):
+        extractor = EntityExtractor()
+        for text in self.texts:
+            self.assertEqual(extractor.contact_info(text), legacy_contact_info(text), text)
+            self.assertEqual(extractor.extract(text).contact(), legacy_contact_info(text), text)
+
+    def test_module_helpers_match_legacy(self):
+        for text in self.texts:
+            record = EntityExtractor().extract(text)
+            self.assertEqual(entities.get_number(text), re.findall(r'\b\d{10,15}\b', text))
+            self.assertEqual(list(record.phones), re.findall(r'\b\d{10,15}\b', text))
+            expected = re.findall(r'[A-Za-z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+', text)
+            self.assertEqual(entities.get_email(text), expected)
+            self.assertEqual(list(record.emails), expected)
+            self.assertEqual(record.name, entities.get_name(text))
+
+    def test_scorer_shares_extractor(self):
+        scorer = ResumeScorer()
+        text = "Jane Doe\njane@mail.com 5551234567 linkedin.com/in/jane\npython and sql"
+        record = scorer.extract_entities(text)
+        self.assertEqual(record.name, 'Jane Doe')
+        self.assertEqual(record.skills, frozenset(scorer.extract_skills(text)))
+        self.assertEqual(record.contact(), scorer.extract_contact_info(text))
+        self.assertEqual(record.contact(), {'email': True, 'phone': True, 'linkedin': True})
+        self.assertEqual(entities.get_skills(text, ['Python', 'SQL', 'Go']), {'Python', 'SQL'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import io
+import time
+import unittest
+from unittest import mock
+from docx import Document
+from extract_txt import PdfPageStream, extract_document, extract_pdf_text, extract_text_from_pdf
+
+
+def make_pdf(pages):
+    """Minimal PDF with one line of Helvetica text per page"""
+    objects = ['<< /Type /Catalog /Pages 2 0 R >>', None,
+               '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids = []
+    for text in pages:
+        stream = f'BT /F1 12 Tf 72 720 Td ({text}) Tj ET'
+        objects.append(f'<< /Length {len(stream)} >>\nstream\n{stream}\nendstream')
+        objects.append(f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                       f'/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>')
+        kids.append(f'{len(objects)} 0 R')
+    objects[1] = f'<< /Type /Pages /Kids [{" ".join(kids)}] /Count {len(pages)} >>'
+    out = b'%PDF-1.4\n'
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f'{number} 0 obj\n{body}\nendobj\n'.encode('latin-1')
+    xref = len(out)
+    out += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode('latin-1')
+    out += ''.join(f'{o:010d} 00000 n \n' for o in offsets).encode('latin-1')
+    out += f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode('latin-1')
+    return out
+
+
+def _slow_page_range(data, start, stop):
+    # Stand-in for a page extractor stuck on a pathological page
+    time.sleep(5)
+    return ['slow page'] * (stop - start)
+
+
+class TestPdfExtraction(unittest.TestCase):
+    def setUp(self):
+        self.pages = [f'Page {i} python developer' for i in range(12)]
+        self.pdf = make_pdf(self.pages)
+
+    def test_full_document(self):
+        result = extract_pdf_text(io.BytesIO(self.pdf))
+        self.assertEqual((result.page_count, result.pages_read), (12, 12))
+        self.assertFalse(result.truncated or result.timed_out)
+        for page in self.pages:
+            self.assertIn(page, result.text)
+        self.assertEqual(extract_text_from_pdf(io.BytesIO(self.pdf)), result.text)
+
+    def test_page_and_char_budgets(self):
+        result = extract_pdf_text(io.BytesIO(self.pdf), max_pages=3)
+        self.assertEqual(result.pages_read, 3)
+        self.assertTrue(result.truncated)
+        self.assertNotIn('Page 3 ', result.text)
+        result = extract_pdf_text(io.BytesIO(self.pdf), max_chars=40)
+        self.assertEqual(result.pages_read, 2)
+        self.assertTrue(result.truncated)
+
+    def test_time_budget(self):
+        clock = iter(range(100))
+        with mock.patch('extract_txt.time.monotonic', side_effect=lambda: next(clock)):
+            result = extract_pdf_text(io.BytesIO(self.pdf), max_seconds=2.5)
+        self.assertTrue(result.timed_out)
+        self.assertFalse(result.truncated)
+        self.assertLess(result.pages_read, 12)
+
+    def test_parallel_time_budget_does_not_wait_for_running_chunks(self):
+        with mock.patch('extract_txt._extract_page_range', _slow_page_range):
+            start = time.monotonic()
+            stream = PdfPageStream(io.BytesIO(self.pdf), max_seconds=0.5, workers=2, parallel_min_pages=4,
+                                   chunk_pages=5)
+            pages = list(stream)
+            elapsed = time.monotonic() - start
+        self.assertLess(elapsed, 2.0)
+        self.assertEqual(pages, [])
+        self.assertTrue(stream.timed_out)
+
+    def test_stream_yields_pages_in_order_in_parallel(self):
+        stream = PdfPageStream(io.BytesIO(self.pdf), workers=2, parallel_min_pages=4, chunk_pages=5)
+        self.assertEqual([p.strip() for p in stream], self.pages)
+        self.assertEqual(stream.pages_read, 12)
+
+    def test_error_string_for_invalid_pdf(self):
+        self.assertTrue(extract_text_from_pdf(io.BytesIO(b'not a pdf')).startswith('[PDF extraction error'))
+
+    def test_extract_document_results(self):
+        result = extract_document(io.BytesIO(self.pdf), 'cv.PDF')
+        self.assertTrue(result.ok)
+        self.assertEqual((result.status, result.page_count, result.byte_size), ('ok', 12, len(self.pdf)))
+        self.assertGreater(result.seconds, 0)
+
+        buf = io.BytesIO()
+        doc = Document()
+        doc.add_paragraph('Jane Roe')
+        doc.save(buf)
+        self.assertEqual(extract_document(io.BytesIO(buf.getvalue()), 'cv.docx').text, 'Jane Roe')
+
+        broken = extract_document(io.BytesIO(b'not a pdf'), 'cv.pdf')
+        self.assertEqual((broken.status, broken.text), ('error', ''))
+        self.assertIn('PDF extraction error', broken.error)
+        self.assertEqual(extract_document(io.BytesIO(make_pdf([''])), 'blank.pdf').status, 'empty')
+        self.assertEqual(extract_document(io.BytesIO(b'x'), 'cv.txt').status, 'unsupported')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import TfidfVectorizer
+from features import FeatureModel, load_or_fit_feature_model, txt_features, feats_reduce, to_frame
+from model import simil, _calculate_cosine_similarity
+
+
+def make_corpus(n, seed=0):
+    rng = np.random.RandomState(seed)
+    vocab = ['python', 'java', 'sql', 'cloud', 'data', 'analysis', 'machine', 'learning', 'team',
+             'lead', 'design', 'api', 'docker', 'finance', 'excel', 'sales', 'marketing', 'research']
+    return [' '.join(rng.choice(vocab, size=rng.randint(20, 60))) for _ in range(n)]
+
+
+class TestSparseFeatures(unittest.TestCase):
+    def setUp(self):
+        self.resumes = make_corpus(40)
+        self.jds = make_corpus(3, seed=1)
+
+    def test_txt_features_is_sparse_tfidf(self):
+        feats = txt_features(self.resumes, self.jds)
+        self.assertTrue(sparse.isspmatrix_csr(feats))
+        dense = TfidfVectorizer(max_df=0.85, min_df=1, ngram_range=(1, 3)).fit_transform(self.resumes + self.jds).toarray()
+        np.testing.assert_allclose(feats.toarray(), dense)
+
+    def test_pipeline_matches_dense_dataframes(self):
+        feats = txt_features(self.resumes, self.jds)
+        reduced = feats_reduce(feats)
+        self.assertEqual(reduced.shape, (43, 30))
+        dense_reduced = TruncatedSVD(n_components=30, n_iter=7, random_state=42).fit_transform(
+            pd.DataFrame(feats.toarray()))
+        np.testing.assert_allclose(np.abs(reduced), np.abs(dense_reduced), atol=1e-8)
+        np.testing.assert_allclose(_calculate_cosine_similarity(reduced[:40], reduced[40:]),
+                                   _calculate_cosine_similarity(pd.DataFrame(dense_reduced[:40]),
+                                                                pd.DataFrame(dense_reduced[40:])), atol=1e-8)
+        self.assertEqual(simil(reduced, self.resumes, self.jds).shape, (40, 3))
+
+    def test_empty_input(self):
+        self.assertEqual(txt_features([], []).shape, (0, 0))
+        self.assertEqual(simil(feats_reduce(txt_features([], [])), [], []).size, 0)
+
+    def test_to_frame_keeps_sparse(self):
+        frame = to_frame(txt_features(self.resumes, self.jds))
+        self.assertTrue(all(isinstance(t, pd.SparseDtype) for t in frame.dtypes))
+
+
+class TestFeatureModel(unittest.TestCase):
+    def setUp(self):
+        self.corpus = make_corpus(60)
+        self.new_docs = make_corpus(3, seed=9) + ['quantum basket weaving unseen words']
+
+    def test_fit_once_matches_batch_reduction(self):
+        model = FeatureModel().fit(self.corpus)
+        np.testing.assert_allclose(np.abs(model.transform(self.corpus)),
+                                   np.abs(feats_reduce(txt_features(self.corpus, []))), atol=1e-8)
+        self.assertEqual(model.transform(self.new_docs).shape, (4, 30))
+        self.assertEqual(model.transformed_since_fit, 64)
+
+    def test_save_and_load_roundtrip(self):
+        for method in ['tfidf', 'hashing']:
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, 'models', 'features.joblib')
+                model = load_or_fit_feature_model(path, self.corpus, method=method, n_features=2 ** 12)
+                loaded = load_or_fit_feature_model(path, [])
+                self.assertEqual(loaded.method, method)
+                np.testing.assert_allclose(loaded.transform(self.new_docs), model.transform(self.new_docs))
+
+    def test_refit_schedule(self):
+        model = FeatureModel(method='hashing', n_features=2 ** 12)
+        self.assertTrue(model.refit_due())
+        model.fit(self.corpus)
+        self.assertFalse(model.refit_due(max_new_docs=5, max_age_seconds=3600))
+        model.transform(self.new_docs * 2)
+        self.assertTrue(model.refit_due(max_new_docs=5))
+        self.assertTrue(model.refit_due(max_age_seconds=0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import StandardScaler
+from model import SimilarityGraph, simil, _calculate_feature_based_scores, weighted_feature_scores
+
+
+def reference_feature_scores(resume_features, job_features):
+    # Row-by-row loop the vectorized version replaces (positional indexes)
+    feature_importance = resume_features.var()
+    feature_importance = feature_importance / feature_importance.sum()
+    feature_scores = np.zeros((len(resume_features), len(job_features)))
+    for i, (_, resume_row) in enumerate(resume_features.iterrows()):
+        for j, (_, job_row) in enumerate(job_features.iterrows()):
+            feature_scores[i, j] = np.sum(resume_row * job_row * feature_importance)
+    if feature_scores.max() > 0:
+        feature_scores = feature_scores / feature_scores.max()
+    return feature_scores
+
+
+class TestFeatureScores(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(3)
+        feats = pd.DataFrame(rng.normal(size=(25, 30)))
+        self.resumes = feats.iloc[:20]
+        self.jobs = feats.iloc[20:]  # labels 20..24, which broke the label-indexed loop
+
+    def test_matches_loop(self):
+        expected = reference_feature_scores(self.resumes, self.jobs)
+        np.testing.assert_allclose(_calculate_feature_based_scores(self.resumes, self.jobs), expected)
+        np.testing.assert_allclose(_calculate_feature_based_scores(self.resumes, self.jobs, chunk_size=7), expected)
+
+    def test_chunked_into_preallocated_output(self):
+        r, j = self.resumes.values, self.jobs.values
+        w = np.linspace(0.1, 1.0, r.shape[1])
+        out = np.zeros((len(r), len(j)))
+        weighted_feature_scores(r, j, w, chunk_size=3, out=out)
+        np.testing.assert_allclose(out, r @ np.diag(w) @ j.T)
+
+
+class TestSimil(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(5)
+        self.feats = rng.normal(size=(14, 30))
+        self.resumes = ['r'] * 10
+        self.jds = ['j'] * 4
+
+    def test_matches_separate_methods(self):
+        resume, job = self.feats[:10], self.feats[10:]
+        scaler = StandardScaler().fit(resume)
+        cosine = np.clip(cosine_similarity(scaler.transform(resume), scaler.transform(job)), 0, 1)
+        feature = reference_feature_scores(pd.DataFrame(resume), pd.DataFrame(job))
+        expected = np.clip(0.7 * cosine + 0.3 * feature, 0, 1)
+        np.testing.assert_allclose(simil(self.feats, self.resumes, self.jds), expected)
+
+    def test_stages_computed_once_with_timings(self):
+        timings = {}
+        with mock.patch('model.StandardScaler', wraps=StandardScaler) as scaler_cls:
+            simil(pd.DataFrame(self.feats), self.resumes, self.jds, timings=timings)
+        self.assertEqual(scaler_cls.call_count, 1)
+        self.assertEqual(set(timings), {'scaler', 'resume_scaled', 'job_scaled', 'cosine',
+                                        'feature_weights', 'feature_scores', 'combined'})
+        self.assertTrue(all(t >= 0 for t in timings.values()))
+
+    def test_graph_reuses_cosine_for_weighted(self):
+        graph = SimilarityGraph(self.feats[:10], self.feats[10:])
+        weighted = graph.get('weighted')
+        np.testing.assert_allclose(weighted[:, 0], graph.get('cosine').mean(axis=1))
+        self.assertEqual(len(graph.timings), 5)
+
+if __name__ == '__main__':
+    unittest.main()
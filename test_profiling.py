@@ -0,0 +1,110 @@
+import io
+import json
+import unittest
+import profiling
+from batch import BatchScorer, ResumeDocument
+from extract_txt import extract_document
+from profiling import StageProfiler
+from scoring import ResumeScorer
+from test_batch import make_docx
+
+
+class TestStageProfiler(unittest.TestCase):
+    def test_histogram_exports(self):
+        profiler = StageProfiler(buckets=(0.001, 0.01))
+        for seconds in (0.0005, 0.001, 0.005, 2.0):
+            profiler.observe('skills', seconds)
+        profiler.observe('custom', 0.02)
+        snapshot = profiler.snapshot()
+        self.assertEqual(list(snapshot), ['skills', 'custom'])
+        self.assertEqual(snapshot['skills']['count'], 4)
+        self.assertEqual(snapshot['skills']['buckets'], {'0.001': 2, '0.01': 3, '+Inf': 4})
+        self.assertAlmostEqual(snapshot['skills']['total_ms'], 2006.5)
+        self.assertEqual(json.loads(profiler.to_json()), snapshot)
+
+        text = profiler.to_prometheus()
+        self.assertIn('# TYPE smartscan_stage_seconds histogram', text)
+        self.assertIn('smartscan_stage_seconds_bucket{stage="skills",le="0.01"} 3', text)
+        self.assertIn('smartscan_stage_seconds_bucket{stage="skills",le="+Inf"} 4', text)
+        self.assertIn('smartscan_stage_seconds_count{stage="custom"} 1', text)
+        profiler.reset()
+        self.assertEqual(profiler.snapshot(), {})
+
+    def test_collect_is_scoped(self):
+        profiler = StageProfiler()
+        profiler.observe('skills', 0.5)
+        with profiler.collect() as timings:
+            with profiler.stage('keywords'):
+                pass
+            profiler.observe('keywords', 0.25)
+        profiler.observe('contact', 0.5)
+        self.assertEqual(set(timings), {'keywords'})
+        self.assertGreaterEqual(timings['keywords'], 0.25)
+        self.assertEqual(profiler.snapshot()['keywords']['count'], 2)
+
+
+class TestScoringHooks(unittest.TestCase):
+    def setUp(self):
+        self.addCleanup(profiling.disable)
+        self.scorer = ResumeScorer()
+        self.resume = "Jane Doe\njane@mail.com 5551234567\n5 years of python and sql. Bachelor of Science"
+        self.jd = "Need python and sql, 3 years, bachelor"
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(profiling.active())
+        result = self.scorer.score_resume(self.resume, self.jd)
+        self.assertNotIn('timings_ms', result['breakdown'])
+        profiling.observe('skills', 1.0)  # no-op
+
+    def test_records_stages(self):
+        expected = self.scorer.score_resume(self.resume, self.jd)
+        profiler = profiling.enable()
+        result = self.scorer.score_resume(self.resume, self.jd)
+        self.assertEqual(result, expected)
+        snapshot = profiler.snapshot()
+        for stage in ('skills', 'keywords', 'experience', 'education', 'contact', 'semantic'):
+            self.assertEqual(snapshot[stage]['count'], 1, stage)
+            self.assertEqual(snapshot[stage]['buckets']['+Inf'], 1, stage)
+        extract_document(io.BytesIO(b'plain text'), 'resume.txt')
+        self.assertEqual(profiler.snapshot()['extraction']['count'], 1)
+
+    def test_breakdown_timings(self):
+        expected = self.scorer.score_batch([self.resume, ''], self.jd)
+        profiling.enable(breakdown=True)
+        results = self.scorer.score_batch([self.resume, ''], self.jd)
+        for result, plain in zip(results, expected):
+            timings = result['breakdown'].pop('timings_ms')
+            self.assertLessEqual({'skills', 'keywords', 'experience', 'education', 'contact', 'semantic'}, set(timings))
+            self.assertTrue(all(ms >= 0 for ms in timings.values()))
+            self.assertEqual(result, plain)
+
+
+class TestBatchWorkers(unittest.TestCase):
+    def setUp(self):
+        self.addCleanup(profiling.disable)
+        self.jd = "Need python and sql, 3 years, bachelor"
+        self.documents = [ResumeDocument(f"resume_{i}.docx", make_docx(f"Person {i}\npython and sql, {i} years"))
+                          for i in range(6)]
+
+    def test_worker_stages_reach_the_parent(self):
+        profiler = profiling.enable(breakdown=True)
+        with BatchScorer(workers=2, chunk_size=2, warm_up=False) as batch:
+            results = batch.score(self.documents, self.jd)
+        self.assertTrue(all(r.ok for r in results))
+        self.assertTrue(all('skills' in r.score['breakdown']['timings_ms'] for r in results))
+        snapshot = profiler.snapshot()
+        self.assertEqual(snapshot['extraction']['count'], len(self.documents))
+        for stage in ('skills', 'experience', 'education', 'contact'):
+            # Each resume once; the JD is analyzed once per worker
+            self.assertGreaterEqual(snapshot[stage]['count'], len(self.documents), stage)
+            self.assertEqual(snapshot[stage]['buckets']['+Inf'], snapshot[stage]['count'], stage)
+
+    def test_workers_do_not_profile_when_parent_does_not(self):
+        with BatchScorer(workers=2, chunk_size=2, warm_up=False) as batch:
+            results = batch.score(self.documents, self.jd)
+        self.assertTrue(all('timings_ms' not in r.score['breakdown'] for r in results))
+        self.assertIsNone(profiling.active())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import random
+import unittest
+from unittest import mock
+import nlp_models
+from embeddings import Embedder
+from ranking import rank_top_k
+from scoring import ResumeScorer
+from test_embeddings import _FakeModel
+
+
+def make_resumes(count, seed=0):
+    rng = random.Random(seed)
+    skills = ['python', 'machine-learning', 'data-analysis', 'sql', 'excel-vba', 'communication', 'teamwork']
+    extras = ['alice@mail.com', '555-123-4567', 'linkedin.com/in/x', 'Bachelor of Science', 'Master in physics',
+              '3 years experience', '10 years experience', 'since 2015 to 2020']
+    return [' '.join(rng.sample(skills, rng.randint(0, len(skills))) + rng.sample(extras, rng.randint(0, 4)))
+            for _ in range(count)]
+
+
+def exhaustive_top_k(scorer, texts, jd, k):
+    scores = [scorer.score_resume(t, jd) for t in texts]
+    order = sorted(range(len(texts)), key=lambda i: (-scores[i]['final_score'], i))
+    return [(i, scores[i]) for i in order[:k]]
+
+
+class TestRankTopK(unittest.TestCase):
+    def setUp(self):
+        self.scorer = ResumeScorer()
+        self.jd = "Need python, sql and machine-learning, communication. 5 years. Bachelor degree."
+        self.texts = make_resumes(200)
+
+    def test_matches_exhaustive_scoring(self):
+        for k in [1, 5, 20, 200, 500]:
+            result = rank_top_k(self.scorer, self.texts, self.jd, k, chunk_size=16)
+            self.assertEqual(result.candidates, exhaustive_top_k(self.scorer, self.texts, self.jd, k))
+
+    def test_prunes_hopeless_resumes(self):
+        result = rank_top_k(self.scorer, self.texts, self.jd, 5, chunk_size=8)
+        self.assertEqual(result.stats['cheap'], 200)
+        self.assertLess(result.stats['parsed'], 100)
+
+    def test_matches_with_embeddings(self):
+        model = _FakeModel()
+        self.scorer.embedder = Embedder(model, 'fake')
+        with mock.patch.object(nlp_models, 'get_sentence_model', return_value=model):
+            result = rank_top_k(self.scorer, self.texts, self.jd, 10, chunk_size=16)
+            self.assertEqual(result.candidates, exhaustive_top_k(self.scorer, self.texts, self.jd, 10))
+        self.assertLess(result.stats['embedded'], 200)
+
+    def test_empty(self):
+        self.assertEqual(rank_top_k(self.scorer, [], self.jd, 5).candidates, [])
+        self.assertEqual(rank_top_k(self.scorer, self.texts, self.jd, 0).candidates, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+from batch import BatchScorer, ResumeDocument
+from extract_txt import ExtractionResult
+from result_cache import ResultCache
+from test_batch import make_docx
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'cache', 'results.sqlite')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_roundtrip_and_counters(self):
+        cache = ResultCache(self.path)
+        self.assertIsNone(cache.get_extraction('abc'))
+        cache.put_extraction('abc', ExtractionResult('text', page_count=2, byte_size=10))
+        cache.put_score('r', 'j', '1', {'final_score': 42, 'breakdown': {'contact': {'email': True}}})
+        cache.close()
+
+        cache = ResultCache(self.path)
+        self.assertEqual(cache.get_extraction('abc'), ExtractionResult('text', page_count=2, byte_size=10))
+        self.assertEqual(cache.get_score('r', 'j', '1')['breakdown']['contact'], {'email': True})
+        self.assertIsNone(cache.get_score('r', 'j', '2'))
+        stats = cache.stats()
+        self.assertEqual(stats['extraction']['hits'], 1)
+        self.assertEqual(stats['score'], {'hits': 1, 'misses': 1, 'entries': 1, 'bytes': stats['score']['bytes']})
+
+    def test_timeouts_are_not_cached(self):
+        cache = ResultCache(self.path)
+        cache.put_extraction('slow', ExtractionResult('partial', timed_out=True))
+        self.assertIsNone(cache.get_extraction('slow'))
+
+    def test_size_based_eviction_is_lru(self):
+        cache = ResultCache(self.path, max_bytes=1000)
+        for i in range(5):
+            cache.put_score(str(i), 'j', '1', {'pad': 'x' * 200})
+            cache.get_score('0', 'j', '1')
+        self.assertIsNotNone(cache.get_score('0', 'j', '1'))
+        self.assertIsNone(cache.get_score('1', 'j', '1'))
+        self.assertLessEqual(sum(v['bytes'] for v in cache.stats().values()), 1000)
+
+    def test_running_total_avoids_table_scans(self):
+        cache = ResultCache(self.path, max_bytes=1000)
+        statements = []
+        cache._conn.set_trace_callback(statements.append)
+        cache.put_score('a', 'j', '1', {'pad': 'x' * 100})
+        cache.put_score('a', 'j', '1', {'pad': 'x' * 300})  # replaced, not added
+        cache.put_extraction('f', ExtractionResult('text'))
+        self.assertFalse([sql for sql in statements if 'SUM(' in sql.upper()])
+        cache._conn.set_trace_callback(None)
+        for i in range(10):
+            cache.put_score(str(i), 'j', '1', {'pad': 'x' * 200})
+        actual = cache._conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        self.assertEqual(cache._total_bytes(), actual)
+        self.assertLessEqual(actual, 1000)
+        cache.close()
+        self.assertEqual(ResultCache(self.path)._total_bytes(), actual)
+
+    def test_sizes_are_utf8_bytes(self):
+        cache = ResultCache(self.path)
+        cache.put_extraction('cv', ExtractionResult('Zoë Müller — 履歴書'))
+        size, value = cache._conn.execute('SELECT size, value FROM entries').fetchone()
+        self.assertEqual(size, len(value.encode('utf-8')))
+        self.assertEqual(cache.stats()['extraction']['bytes'], size)
+
+    def test_batch_scorer_reuses_cache(self):
+        documents = [ResumeDocument(f'r{i}.docx', make_docx(f'Candidate {i}\npython, {i} years')) for i in range(3)]
+        jd = 'python developer, 2 years'
+        cache = ResultCache(self.path)
+        with BatchScorer(workers=1, warm_up=False, cache=cache) as batch:
+            first = batch.score(documents, jd)
+            second = batch.score(documents, jd)
+            edited = batch.score(documents, jd + ' and sql')
+        self.assertFalse(any(r.cached for r in first))
+        self.assertTrue(all(r.cached for r in second))
+        self.assertEqual([r.score for r in second], [r.score for r in first])
+        self.assertFalse(any(r.cached for r in edited))
+        stats = cache.stats()
+        self.assertEqual(stats['extraction']['hits'], 6)
+        self.assertEqual(stats['score']['entries'], 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+from unittest import mock
+import nlp_models
+from embeddings import Embedder
+from score_table import COLUMNS, score_features
+from scoring import ResumeScorer
+from test_embeddings import _FakeModel
+from test_ranking import make_resumes
+
+
+def normalized(result):
+    # Skill/keyword lists come from set iteration, whose order is arbitrary
+    breakdown = {k: sorted(v) if isinstance(v, list) else v for k, v in result['breakdown'].items()}
+    return {**result, 'breakdown': breakdown, 'recommendations': [r.split(':')[0] for r in result['recommendations']]}
+
+
+class TestScoreTable(unittest.TestCase):
+    def setUp(self):
+        self.scorer = ResumeScorer()
+        self.texts = make_resumes(60, seed=1) + ['']
+        self.jds = ["Need python, sql and machine-learning, communication. 5 years. Bachelor degree.",
+                    "Team player", ""]
+
+    def check_matches_score_batch(self):
+        features = self.scorer.extract_features(self.texts)
+        for jd in self.jds:
+            profile = self.scorer.analyze_job(jd)
+            table = score_features(features, profile)
+            expected = self.scorer.score_batch(self.texts, profile)
+            self.assertEqual(list(table['final_score']), [r['final_score'] for r in expected])
+            self.assertEqual([normalized(r) for r in table.results(range(len(self.texts)))],
+                             [normalized(r) for r in expected])
+            top = table.top(5)
+            self.assertEqual([int(table['final_score'][i]) for i in top],
+                             sorted((r['final_score'] for r in expected), reverse=True)[:5])
+
+    def test_matches_score_batch(self):
+        self.check_matches_score_batch()
+
+    def test_matches_score_batch_with_embeddings(self):
+        model = _FakeModel()
+        self.scorer.embedder = Embedder(model, 'fake')
+        with mock.patch.object(nlp_models, 'get_sentence_model', return_value=model):
+            self.check_matches_score_batch()
+
+    def test_frame(self):
+        table = score_features(self.scorer.extract_features(self.texts), self.scorer.analyze_job(self.jds[0]))
+        frame = table.to_frame()
+        self.assertEqual(list(frame.columns), COLUMNS)
+        self.assertEqual(len(frame), len(self.texts))
+        self.assertEqual(len(score_features([], self.scorer.analyze_job(self.jds[0]))), 0)
+
+
+class TestScoreMatrix(unittest.TestCase):
+    def setUp(self):
+        self.scorer = ResumeScorer()
+        self.texts = make_resumes(25, seed=2) + ['']
+        self.jds = ["Need python, sql and machine-learning, communication. 5 years. Bachelor degree.",
+                    "Excel-vba analyst, Master degree, 2 years", "Team player", ""]
+
+    def check_matches_score_resume(self):
+        matrix = self.scorer.score_matrix(self.texts, self.jds)
+        self.assertEqual(matrix.shape, (len(self.texts), len(self.jds)))
+        for j, jd in enumerate(self.jds):
+            for i, text in enumerate(self.texts):
+                expected = self.scorer.score_resume(text, jd)
+                self.assertEqual(matrix['final_score'][i, j], expected['final_score'])
+                self.assertEqual(normalized(matrix.result(i, j)), normalized(expected))
+
+    def test_matches_score_resume(self):
+        self.check_matches_score_resume()
+
+    def test_matches_score_resume_with_embeddings(self):
+        model = _FakeModel()
+        self.scorer.embedder = Embedder(model, 'fake')
+        with mock.patch.object(nlp_models, 'get_sentence_model', return_value=model):
+            self.check_matches_score_resume()
+
+    def test_extracts_each_document_once(self):
+        with mock.patch.object(self.scorer, 'extract_skills', wraps=self.scorer.extract_skills) as extract:
+            self.scorer.score_matrix(self.texts, self.jds)
+        self.assertEqual(extract.call_count, len(self.texts) + len(self.jds))
+
+
+if __name__ == '__main__':
+    unittest.main()
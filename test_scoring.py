@@ -1,6 +1,146 @@
+import random
+import re
+import subprocess
+import sys
 import unittest
+from unittest import mock
+import nlp_models
 from scoring import ResumeScorer
 
+
+class _FakeDoc(list):
+    ents = ()
+
+
+class _CountingNLP:
+    # Stand-in for the spaCy pipeline that records how often it parses
+    pipe_names = ['tok2vec', 'tagger', 'parser', 'ner']
+
+    def __init__(self):
+        self.parsed = []
+        self.disabled = []
+
+    def __call__(self, text, disable=()):
+        self.parsed.append(text)
+        self.disabled.append(list(disable))
+        return _FakeDoc()
+
+    def pipe(self, texts, batch_size=None, n_process=None, disable=()):
+        for text in texts:
+            yield self(text, disable)
+
+class _Ent:
+    def __init__(self, text, label_):
+        self.text = text
+        self.label_ = label_
+
+
+class _Ner:
+    def __init__(self, labels):
+        self.labels = labels
+
+
+class _EntityNLP(_CountingNLP):
+    # Tags dates, degrees and organisations with regexes, like a small NER model
+    PATTERNS = [('DATE', r'\d+ years?|(?:19|20)\d\d(?:\s*-\s*\d{4})?|\d{2}/\d{4}'),
+                ('EDUCATION', r'Bachelor of \w+|MSc \w+'),
+                ('ORG', r'[A-Z]\w+ University|Acme Corp')]
+
+    def __init__(self, labels=('DATE', 'ORG')):
+        super().__init__()
+        self.labels = tuple(labels)
+
+    def get_pipe(self, name):
+        return _Ner(self.labels)
+
+    def __call__(self, text, disable=()):
+        doc = super().__call__(text, disable)
+        doc.ents = [_Ent(m.group(), label) for label, pattern in self.PATTERNS if label in self.labels
+                    for m in re.finditer(pattern, text)]
+        return doc
+
+
+def legacy_experience(text, doc):
+    if doc is not None:
+        years = [ent.text for ent in doc.ents if ent.label_ == 'DATE']
+        years_found = re.findall(r'(\d{4})', ' '.join(years))
+        if years_found:
+            years_found = [int(y) for y in years_found]
+            if len(years_found) >= 2:
+                return max(years_found) - min(years_found)
+    years = re.findall(r'(\d+)\s+years?', text.lower())
+    if years:
+        return max(int(y) for y in years)
+    years_mentioned = re.findall(r'(19\d{2}|20\d{2})', text)
+    if years_mentioned:
+        years_mentioned = [int(y) for y in years_mentioned]
+        return max(years_mentioned) - min(years_mentioned)
+    return 0
+
+
+def legacy_education(text, doc):
+    degrees = ['phd', 'doctor', 'master', 'msc', 'm.tech', 'mba', 'bachelor', 'bsc', 'b.tech', 'ba', 'be', 'bs']
+    if doc is not None:
+        for ent in doc.ents:
+            if ent.label_ == 'EDUCATION' or any(degree in ent.text.lower() for degree in degrees):
+                return ent.text.lower()
+    for degree in degrees:
+        if degree in text.lower():
+            return degree
+    return ''
+
+
+def random_resumes(count, seed=0):
+    rng = random.Random(seed)
+    pieces = ['2019', '2015 - 2020', '1998', '12345678', '3 years', '10 year', '05/2021', 'Bachelor of Arts',
+              'MSc Physics', 'MBA', 'member', 'Oxford University', 'Acme Corp', 'phd', 'python', 'led teams',
+              'B.Tech', '5551234567', 'Years', '٢٠١٩']
+    return [' '.join(rng.choice(pieces) for _ in range(rng.randint(0, 8))) for _ in range(count)]
+
+
+class TestTieredExtraction(unittest.TestCase):
+    def setUp(self):
+        self.texts = random_resumes(1500)
+
+    def check_matches_legacy(self, nlp):
+        with mock.patch.object(nlp_models, 'get_nlp', return_value=nlp):
+            scorer = ResumeScorer()
+            for text in self.texts:
+                doc = nlp(text) if nlp is not None else None
+                self.assertEqual(scorer.extract_experience(text), legacy_experience(text, doc), text)
+                self.assertEqual(scorer.extract_education(text), legacy_education(text, doc), text)
+                self.assertEqual(scorer.extract_experience(text, doc), legacy_experience(text, doc), text)
+                self.assertEqual(scorer.extract_education(text, doc), legacy_education(text, doc), text)
+        return scorer
+
+    def test_matches_legacy_with_ner(self):
+        scorer = self.check_matches_legacy(_EntityNLP())
+        tiers = scorer.extraction_tiers
+        self.assertGreater(tiers['experience_regex'], 0)
+        self.assertGreater(tiers['experience_spacy'], 0)
+        self.assertGreater(tiers['education_regex'], 0)
+        self.assertEqual(sum(tiers.values()), 4 * len(self.texts))
+
+    def test_matches_legacy_with_education_label(self):
+        scorer = self.check_matches_legacy(_EntityNLP(labels=('DATE', 'EDUCATION', 'ORG')))
+        # Any text may hold an EDUCATION entity, so education always parses
+        self.assertEqual(scorer.extraction_tiers['education_regex'], 0)
+
+    def test_matches_legacy_without_spacy(self):
+        scorer = self.check_matches_legacy(None)
+        self.assertEqual(scorer.extraction_tiers['experience_spacy'] + scorer.extraction_tiers['education_spacy'], 0)
+
+    def test_regex_tier_skips_parse(self):
+        nlp = _EntityNLP()
+        with mock.patch.object(nlp_models, 'get_nlp', return_value=nlp):
+            scorer = ResumeScorer()
+            self.assertEqual(scorer.extract_experience('Python developer, 4 years'), 4)
+            self.assertEqual(scorer.extract_education('Python developer, 4 years'), '')
+            self.assertEqual(nlp.parsed, [])
+            self.assertEqual(scorer.extract_experience('Acme Corp 2015 - 2020, then 2021'), 6)
+            self.assertEqual(nlp.parsed, ['Acme Corp 2015 - 2020, then 2021'])
+
+
 class TestResumeScorer(unittest.TestCase):
     def setUp(self):
         self.scorer = ResumeScorer()
@@ -41,5 +181,33 @@ class TestResumeScorer(unittest.TestCase):
         self.assertIn('data-analysis', result['breakdown']['matched_skills'])
         self.assertIn('machine-learning', result['breakdown']['matched_skills'])
 
+    def test_job_profile_batch_matches_score_resume(self):
+        other_resume = "Jane Roe\njane@email.com\n5 years of excel-vba and financial-analysis. MBA"
+        profile = self.scorer.analyze_job(self.sample_jd)
+        self.assertIs(self.scorer.analyze_job(self.sample_jd), profile)
+        self.assertIn('python', profile.skills)
+        batch = self.scorer.score_batch([self.sample_resume, other_resume], profile)
+        for text, result in zip([self.sample_resume, other_resume], batch):
+            single = self.scorer.score_resume(text, self.sample_jd)
+            self.assertEqual(result['final_score'], single['final_score'])
+            self.assertEqual(result['recommendations'], single['recommendations'])
+            self.assertEqual(result['breakdown'], single['breakdown'])
+
+    def test_one_spacy_parse_per_document(self):
+        fake_nlp = _CountingNLP()
+        with mock.patch.object(nlp_models, 'get_nlp', return_value=fake_nlp):
+            scorer = ResumeScorer()
+            scorer.score_resume(self.sample_resume, self.sample_jd)
+            self.assertEqual(sorted(fake_nlp.parsed), sorted([self.sample_resume, self.sample_jd]))
+            resumes = ['resume %d' % i for i in range(5)]
+            scorer.score_batch(resumes, self.sample_jd, batch_size=2)
+            self.assertEqual(fake_nlp.parsed[2:], resumes)
+            self.assertTrue(all(d == ['parser'] for d in fake_nlp.disabled))
+
+    def test_import_does_not_load_models(self):
+        code = ("import sys, scoring, text_processing; "
+                "assert not {'spacy', 'sentence_transformers', 'torch', 'nltk'} & set(sys.modules)")
+        subprocess.run([sys.executable, '-c', code], check=True)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,114 @@
+import asyncio
+import threading
+import unittest
+from scoring import ResumeScorer
+from service import BadRequest, ScoringService, ServiceOverloaded, parse_request
+
+
+class _RecordingScorer(ResumeScorer):
+    # Records each score_batch call so tests can see how requests were grouped
+    calls = []
+    lock = threading.Lock()
+
+    def score_batch(self, resume_texts, job, skills_list=None, **kwargs):
+        with self.lock:
+            self.calls.append((list(resume_texts), job))
+        return super().score_batch(resume_texts, job, skills_list, **kwargs)
+
+
+class TestScoringService(unittest.TestCase):
+    def setUp(self):
+        _RecordingScorer.calls = []
+        self.jd = "Looking for python and machine-learning experience, 3 years. Bachelor degree."
+        self.texts = ["python developer, 5 years", "excel-vba analyst", "Bachelor in physics, python"]
+
+    def make_service(self, **kwargs):
+        kwargs.setdefault('max_wait_ms', 50)
+        return ScoringService(workers=2, scorer_factory=_RecordingScorer, warm_up=False, **kwargs)
+
+    def test_concurrent_requests_share_a_batch(self):
+        async def run():
+            service = self.make_service()
+            await service.start()
+            results = await asyncio.gather(*[service.score(t, self.jd) for t in self.texts],
+                                           service.score(self.texts[0], "Data engineer with SQL"))
+            metrics = service.metrics()
+            await service.close()
+            return results, metrics
+
+        results, metrics = asyncio.run(run())
+        self.assertEqual(sorted(len(texts) for texts, _ in _RecordingScorer.calls), [1, 3])
+        scorer = ResumeScorer()
+        for result, text in zip(results, self.texts):
+            self.assertEqual(result, scorer.score_resume(text, self.jd))
+        self.assertEqual(metrics['completed'], 4)
+        self.assertEqual(metrics['batches'], 2)
+        self.assertEqual(metrics['max_batch_size'], 3)
+        self.assertEqual(metrics['pending'], 0)
+
+    def test_full_batch_flushes_without_waiting(self):
+        async def run():
+            service = self.make_service(max_batch=2, max_wait_ms=10_000)
+            results = await asyncio.wait_for(service.score_many(self.texts[:2], self.jd), timeout=5)
+            await service.close()
+            return results
+
+        self.assertEqual(len(asyncio.run(run())), 2)
+        self.assertEqual(len(_RecordingScorer.calls), 1)
+
+    def test_rejects_when_queue_is_full(self):
+        async def run():
+            service = self.make_service(max_pending=2)
+            first = asyncio.ensure_future(service.score_many(self.texts[:2], self.jd))
+            await asyncio.sleep(0)
+            with self.assertRaises(ServiceOverloaded):
+                await service.score(self.texts[2], self.jd)
+            await first
+            metrics = service.metrics()
+            await service.score(self.texts[2], self.jd)
+            await service.close()
+            return metrics
+
+        metrics = asyncio.run(run())
+        self.assertEqual(metrics['rejected'], 1)
+        self.assertEqual(metrics['completed'], 2)
+
+    def test_threads_share_one_embedder(self):
+        # One Embedder (and so one EmbeddingStore writer) however many threads score
+        service = self.make_service()
+        scorers = []
+        threads = [threading.Thread(target=lambda: scorers.append(service._scorer())) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len({id(s) for s in scorers}), 3)
+        self.assertEqual(len({id(s.embedder) for s in scorers}), 1)
+
+
+class TestParseRequest(unittest.TestCase):
+    def test_valid_bodies(self):
+        self.assertEqual(parse_request({'resume_text': 'cv', 'job_description': 'jd'}, 'resume_text'),
+                         ('cv', 'jd', None))
+        self.assertEqual(parse_request({'resume_texts': ['a', 'b'], 'job_description': 'jd', 'skills_list': ['sql']},
+                                       'resume_texts'), (['a', 'b'], 'jd', ['sql']))
+
+    def test_malformed_bodies_raise_bad_request(self):
+        bad = [
+            ([], 'resume_text'),
+            ('text', 'resume_text'),
+            ({'resume_text': 'cv'}, 'resume_text'),
+            ({'resume_text': 42, 'job_description': 'jd'}, 'resume_text'),
+            ({'resume_text': 'cv', 'job_description': ['jd']}, 'resume_text'),
+            ({'resume_texts': 'cv', 'job_description': 'jd'}, 'resume_texts'),
+            ({'resume_texts': ['cv', None], 'job_description': 'jd'}, 'resume_texts'),
+            ({'resume_text': 'cv', 'job_description': 'jd', 'skills_list': 'sql'}, 'resume_text'),
+            ({'resume_text': 'cv', 'job_description': 'jd', 'skills_list': [1]}, 'resume_text'),
+        ]
+        for body, field in bad:
+            with self.assertRaises(BadRequest, msg=repr(body)):
+                parse_request(body, field)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import random
+import tempfile
+import unittest
+from scoring import ResumeScorer
+from skill_index import SkillIndex
+
+
+class TestSkillIndex(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.scorer = ResumeScorer()
+
+    def setUp(self):
+        rng = random.Random(0)
+        vocabulary = sorted(self.scorer.skills_set)
+        self.skill_sets = [set(rng.sample(vocabulary, rng.randint(0, 30))) for _ in range(300)]
+        self.ids = [f"r{i}" for i in range(300)]
+        self.index = SkillIndex(self.scorer.skills_set)
+        self.index.add(self.ids, self.skill_sets)
+        self.jd = "Looking for python, sql, machine-learning and data-analysis; excel-vba a plus."
+
+    def test_bitsets_round_trip(self):
+        self.assertEqual(self.index.words, (len(self.scorer.skills_set) + 63) // 64)
+        self.assertEqual(self.index.skills_of('r7'), self.skill_sets[7])
+
+    def test_skills_scores_match_score_resume(self):
+        texts = ["python and sql developer", "excel-vba", "machine learning, data analysis, python, sql", ""]
+        index = SkillIndex(self.scorer.skills_set)
+        index.add_texts(['a', 'b', 'c', 'd'], texts, self.scorer)
+        jd_skills = self.scorer.analyze_job(self.jd).skills
+        scores = index.skills_scores(jd_skills)
+        for text, score in zip(texts, scores):
+            breakdown = self.scorer.score_resume(text, self.jd)['breakdown']
+            self.assertEqual(round(score, 1), breakdown['skills_score'])
+        self.assertEqual(list(index.matched_counts(jd_skills)),
+                         [len(self.scorer.extract_skills(t) & jd_skills) for t in texts])
+
+    def test_must_have(self):
+        required = {'python', 'sql'}
+        for skill in required:
+            self.skill_sets[5].add(skill)
+        self.index.add(['r5'], [self.skill_sets[5]])
+        expected = [rid for rid, skills in zip(self.ids, self.skill_sets) if required <= skills]
+        self.assertIn('r5', expected)
+        self.assertEqual(self.index.must_have(required), expected)
+        self.assertEqual(self.index.must_have(['python', 'not-a-skill']), [])
+        self.assertEqual(len(self.index.must_have([])), 300)
+
+    def test_remove_and_persist(self):
+        self.assertEqual(self.index.remove(['r0', 'r1', 'missing']), 2)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'skills.npz')
+            self.index.save(path)
+            loaded = SkillIndex.load(path, self.scorer.skills_set)
+            self.assertEqual(loaded.ids, self.ids[2:])
+            self.assertEqual(loaded.skills_of('r9'), self.skill_sets[9])
+            self.assertEqual(list(loaded.matched_counts(['python'])), list(self.index.matched_counts(['python'])))
+            with self.assertRaises(ValueError):
+                SkillIndex.load(path, ['python'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import re
+import random
+import unittest
+from scoring import ResumeScorer
+from skill_matcher import SkillMatcher
+
+
+def reference_extract_skills(skills_set, text):
+    # Per-skill regex search that SkillMatcher replaces
+    extracted_skills = set()
+    for skill in skills_set:
+        pattern = r'\b' + skill.replace('-', r'[ \-]?') + r'\b'
+        if re.search(pattern, text.lower()):
+            extracted_skills.add(skill)
+    return extracted_skills
+
+
+class TestSkillMatcher(unittest.TestCase):
+    def setUp(self):
+        self.scorer = ResumeScorer()
+        self.skills = sorted(self.scorer.skills_set)
+
+    def assertEquivalent(self, text):
+        self.assertEqual(self.scorer.extract_skills(text),
+                         reference_extract_skills(self.scorer.skills_set, text))
+
+    def test_every_skill_with_separator_variants(self):
+        for sep in ['-', ' ', '']:
+            words = [s.replace('-', sep) for s in self.skills]
+            self.assertEquivalent(', '.join(words))
+            self.assertEquivalent('\n'.join(w.upper() for w in words))
+
+    def test_special_characters(self):
+        for text in ['c++ and c# developer', 'C/C++, C#/.NET', 'Node.js, nodeXjs, node\njs',
+                     'microsoft visual c++ 2019', 'cc++ c#x asp.net-mvc d3.js',
+                     'experience with c, ccc and c+']:
+            self.assertEquivalent(text)
+
+    def test_word_boundaries(self):
+        for text in ['pythonic javascripting', '_python_ python_', 'data--analysis',
+                     'machine - learning', 'machinelearning', 'data analysis2',
+                     'Café-python', '', '   ']:
+            self.assertEquivalent(text)
+
+    def test_random_documents(self):
+        rng = random.Random(7)
+        filler = ['the', 'with', '-', ' ', '.', ',', 'x', '\n', 'c', '#', '+', '2019']
+        for _ in range(200):
+            parts = [rng.choice(self.skills) if rng.random() < 0.3 else rng.choice(filler)
+                     for _ in range(rng.randint(1, 40))]
+            text = ''.join(p + rng.choice(['', ' ', '-', '\n']) for p in parts)
+            self.assertEquivalent(text)
+
+    def test_fallback_for_unmodelled_regex(self):
+        matcher = SkillMatcher(['r&d', 'c(x)', 'a*b', 'go'])
+        text = 'r&d with cx and aab in go'
+        self.assertEqual(matcher.find(text), reference_extract_skills(matcher.skills, text))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import random
+import re
+import unittest
+from unittest import mock
+import text_processing
+from text_processing import iter_preprocess, preprocess, preprocess_parallel
+
+STOPWORDS = ['i', 'me', 'my', 'a', 'an', 'the', 'and', 'or', 'in', 'of', 'to', 'with', 'is', 'was', 'for', 'on']
+
+
+def legacy_preprocess(txt, sw):
+    # The implementation preprocess replaced, kept as the reference output
+    p_txt = []
+    for resume in txt:
+        text = re.sub(r'\s+', ' ', resume)
+        text = re.sub(r'[^a-zA-Z\s]', ' ', text)
+        text = text.lower().strip()
+        words = [word for word in text.split() if word.isalpha() and word not in sw and len(word) > 1]
+        p_txt.append(" ".join(words))
+    return p_txt
+
+
+def random_texts(count, seed=0):
+    rng = random.Random(seed)
+    pieces = ['Python', 'the', 'AND', 'C++', 'e-mail:', 'john@doe.com', '3+ years', '\t', '\n\n', '  ', 'a',
+              'I', 'Résumé', 'naïve', 'straße', 'K', 'İstanbul', ' ', ' ', 'x', '42', 'ML/AI',
+              'Node.js', '—', 'of', 'Data-Analysis', '', '\r\n', 'ﬁle', 'ǅ']
+    return [''.join(rng.choice(pieces) + rng.choice(['', ' ', '.', ',']) for _ in range(rng.randint(0, 60)))
+            for _ in range(count)]
+
+
+class TestPreprocess(unittest.TestCase):
+    def setUp(self):
+        text_processing._stopwords = None
+        patcher = mock.patch.object(text_processing, 'english_stopwords', return_value=list(STOPWORDS))
+        self.english_stopwords = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(setattr, text_processing, '_stopwords', None)
+        self.texts = random_texts(500)
+
+    def test_token_identical_to_legacy(self):
+        self.assertEqual(preprocess(self.texts), legacy_preprocess(self.texts, set(STOPWORDS)))
+
+    def test_ascii_fast_path_identical(self):
+        ascii_texts = [t.encode('ascii', 'ignore').decode() + '\x0b\x1c~x_y' for t in self.texts]
+        self.assertTrue(all(t.isascii() for t in ascii_texts))
+        self.assertEqual(preprocess(ascii_texts), legacy_preprocess(ascii_texts, set(STOPWORDS)))
+
+    def test_stopwords_loaded_once(self):
+        preprocess(self.texts[:10])
+        preprocess(self.texts[10:20])
+        self.assertEqual(self.english_stopwords.call_count, 1)
+        self.assertIsInstance(text_processing.stopword_set(), frozenset)
+
+    def test_streaming(self):
+        stream = iter_preprocess(iter(self.texts))
+        self.assertEqual(next(stream), legacy_preprocess(self.texts[:1], set(STOPWORDS))[0])
+        self.assertEqual(len(list(stream)), len(self.texts) - 1)
+
+    def test_parallel_matches(self):
+        self.assertEqual(preprocess_parallel(self.texts, workers=2, chunk_size=64),
+                         legacy_preprocess(self.texts, set(STOPWORDS)))
+
+    def test_failure_returns_input(self):
+        text_processing._stopwords = None
+        self.english_stopwords.side_effect = LookupError('stopwords')
+        self.assertEqual(preprocess(['Some Text']), ['Some Text'])
+        self.assertEqual(preprocess_parallel(['Some Text'] * 4, workers=2, chunk_size=1), ['Some Text'] * 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
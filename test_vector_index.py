@@ -0,0 +1,78 @@
+import tempfile
+import unittest
+import numpy as np
+from vector_index import ResumeIndex, find_candidates, index_resumes
+
+
+def brute_force(ids, vectors, query, k):
+    vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = vectors @ (query / np.linalg.norm(query))
+    order = sorted(range(len(ids)), key=lambda i: (-scores[i], i))[:k]
+    return [ids[i] for i in order]
+
+
+class TestResumeIndex(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        # Clustered data, like embeddings of resumes from a few professions
+        centers = rng.normal(size=(8, 16))
+        self.vectors = (centers[rng.integers(0, 8, 500)] + 0.3 * rng.normal(size=(500, 16))).astype(np.float32)
+        self.ids = [f"r{i}" for i in range(500)]
+        self.query = centers[3] + 0.1 * rng.normal(size=16)
+
+    def test_exact_search_matches_brute_force(self):
+        index = ResumeIndex()
+        index.add(self.ids, self.vectors)
+        found = index.search(self.query, k=10)
+        self.assertEqual([rid for rid, _ in found], brute_force(self.ids, self.vectors, self.query, 10))
+        self.assertTrue(all(a[1] >= b[1] for a, b in zip(found, found[1:])))
+
+    def test_ivf_recall(self):
+        index = ResumeIndex()
+        index.add(self.ids, self.vectors)
+        index.build_ivf(n_lists=16)
+        approx = {rid for rid, _ in index.search(self.query, k=10, nprobe=4)}
+        self.assertGreaterEqual(len(approx & set(brute_force(self.ids, self.vectors, self.query, 10))), 9)
+        self.assertEqual(index.search(self.query, k=10, nprobe=16), index.search(self.query, k=10, exact=True))
+
+    def test_incremental_add_and_delete_persist(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            index = ResumeIndex(tmp)
+            index.add(self.ids[:300], self.vectors[:300])
+            index.build_ivf()
+            index.add(self.ids[300:], self.vectors[300:])
+            best = index.search(self.query, k=1, exact=True)[0][0]
+            self.assertEqual(index.remove([best, 'unknown']), 1)
+            index.add(['r0'], self.vectors[1:2])
+
+            reloaded = ResumeIndex(tmp)
+            self.assertEqual(len(reloaded), 499)
+            self.assertNotIn(best, reloaded)
+            expected_ids = [i for i in self.ids if i != best]
+            expected_vectors = np.array([self.vectors[1] if i == 'r0' else self.vectors[int(i[1:])] for i in expected_ids])
+            expected = brute_force(expected_ids, expected_vectors, self.query, 5)
+            self.assertEqual([rid for rid, _ in reloaded.search(self.query, k=5, exact=True)], expected)
+            self.assertEqual(reloaded.search(self.query, k=5, nprobe=10_000), reloaded.search(self.query, k=5, exact=True))
+
+            reloaded.compact()
+            self.assertEqual(len(reloaded.ids), 499)
+            self.assertEqual([rid for rid, _ in ResumeIndex(tmp).search(self.query, k=5)], expected)
+
+    def test_rejects_other_models(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            ResumeIndex(tmp, model_name='a').add(['x'], np.ones((1, 4)))
+            with self.assertRaises(ValueError):
+                ResumeIndex(tmp, model_name='b')
+
+    def test_text_helpers_need_embeddings(self):
+        class _NoEmbeddings:
+            def embed(self, texts):
+                return None
+
+        index = ResumeIndex()
+        self.assertFalse(index_resumes(index, _NoEmbeddings(), ['a'], ['text']))
+        self.assertEqual(find_candidates(index, _NoEmbeddings(), 'jd'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,17 +1,20 @@
 import re
-import nltk
 import os
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import FrozenSet, Iterable, Iterator, List, Optional
 
 logger = logging.getLogger(__name__)
 
+NLTK_DATA_PATH = os.path.join(os.path.dirname(__file__), 'nltk_data')
+_nltk_setup_attempted = False
+
 def setup_nltk():
-    """Setup NLTK data once during initialization"""
+    """Download NLTK data into NLTK_DATA_PATH (needs network; not run on import)"""
+    import nltk
     try:
-        nltk_data_path = os.path.join(os.path.dirname(__file__), 'nltk_data')
-        
-        if not os.path.exists(nltk_data_path):
-            os.makedirs(nltk_data_path)
+        if not os.path.exists(NLTK_DATA_PATH):
+            os.makedirs(NLTK_DATA_PATH)
         
         # Download required NLTK data
         required_packages = [
@@ -24,16 +27,61 @@ def setup_nltk():
         
         for package in required_packages:
             try:
-                nltk.download(package, download_dir=nltk_data_path, quiet=True)
+                nltk.download(package, download_dir=NLTK_DATA_PATH, quiet=True)
             except Exception as e:
                 logger.warning(f"Could not download {package}: {e}")
     except Exception as e:
         logger.error(f"Error setting up NLTK: {e}")
 
-# Call setup once at module import
-setup_nltk()
+def english_stopwords():
+    """
+    NLTK's English stopword list. nltk is imported on first use, and the data
+    is downloaded once per process only if it is not installed yet.
+    """
+    global _nltk_setup_attempted
+    import nltk
+    if NLTK_DATA_PATH not in nltk.data.path:
+        nltk.data.path.append(NLTK_DATA_PATH)
+    from nltk.corpus import stopwords
+    try:
+        return stopwords.words('english')
+    except LookupError:
+        if _nltk_setup_attempted:
+            raise
+        _nltk_setup_attempted = True
+        setup_nltk()
+        return stopwords.words('english')
+
+# Runs of anything but ASCII letters become one space. This is what the
+# original two passes (collapse whitespace, then blank out non-letters) left
+# behind, so lower().split() yields exactly the same tokens.
+_NON_LETTERS = re.compile(r'[^a-zA-Z]+')
+# Same mapping for pure-ASCII text, where str.translate is much faster than re
+_ASCII_NON_LETTERS = str.maketrans({chr(c): ' ' for c in range(128) if not chr(c).isalpha()})
+_stopwords: Optional[FrozenSet[str]] = None
+
+
+def stopword_set() -> FrozenSet[str]:
+    """
+    English stopwords as a frozenset, loaded once per process on first use.
+    """
+    global _stopwords
+    if _stopwords is None:
+        _stopwords = frozenset(english_stopwords())
+    return _stopwords
+
+
+def iter_preprocess(texts: Iterable[str]) -> Iterator[str]:
+    """
+    Streaming form of preprocess for large corpora: yields one preprocessed
+    text per input as it is consumed. Unlike preprocess, errors propagate.
+    """
+    sw = stopword_set()
+    sub = _NON_LETTERS.sub
+    for text in texts:
+        letters = text.translate(_ASCII_NON_LETTERS) if text.isascii() else sub(' ', text)
+        yield " ".join([word for word in letters.lower().split() if len(word) > 1 and word not in sw])
 
-from nltk.corpus import stopwords
 
 def preprocess(txt):
     """
@@ -42,22 +90,35 @@ def preprocess(txt):
     :return: preprocessed list of texts
     """
     try:
-        sw = set(stopwords.words('english'))  # Use set for O(1) lookup
-        p_txt = []
-
-        for resume in txt:
-            # Combine regex operations for efficiency
-            text = re.sub(r'\s+', ' ', resume)  # Remove extra spaces
-            text = re.sub(r'[^a-zA-Z\s]', ' ', text)  # Keep only letters and spaces
-            text = text.lower().strip()
-            
-            # Tokenize and filter in one pass
-            words = [word for word in text.split() 
-                    if word.isalpha() and word not in sw and len(word) > 1]
-            
-            p_txt.append(" ".join(words))
-
-        return p_txt
+        return list(iter_preprocess(txt))
+    except Exception as e:
+        logger.error(f"Error in preprocessing: {str(e)}")
+        return txt  # Return original text if preprocessing fails
+
+
+def _preprocess_chunk(texts: List[str]) -> List[str]:
+    return list(iter_preprocess(texts))
+
+
+def preprocess_parallel(txt: List[str], workers: Optional[int] = None, chunk_size: int = 1000) -> List[str]:
+    """
+    preprocess for archives of tens of thousands of texts: chunks are spread
+    over worker processes and the results come back in input order.
+    :param txt: list containing texts
+    :param workers: worker processes, default Config.BATCH_WORKERS
+    :param chunk_size: texts per worker task
+    :return: preprocessed list of texts, identical to preprocess(txt)
+    """
+    from config import Config
+    workers = max(1, workers or Config.BATCH_WORKERS)
+    if workers == 1 or len(txt) <= chunk_size:
+        return preprocess(txt)
+    try:
+        # Load stopwords before forking so workers inherit them
+        stopword_set()
+        chunks = [txt[i:i + chunk_size] for i in range(0, len(txt), chunk_size)]
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            return [text for chunk in pool.map(_preprocess_chunk, chunks) for text in chunk]
     except Exception as e:
         logger.error(f"Error in preprocessing: {str(e)}")
         return txt  # Return original text if preprocessing fails
@@ -0,0 +1,263 @@
+import os
+import json
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np  # type: ignore
+import nlp_models
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class ResumeIndex:
+    """
+    Persistent nearest-neighbour index of resume embeddings for finding the
+    best resumes for a new job description. Vectors are stored L2-normalised
+    in a memory-mapped vectors.npy (grown by doubling) with row ids in
+    index.json, so the dot product is the cosine similarity score_resume
+    uses. Deletes leave tombstones that compact() reclaims. search() is
+    exact by default; after build_ivf() it can probe only the nearest
+    k-means lists (IVF). Only one process should write to a directory.
+    """
+    INITIAL_CAPACITY = 256
+    ITERATIONS = 10
+
+    def __init__(self, directory: Optional[str] = None, model_name: str = nlp_models.ST_MODEL_NAME):
+        self.directory = directory
+        self.model_name = model_name
+        self.ids: List[Optional[str]] = []  # row -> resume id, None once deleted
+        self.rows: Dict[str, int] = {}
+        self.centroids: Optional[np.ndarray] = None
+        self.assignments = np.zeros(0, dtype=np.int32)  # row -> IVF list
+        self._vectors: Optional[np.ndarray] = None
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self.vectors_path = os.path.join(directory, 'vectors.npy')
+            self.index_path = os.path.join(directory, 'index.json')
+            self.ivf_path = os.path.join(directory, 'ivf.npz')
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __contains__(self, resume_id: str) -> bool:
+        return resume_id in self.rows
+
+    @property
+    def dim(self) -> Optional[int]:
+        return None if self._vectors is None else self._vectors.shape[1]
+
+    def _load(self) -> None:
+        if not (os.path.exists(self.index_path) and os.path.exists(self.vectors_path)):
+            return
+        with open(self.index_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('model_name') != self.model_name:
+            raise ValueError(f"Index in {self.directory} was built with {meta.get('model_name')}, not {self.model_name}")
+        self.ids = meta['ids']
+        self.rows = {rid: row for row, rid in enumerate(self.ids) if rid is not None}
+        self._vectors = np.load(self.vectors_path, mmap_mode='r+')
+        if os.path.exists(self.ivf_path):
+            with np.load(self.ivf_path) as ivf:
+                self.centroids = ivf['centroids']
+                self.assignments = ivf['assignments']
+
+    def _save(self) -> None:
+        if not self.directory:
+            return
+        if isinstance(self._vectors, np.memmap):
+            self._vectors.flush()
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'model_name': self.model_name, 'ids': self.ids}, f)
+        os.replace(tmp_path, self.index_path)
+        if self.centroids is not None:
+            # np.savez appends .npz to names that lack it
+            tmp_path = self.ivf_path + '.tmp.npz'
+            np.savez(tmp_path, centroids=self.centroids, assignments=self.assignments[:len(self.ids)])
+            os.replace(tmp_path, self.ivf_path)
+        elif os.path.exists(self.ivf_path):
+            os.remove(self.ivf_path)
+
+    def _reserve(self, rows: int, dim: int) -> None:
+        if self._vectors is not None and self._vectors.shape[0] >= rows:
+            return
+        capacity = self.INITIAL_CAPACITY if self._vectors is None else self._vectors.shape[0]
+        while capacity < rows:
+            capacity *= 2
+        used = len(self.ids)
+        if not self.directory:
+            grown = np.zeros((capacity, dim), dtype=np.float32)
+            if self._vectors is not None:
+                grown[:used] = self._vectors[:used]
+            self._vectors = grown
+            return
+        tmp_path = self.vectors_path + '.tmp'
+        grown = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.float32, shape=(capacity, dim))
+        if self._vectors is not None:
+            grown[:used] = self._vectors[:used]
+        grown.flush()
+        del grown
+        self._vectors = None
+        os.replace(tmp_path, self.vectors_path)
+        self._vectors = np.load(self.vectors_path, mmap_mode='r+')
+
+    def add(self, ids: Sequence[str], vectors: Any) -> None:
+        """
+        Add or replace resumes; a re-added id gets its new vector.
+        :param ids: resume ids
+        :param vectors: one embedding per id
+        """
+        if not len(ids):
+            return
+        vectors = _normalize(vectors)
+        if len(vectors) != len(ids):
+            raise ValueError(f"Got {len(ids)} ids but {len(vectors)} vectors")
+        if self.dim is not None and vectors.shape[1] != self.dim:
+            raise ValueError(f"Index holds {self.dim}-d vectors, got {vectors.shape[1]}-d")
+        # Keep only the last vector for ids repeated within the call
+        latest = {rid: i for i, rid in enumerate(ids)}
+        self._tombstone([rid for rid in latest if rid in self.rows])
+        start = len(self.ids)
+        self._reserve(start + len(latest), vectors.shape[1])
+        new_rows = vectors[list(latest.values())]
+        self._vectors[start:start + len(latest)] = new_rows  # type: ignore
+        for offset, rid in enumerate(latest):
+            self.ids.append(rid)
+            self.rows[rid] = start + offset
+        if self.centroids is not None:
+            # New rows join their nearest existing list; rebuild when the data drifts
+            self.assignments = np.concatenate([self.assignments[:start], self._nearest_lists(new_rows)])
+        self._save()
+
+    def remove(self, ids: Sequence[str]) -> int:
+        """
+        Delete resumes by id; unknown ids are ignored.
+        :return: number of resumes removed
+        """
+        removed = self._tombstone([rid for rid in ids if rid in self.rows])
+        if removed:
+            self._save()
+        return removed
+
+    def _tombstone(self, ids: List[str]) -> int:
+        for rid in ids:
+            self.ids[self.rows.pop(rid)] = None
+        return len(ids)
+
+    def compact(self) -> None:
+        """
+        Rewrite the vectors without deleted rows.
+        """
+        live = [row for row, rid in enumerate(self.ids) if rid is not None]
+        if len(live) == len(self.ids):
+            return
+        vectors = np.array(self._vectors[live]) if self._vectors is not None else None  # type: ignore
+        assignments = self.assignments[live] if self.centroids is not None else self.assignments
+        self.ids = [self.ids[row] for row in live]
+        self.rows = {rid: row for row, rid in enumerate(self.ids)}  # type: ignore
+        self.assignments = assignments
+        if vectors is not None:
+            if self.directory:
+                self._vectors = None
+                os.remove(self.vectors_path)
+            self._reserve(max(1, len(live)), vectors.shape[1])
+            self._vectors[:len(live)] = vectors  # type: ignore
+        self._save()
+
+    def _live_vectors(self) -> Tuple[np.ndarray, np.ndarray]:
+        rows = np.fromiter(self.rows.values(), dtype=np.int64, count=len(self.rows))
+        rows.sort()
+        return rows, np.asarray(self._vectors[rows])  # type: ignore
+
+    def _nearest_lists(self, vectors: np.ndarray, chunk_size: int = 4096) -> np.ndarray:
+        out = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), chunk_size):
+            out[start:start + chunk_size] = np.argmax(vectors[start:start + chunk_size] @ self.centroids.T, axis=1)  # type: ignore
+        return out
+
+    def build_ivf(self, n_lists: Optional[int] = None, seed: int = 0) -> None:
+        """
+        Cluster the live vectors with spherical k-means for approximate search.
+        :param n_lists: number of lists, default about sqrt(len(index))
+        :param seed: random seed for the initial centroids
+        """
+        if not self.rows:
+            self.centroids, self.assignments = None, np.zeros(0, dtype=np.int32)
+            self._save()
+            return
+        rows, vectors = self._live_vectors()
+        n_lists = min(len(rows), max(1, n_lists or int(round(np.sqrt(len(rows))))))
+        rng = np.random.default_rng(seed)
+        self.centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)].copy()
+        for _ in range(self.ITERATIONS):
+            labels = self._nearest_lists(vectors)
+            sums = np.zeros_like(self.centroids)
+            np.add.at(sums, labels, vectors)
+            empty = ~np.any(sums, axis=1)
+            sums[empty] = self.centroids[empty]  # keep lists that lost all members
+            self.centroids = _normalize(sums)
+        self.assignments = np.full(len(self.ids), -1, dtype=np.int32)
+        self.assignments[rows] = self._nearest_lists(vectors)
+        self._save()
+
+    def search(self, query: Any, k: int = 10, exact: bool = False, nprobe: int = 8) -> List[Tuple[str, float]]:
+        """
+        Resumes most similar to a query embedding.
+        :param query: query (job description) embedding
+        :param k: number of results
+        :param exact: score every resume even when an IVF index is built
+        :param nprobe: IVF lists to scan in approximate mode
+        :return: (resume id, cosine similarity) pairs, best first
+        """
+        if not self.rows or k <= 0:
+            return []
+        q = _normalize(query)[0]
+        if self.centroids is None or exact:
+            rows, vectors = self._live_vectors()
+        else:
+            lists = np.argsort(-(self.centroids @ q), kind='stable')[:max(1, nprobe)]
+            rows = np.flatnonzero(np.isin(self.assignments[:len(self.ids)], lists))
+            rows = rows[[self.ids[row] is not None for row in rows]] if len(rows) else rows
+            vectors = np.asarray(self._vectors[rows])  # type: ignore
+        if not len(rows):
+            return []
+        scores = vectors @ q
+        if k < len(scores):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.lexsort((rows[top], -scores[top]))]
+        return [(self.ids[rows[i]], float(scores[i])) for i in top]  # type: ignore
+
+
+def index_resumes(index: ResumeIndex, scorer: Any, ids: Sequence[str], texts: Sequence[str]) -> bool:
+    """
+    Embed resumes with a ResumeScorer (same model and cache as scoring) and
+    add them to the index.
+    :return: False when sentence embeddings are unavailable
+    """
+    embeddings = scorer.embed(list(texts))
+    if embeddings is None:
+        return False
+    index.add(ids, embeddings)
+    return True
+
+
+def find_candidates(index: ResumeIndex, scorer: Any, job_description: str, k: int = 20,
+                    exact: bool = False, nprobe: int = 8) -> List[Tuple[str, float]]:
+    """
+    Best resumes in the index for a job description by embedding similarity.
+    :return: (resume id, cosine similarity) pairs, best first; empty when
+        embeddings are unavailable
+    """
+    embeddings = scorer.embed([job_description])
+    if embeddings is None:
+        return []
+    return index.search(embeddings[0], k, exact=exact, nprobe=nprobe)